@@ -115,9 +115,9 @@ def reprocess_experiment(
 
         logger.info(f"Reprocessing experiment: {experiment_id}")
 
-        # Process the experiment (this will fetch datasets and transform panels).
+        # Process the experiment (this will fetch changed datasets and regenerate all panels).
         # process_experiment always returns the experiment ID or raises an exception on failure.
-        processor.process_experiment(experiment)
+        processor.process_experiment(experiment, force=True)
 
         return {
             "status": "success",
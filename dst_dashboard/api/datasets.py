@@ -1,17 +1,98 @@
 """Dataset API routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from datetime import datetime
+from typing import List, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from dst_dashboard.auth import require_admin_token
 from dst_dashboard.config.data_structures import DatasetConfig, ExperimentConfig
 from dst_dashboard.storage.db import DSTDatabase
+from dst_dashboard.storage.row_filter import RowFilter
 
 router = APIRouter(prefix="/experiments/{experiment_id}/datasets", tags=["datasets"])
 
+# Rows per page of dataset data, so responses stay small on large experiments.
+DEFAULT_PAGE_SIZE = 10_000
+MAX_PAGE_SIZE = 100_000
+# Rows of each dataset inlined when listing an experiment's datasets.
+DEFAULT_LIST_PAGE_SIZE = 1_000
+
+
+def _parse_bound(value: Optional[str], name: str) -> Union[datetime, float, None]:
+    """Parse a range bound given as a number or an ISO datetime."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail=f"'{name}' must be a number or an ISO datetime: {value}"
+        )
+
+
+def _parse_columns(columns: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated list of columns."""
+    if columns is None:
+        return None
+    return [column.strip() for column in columns.split(",") if column.strip()]
+
+
+def _row_filter(
+    dataset_config: DatasetConfig,
+    time_field: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+    group_by: Optional[str],
+    groups: Optional[List[str]],
+) -> Optional[RowFilter]:
+    """Build the row filter of a request, or None if it doesn't filter.
+
+    The range applies to `time_field`, or to the first datetime field of the
+    dataset schema if not given.
+    """
+    start_bound, end_bound = _parse_bound(start, "start"), _parse_bound(end, "end")
+    if start_bound is None and end_bound is None and not (group_by and groups):
+        return None
+
+    if (start_bound is not None or end_bound is not None) and time_field is None:
+        time_field = next((f.name for f in dataset_config.schema if f.type == "datetime"), None)
+        if time_field is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Dataset '{dataset_config.name}' has no datetime field, pass timeField",
+            )
+
+    return RowFilter(
+        range_field=time_field,
+        start=start_bound,
+        end=end_bound,
+        group_field=group_by,
+        groups=groups if group_by else None,
+    )
+
 
 @router.get("")
-def get_experiment_datasets(experiment_id: str, request: Request):
-    """Get all datasets for an experiment with their data."""
+def get_experiment_datasets(
+    experiment_id: str,
+    request: Request,
+    limit: int = Query(DEFAULT_LIST_PAGE_SIZE, ge=0, le=MAX_PAGE_SIZE),
+    columns: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    timeField: Optional[str] = Query(None, description="Field start/end apply to"),
+    start: Optional[str] = Query(None, description="Minimum timeField, number or ISO datetime"),
+    end: Optional[str] = Query(None, description="Maximum timeField, number or ISO datetime"),
+    groupBy: Optional[str] = Query(None, description="Field the group filter applies to"),
+    group: Optional[List[str]] = Query(None, description="Only rows of these groupBy values"),
+):
+    """Get all datasets for an experiment with the first page of their data.
+
+    Each dataset carries a `nextCursor` to fetch the remaining rows from its
+    `/data` endpoint with the same filters.
+    """
     db = DSTDatabase()
 
     # Get experiment from database (source of truth)
@@ -24,7 +105,15 @@ def get_experiment_datasets(experiment_id: str, request: Request):
     # Get all datasets with their data
     datasets = []
     for dataset_config in experiment.datasets:
-        cached_data = db.get_dataset(experiment_id, dataset_config.name)
+        metadata = db.get_dataset_metadata(experiment_id, dataset_config.name)
+        page = db.query_dataset(
+            experiment_id,
+            dataset_config.name,
+            columns=_parse_columns(columns),
+            row_filter=_row_filter(dataset_config, timeField, start, end, groupBy, group),
+            limit=limit,
+        )
+        cached_data, next_cursor = page if page is not None else ([], None)
 
         datasets.append(
             {
@@ -35,8 +124,9 @@ def get_experiment_datasets(experiment_id: str, request: Request):
                     "end": dataset_config.timeRange.end.isoformat(),
                 },
                 "schema": [{"name": f.name, "type": f.type} for f in dataset_config.schema],
-                "rowCount": len(cached_data) if cached_data else 0,
-                "data": cached_data if cached_data else [],
+                "rowCount": metadata["row_count"] if metadata else 0,
+                "data": cached_data,
+                "nextCursor": next_cursor,
             }
         )
 
@@ -64,8 +154,24 @@ def get_dataset(experiment_id: str, dataset_name: str, request: Request):
 
 
 @router.get("/{dataset_name}/data")
-def get_dataset_data(experiment_id: str, dataset_name: str, request: Request):
-    """Get cached dataset data.
+def get_dataset_data(
+    experiment_id: str,
+    dataset_name: str,
+    request: Request,
+    cursor: int = Query(0, ge=0, description="nextCursor of the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    columns: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    timeField: Optional[str] = Query(None, description="Field start/end apply to"),
+    start: Optional[str] = Query(None, description="Minimum timeField, number or ISO datetime"),
+    end: Optional[str] = Query(None, description="Maximum timeField, number or ISO datetime"),
+    groupBy: Optional[str] = Query(None, description="Field the group filter applies to"),
+    group: Optional[List[str]] = Query(None, description="Only rows of these groupBy values"),
+):
+    """Get a page of cached dataset data.
+
+    Filters and projection are applied while reading from storage. Pass the
+    returned `nextCursor` with the same filters to get the next page; it is
+    null on the last one.
 
     This endpoints always serves from mongodb.
     To refresh, use POST /admin/experiments/{experiment_id}/reprocess,
@@ -80,11 +186,19 @@ def get_dataset_data(experiment_id: str, dataset_name: str, request: Request):
 
     experiment = ExperimentConfig(**experiment_data)
 
-    if not any(dataset.name == dataset_name for dataset in experiment.datasets):
+    dataset_config = next((ds for ds in experiment.datasets if ds.name == dataset_name), None)
+    if dataset_config is None:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
-    cached_data = db.get_dataset(experiment_id, dataset_name)
-    if cached_data is None:
+    page = db.query_dataset(
+        experiment_id,
+        dataset_name,
+        columns=_parse_columns(columns),
+        row_filter=_row_filter(dataset_config, timeField, start, end, groupBy, group),
+        cursor=cursor,
+        limit=limit,
+    )
+    if page is None:
         raise HTTPException(
             status_code=404,
             detail=(
@@ -93,7 +207,8 @@ def get_dataset_data(experiment_id: str, dataset_name: str, request: Request):
             ),
         )
 
-    return {"data": cached_data, "source": "cache"}
+    cached_data, next_cursor = page
+    return {"data": cached_data, "source": "cache", "nextCursor": next_cursor}
 
 
 @router.delete("/{dataset_name}", status_code=204)
@@ -1,9 +1,9 @@
 """Panel API routes."""
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from dst_dashboard.auth import require_admin_token
 from dst_dashboard.config.data_structures import ExperimentConfig
@@ -12,9 +12,29 @@ from dst_dashboard.storage.db import DSTDatabase
 router = APIRouter(prefix="/experiments/{experiment_id}/panels", tags=["panels"])
 logger = logging.getLogger(__name__)
 
+# Points per pixel of a requested width: two keep the minimum and maximum of each pixel column.
+POINTS_PER_PIXEL = 2
+
+MAX_POINTS_QUERY = Query(
+    None, ge=4, description="Points per timeseries series wanted, served from the closest level"
+)
+WIDTH_QUERY = Query(None, ge=1, description="Rendered width in pixels, instead of maxPoints")
+
+
+def _requested_points(max_points: Optional[int], width: Optional[int]) -> Optional[int]:
+    """Points per series a client asked for, from maxPoints or its rendered width."""
+    if max_points is not None:
+        return max_points
+    return width * POINTS_PER_PIXEL if width is not None else None
+
 
 @router.get("")
-def get_all_panels(experiment_id: str, request: Request) -> Dict[str, Any]:
+def get_all_panels(
+    experiment_id: str,
+    request: Request,
+    maxPoints: Optional[int] = MAX_POINTS_QUERY,
+    width: Optional[int] = WIDTH_QUERY,
+) -> Dict[str, Any]:
     """Get all panels for an experiment with their rendered visualizations."""
     db = DSTDatabase()
 
@@ -34,7 +54,9 @@ def get_all_panels(experiment_id: str, request: Request) -> Dict[str, Any]:
     rendered_panels = []
     for panel_config in experiment.panels:
         # Get pre-processed panel from database
-        panel_data = processor.db.get_panel_data(experiment_id, panel_config.name)
+        panel_data = processor.db.get_panel_data(
+            experiment_id, panel_config.name, _requested_points(maxPoints, width)
+        )
 
         if panel_data:
             rendered_panels.append(
@@ -65,7 +87,11 @@ def get_all_panels(experiment_id: str, request: Request) -> Dict[str, Any]:
 
 @router.get("/by-dataset/{dataset_name}")
 def get_panels_by_dataset(
-    experiment_id: str, dataset_name: str, request: Request
+    experiment_id: str,
+    dataset_name: str,
+    request: Request,
+    maxPoints: Optional[int] = MAX_POINTS_QUERY,
+    width: Optional[int] = WIDTH_QUERY,
 ) -> Dict[str, Any]:
     """Get all preprocessed panels that use a specific dataset."""
     db = DSTDatabase()
@@ -86,7 +112,9 @@ def get_panels_by_dataset(
     # Retrieve preprocessed panels from database
     rendered_panels = []
     for panel_config in matching_panels:
-        panel_data = db.get_panel_data(experiment_id, panel_config.name)
+        panel_data = db.get_panel_data(
+            experiment_id, panel_config.name, _requested_points(maxPoints, width)
+        )
 
         if panel_data is not None:
             rendered_panels.append(
@@ -111,7 +139,13 @@ def get_panels_by_dataset(
 
 
 @router.get("/{panel_name}")
-def get_panel(experiment_id: str, panel_name: str, request: Request) -> Dict[str, Any]:
+def get_panel(
+    experiment_id: str,
+    panel_name: str,
+    request: Request,
+    maxPoints: Optional[int] = MAX_POINTS_QUERY,
+    width: Optional[int] = WIDTH_QUERY,
+) -> Dict[str, Any]:
     """Get a preprocessed panel with its rendered ECharts option."""
     db = DSTDatabase()
 
@@ -133,7 +167,7 @@ def get_panel(experiment_id: str, panel_name: str, request: Request) -> Dict[str
         raise HTTPException(status_code=404, detail="Panel not found")
 
     # Get preprocessed panel data from database
-    panel_data = db.get_panel_data(experiment_id, panel_name)
+    panel_data = db.get_panel_data(experiment_id, panel_name, _requested_points(maxPoints, width))
 
     if panel_data is None:
         raise HTTPException(
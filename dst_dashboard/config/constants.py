@@ -11,6 +11,13 @@ DEFAULT_ALLOWED_ORIGINS = "https://dashboard.lab.vac.dev"
 # Clearly-marked insecure fallback so it's obvious in logs/code review if a real
 # secret was never configured - never rely on this outside local dev.
 INSECURE_DEFAULT_JWT_SECRET = "dev-only-insecure-secret-change-me"
+# How datasets are stored: "columnar" (chunked Parquet) or "gridfs" (one JSON blob).
+DEFAULT_DATASET_STORAGE = "columnar"
+DEFAULT_DATASET_CHUNK_ROWS = "50000"
+# Concurrent dataset fetches allowed per datasource type, and concurrent panel transforms.
+DEFAULT_VICTORIALOGS_CONCURRENCY = "2"
+DEFAULT_PROMETHEUS_CONCURRENCY = "4"
+DEFAULT_PANEL_WORKERS = "4"
 
 
 class Constants(StrEnum):
@@ -40,3 +47,23 @@ class Constants(StrEnum):
         "DST_ALLOWED_ORIGINS",
         DEFAULT_ALLOWED_ORIGINS,
     )
+    DST_DATASET_STORAGE = os.environ.get(
+        "DST_DATASET_STORAGE",
+        DEFAULT_DATASET_STORAGE,
+    )
+    DST_DATASET_CHUNK_ROWS = os.environ.get(
+        "DST_DATASET_CHUNK_ROWS",
+        DEFAULT_DATASET_CHUNK_ROWS,
+    )
+    DST_VICTORIALOGS_CONCURRENCY = os.environ.get(
+        "DST_VICTORIALOGS_CONCURRENCY",
+        DEFAULT_VICTORIALOGS_CONCURRENCY,
+    )
+    DST_PROMETHEUS_CONCURRENCY = os.environ.get(
+        "DST_PROMETHEUS_CONCURRENCY",
+        DEFAULT_PROMETHEUS_CONCURRENCY,
+    )
+    DST_PANEL_WORKERS = os.environ.get(
+        "DST_PANEL_WORKERS",
+        DEFAULT_PANEL_WORKERS,
+    )
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TimeRange(BaseModel):
@@ -67,6 +67,7 @@ class PanelTransform(BaseModel):
     y: Optional[str] = None
     top: Optional[int] = None  # Top N by average value
     firstN: Optional[int] = None  # First N items (no sorting)
+    maxPoints: Optional[int] = Field(None, ge=4)  # Points per timeseries series served by default
 
 
 class PanelStyle(BaseModel):
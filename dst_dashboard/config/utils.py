@@ -1,4 +1,9 @@
+import hashlib
+import json
+from typing import Any, Optional
+
 import yaml
+from pydantic import BaseModel
 
 from dst_dashboard.config.constants import Constants
 from dst_dashboard.config.data_structures import DashboardFullConfig
@@ -11,3 +16,12 @@ def LoadConfig(config_path: str = Constants.DST_CONFIG_PATH) -> DashboardFullCon
         raise ValueError(f"Config file '{config_path}' is empty")
     config = DashboardFullConfig.model_validate(config_yaml)
     return config
+
+
+def config_hash(*parts: Optional[Any]) -> str:
+    """Stable content hash of configuration models (or plain JSON values), in order."""
+    content = [
+        part.model_dump(mode="json") if isinstance(part, BaseModel) else part for part in parts
+    ]
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
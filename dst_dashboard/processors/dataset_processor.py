@@ -4,15 +4,19 @@ import logging
 import threading
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 from result import Err, Ok
 
+from dst_dashboard.config.constants import Constants
 from dst_dashboard.config.data_structures import (
     DashboardFullConfig,
     DatasetConfig,
     DataSourceConfig,
     ExperimentConfig,
 )
+from dst_dashboard.config.utils import config_hash
+from dst_dashboard.processors.frame_transforms import frame_to_rows
 from dst_dashboard.storage.db import DSTDatabase
 from src.analysis.mesh_analysis.analyzers.data_puller import DataPuller
 from src.analysis.mesh_analysis.readers.tracers.message_tracer import MessageTracer
@@ -55,6 +59,76 @@ def _ensure_victorialogs_logging_initialized():
         _victorialogs_log_initialized = True
 
 
+_fetch_slots_lock = threading.Lock()
+_fetch_slots: Dict[str, threading.Semaphore] = {}
+
+
+def _fetch_slots_for(datasource_type: str) -> threading.Semaphore:
+    """Process-wide semaphore bounding concurrent fetches from one datasource type.
+
+    VictoriaLogs fetches spawn their own worker processes and are heavy on the
+    server, so they get fewer slots than Prometheus range queries.
+    """
+    with _fetch_slots_lock:
+        if datasource_type not in _fetch_slots:
+            limit = (
+                Constants.DST_VICTORIALOGS_CONCURRENCY
+                if datasource_type == "VictoriaLogs"
+                else Constants.DST_PROMETHEUS_CONCURRENCY
+            )
+            _fetch_slots[datasource_type] = threading.Semaphore(max(int(limit), 1))
+        return _fetch_slots[datasource_type]
+
+
+def _convert_column(values: pd.Series, field_type: str) -> pd.Series:
+    """Convert a column to a schema field type. Values failing to convert become missing."""
+    if field_type == "datetime":
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+        try:
+            return pd.to_datetime(values, errors="coerce", format="mixed")
+        except (ValueError, TypeError):
+            # e.g. numbers mixed with strings - parse values one by one
+            return values.map(_to_timestamp)
+    elif field_type == "float":
+        return pd.to_numeric(values, errors="coerce").astype(float)
+    elif field_type == "string":
+        return values.astype(str).where(values.notna())
+    return values
+
+
+def _to_timestamp(value: Any) -> Optional[pd.Timestamp]:
+    try:
+        return pd.to_datetime(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _strip_kubernetes_prefix(df: pd.DataFrame) -> pd.DataFrame:
+    """Rename kubernetes.* columns without their prefix. On name clashes, the last column wins."""
+    df = df.rename(columns=lambda name: str(name).replace("kubernetes.", ""))
+    return df.loc[:, ~df.columns.duplicated(keep="last")]
+
+
+def _prometheus_samples(result: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Frame of the samples of a range query result: timestamp, value and the series labels."""
+    lengths = [len(series.get("values", [])) for series in result]
+    label_names = list(
+        dict.fromkeys(name for series in result for name in series.get("metric", {}))
+    )
+    samples = [sample for series in result for sample in series.get("values", [])]
+    points = np.array(samples, dtype=object).reshape(-1, 2)
+
+    columns = {
+        "timestamp": pd.to_datetime(points[:, 0].astype(float), unit="s"),
+        "value": points[:, 1].astype(float),
+    }
+    for name in label_names:
+        labels = [series.get("metric", {}).get(name) for series in result]
+        columns[name] = np.repeat(np.array(labels, dtype=object), lengths)
+    return pd.DataFrame(columns)
+
+
 class DatasetProcessor:
     """
     Base processor for datasets - fetches data using DataPuller or scrape_utils.
@@ -79,45 +153,41 @@ class DatasetProcessor:
             return None
         return ExperimentConfig(**experiment_data)
 
-    def _apply_schema(
-        self, data_rows: List[Dict[str, Any]], dataset_config: DatasetConfig
-    ) -> List[Dict[str, Any]]:
-        """Apply schema to data rows - filter fields and apply type conversions."""
-        if not dataset_config.schema:
-            return data_rows
-
-        schema_fields = {field.name: field.type for field in dataset_config.schema}
-        filtered_rows = []
+    def dataset_config_hash(
+        self, dataset_config: DatasetConfig, experiment: Optional[ExperimentConfig]
+    ) -> str:
+        """Hash of everything a dataset's rows are fetched from.
 
-        for row in data_rows:
-            filtered_row = {}
-            for field_name, field_type in schema_fields.items():
-                if field_name not in row:
-                    continue
+        That is the dataset config itself (query, schema and time window), its
+        datasource, and the experiment metadata the fetchers read.
+        """
+        datasource = self._get_datasource(dataset_config.datasource)
+        return config_hash(dataset_config, datasource, experiment.metadata if experiment else None)
 
-                value = row[field_name]
+    def _apply_schema(self, df: pd.DataFrame, dataset_config: DatasetConfig) -> pd.DataFrame:
+        """Apply schema to a frame - keep schema fields and apply type conversions.
 
-                # Apply type conversions
-                try:
-                    if field_type == "datetime":
-                        if not isinstance(value, pd.Timestamp):
-                            value = pd.to_datetime(value)
-                    elif field_type == "float":
-                        value = float(value)
-                    elif field_type == "int":
-                        value = int(value)
-                    elif field_type == "string":
-                        value = str(value)
+        Values that fail to convert are dropped, and so are rows left without any field.
+        """
+        if not dataset_config.schema:
+            return df
 
-                    filtered_row[field_name] = value
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Failed to convert field '{field_name}' to {field_type}: {e}")
-                    continue
+        columns = {}
+        for field in dataset_config.schema:
+            if field.name not in df.columns:
+                continue
 
-            if filtered_row:  # Only add if we have at least some fields
-                filtered_rows.append(filtered_row)
+            values = df[field.name]
+            converted = _convert_column(values, field.type)
+            failed = int((converted.isna() & values.notna()).sum())
+            if failed:
+                logger.warning(
+                    f"Failed to convert {failed} values of '{field.name}' to {field.type}"
+                )
+            columns[field.name] = converted
 
-        return filtered_rows
+        # Only keep rows with at least some fields
+        return pd.DataFrame(columns, index=df.index).dropna(how="all")
 
     def fetch_dataset(
         self, experiment_id: str, dataset_config: DatasetConfig
@@ -134,12 +204,13 @@ class DatasetProcessor:
             raise ValueError(f"Experiment '{experiment_id}' not found")
 
         try:
-            if datasource.type == "VictoriaLogs":
-                return self._fetch_from_victorialogs(dataset_config, datasource, experiment)
-            elif datasource.type == "Prometheus":
-                return self._fetch_from_prometheus(dataset_config, datasource, experiment)
-            else:
-                raise ValueError(f"Unsupported datasource type: {datasource.type}")
+            with _fetch_slots_for(datasource.type):
+                if datasource.type == "VictoriaLogs":
+                    return self._fetch_from_victorialogs(dataset_config, datasource, experiment)
+                elif datasource.type == "Prometheus":
+                    return self._fetch_from_prometheus(dataset_config, datasource, experiment)
+                else:
+                    raise ValueError(f"Unsupported datasource type: {datasource.type}")
         except Exception as e:
             logger.error(
                 f"Failed to fetch dataset '{dataset_config.name}' from {datasource.type}: {e}"
@@ -239,8 +310,8 @@ class DatasetProcessor:
 
             logger.debug(f"DataPuller returned {len(results)} result dicts")
 
-            # Convert results to standard format
-            data_rows = []
+            # Collect all result frames, to convert them in a single pass
+            frames = []
             for idx, result_dict in enumerate(results):
                 logger.debug(f"Processing result_dict {idx}: {list(result_dict.keys())}")
                 for pattern_name, df_list in result_dict.items():
@@ -251,9 +322,7 @@ class DatasetProcessor:
                                 logger.debug(
                                     f"DataFrame {df_idx} shape: {df.shape}, columns: {list(df.columns)}"
                                 )
-                                # Convert DataFrame to list of dicts
-                                df_dict = df.reset_index().to_dict(orient="records")
-                                data_rows.extend(df_dict)
+                                frames.append(df.reset_index())
                             else:
                                 logger.debug(f"DataFrame {df_idx} is empty")
                         elif isinstance(df, list):
@@ -262,34 +331,23 @@ class DatasetProcessor:
                             if df:  # If list is not empty
                                 # Check if items are already dicts
                                 if isinstance(df[0], dict):
-                                    data_rows.extend(df)
+                                    frames.append(pd.DataFrame.from_records(df))
                                 else:
                                     logger.warning(f"List contains non-dict items: {type(df[0])}")
                         else:
                             logger.warning(f"Result is not a DataFrame or list: {type(df)}")
 
-            logger.info(f"Converted {len(data_rows)} raw rows from VictoriaLogs")
+            raw = pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
+            logger.info(f"Converted {len(raw)} raw rows from VictoriaLogs")
 
             # Normalize kubernetes.* field names (e.g., kubernetes.pod_name -> pod_name)
-            normalized_rows = []
-            for row in data_rows:
-                normalized_row = {}
-                for key, value in row.items():
-                    if key.startswith("kubernetes."):
-                        # Remove 'kubernetes.' prefix
-                        new_key = key.replace("kubernetes.", "")
-                        normalized_row[new_key] = value
-                    else:
-                        normalized_row[key] = value
-                normalized_rows.append(normalized_row)
-
-            logger.debug(f"Normalized {len(normalized_rows)} rows (renamed kubernetes.* fields)")
+            normalized = _strip_kubernetes_prefix(raw)
 
             # Apply schema filtering and type conversions
-            filtered_rows = self._apply_schema(normalized_rows, dataset_config)
+            filtered_rows = frame_to_rows(self._apply_schema(normalized, dataset_config))
 
             logger.info(
-                f"Fetched {len(data_rows)} rows from VictoriaLogs, "
+                f"Fetched {len(raw)} rows from VictoriaLogs, "
                 f"{len(filtered_rows)} rows after schema filtering for dataset '{dataset_config.name}'"
             )
             return filtered_rows
@@ -297,6 +355,8 @@ class DatasetProcessor:
         except Exception as e:
             logger.error(f"Error fetching from VictoriaLogs: {e}", exc_info=True)
             return []
+        finally:
+            data_puller.close()
 
     def _fetch_from_prometheus(
         self,
@@ -338,26 +398,13 @@ class DatasetProcessor:
                     )
 
                     # Convert Prometheus response to standard format
-                    data_rows = []
-                    for series in data["data"]["result"]:
-                        metric_labels = series.get("metric", {})
-                        values = series.get("values", [])
-
-                        for timestamp, value in values:
-                            # Build row with timestamp, value, and all metric labels
-                            row = {
-                                "timestamp": pd.to_datetime(timestamp, unit="s"),
-                                "value": float(value),
-                            }
-                            # Add all metric labels as potential fields
-                            row.update(metric_labels)
-                            data_rows.append(row)
+                    samples = _prometheus_samples(data["data"]["result"])
 
                     # Apply schema filtering and type conversions
-                    filtered_rows = self._apply_schema(data_rows, dataset_config)
+                    filtered_rows = frame_to_rows(self._apply_schema(samples, dataset_config))
 
                     logger.info(
-                        f"Fetched {len(data_rows)} rows from Prometheus, "
+                        f"Fetched {len(samples)} rows from Prometheus, "
                         f"{len(filtered_rows)} rows after schema filtering for dataset '{dataset_config.name}'"
                     )
                     return filtered_rows
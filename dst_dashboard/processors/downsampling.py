@@ -0,0 +1,80 @@
+"""Level-of-detail downsampling of timeseries panel series."""
+
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Points per series of the panel spec served by default.
+DEFAULT_MAX_POINTS = 2000
+# Each finer level of the pyramid holds LOD_FACTOR times more points than the previous one.
+LOD_FACTOR = 4
+# Finer levels stored above the default one, bounding storage for very long series.
+MAX_LOD_LEVELS = 4
+
+
+def min_max_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """Indices of the points kept when reducing `y` to at most `max_points` points.
+
+    Points are split into `max_points // 2` buckets of consecutive points, and the
+    minimum and maximum of each bucket are kept, so spikes survive downsampling.
+    The first and last points are always kept.
+    """
+    n = len(y)
+    n_buckets = max(max_points // 2 - 1, 1)
+    if n <= max_points:
+        return np.arange(n)
+
+    buckets = np.arange(n) * n_buckets // n
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    # NaN values are never picked over a number.
+    lows = np.lexsort((np.where(np.isnan(y), np.inf, y), buckets))[starts]
+    highs = np.lexsort((np.where(np.isnan(y), -np.inf, y), buckets))[ends]
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+def downsample_pairs(pairs: List[List[Any]], max_points: int) -> List[List[Any]]:
+    """Reduce `[x, y]` pairs to at most `max_points` pairs, ordered by x."""
+    if len(pairs) <= max_points:
+        return pairs
+
+    x = pd.to_datetime(
+        pd.Series([p[0] for p in pairs]), utc=True, format="ISO8601", errors="coerce"
+    )
+    if not x.isna().any():
+        order = np.argsort(x.to_numpy(dtype="int64"), kind="stable")
+        pairs = [pairs[i] for i in order]
+
+    y = np.array([p[1] for p in pairs], dtype=float)
+    return [pairs[i] for i in min_max_indices(y, max_points)]
+
+
+def downsample_option(option: Dict[str, Any], max_points: int) -> Dict[str, Any]:
+    """Copy of an ECharts option with each line series reduced to at most `max_points` points."""
+    return {
+        **option,
+        "series": [
+            (
+                {**series, "data": downsample_pairs(series["data"], max_points)}
+                if series.get("type") == "line"
+                else series
+            )
+            for series in option.get("series", [])
+        ],
+    }
+
+
+def lod_levels(option: Dict[str, Any], base_points: int) -> Dict[int, Dict[str, Any]]:
+    """Pyramid of an ECharts option, keyed by the maximum number of points per series.
+
+    Levels start at `base_points` and grow by LOD_FACTOR until one holds every
+    point of the longest series, or MAX_LOD_LEVELS finer levels exist.
+    """
+    longest = max(
+        (len(s["data"]) for s in option.get("series", []) if s.get("type") == "line"), default=0
+    )
+    levels = [base_points]
+    while levels[-1] < longest and len(levels) <= MAX_LOD_LEVELS:
+        levels.append(levels[-1] * LOD_FACTOR)
+    return {max_points: downsample_option(option, max_points) for max_points in levels}
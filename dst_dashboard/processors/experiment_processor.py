@@ -1,10 +1,14 @@
 """Experiment processor - processes complete experiments with datasets and panels."""
 
 import logging
+import threading
+from collections import Counter, defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Tuple
 
 from bson import ObjectId
 
+from dst_dashboard.config.constants import Constants
 from dst_dashboard.config.data_structures import (
     DashboardFullConfig,
     DatasetConfig,
@@ -34,15 +38,33 @@ class ExperimentProcessor(PanelProcessor):
         return experiment.id
 
     def process_dataset(self, experiment_id: str, dataset_config: DatasetConfig) -> bool:
-        """Process a single dataset - fetch and store if needed. Returns True on success."""
+        """Process a single dataset - fetch and store if needed. Returns True on success.
+
+        A stored dataset is kept as long as it was fetched with the same config
+        hash; this is decided from the dataset index, without reading any rows.
+        """
         logger.info(f"Processing dataset: {dataset_config.name}")
 
-        existing_data = self.db.get_dataset(experiment_id, dataset_config.name)
-        if existing_data is not None:
-            logger.info(
-                f"Dataset '{dataset_config.name}' already exists with {len(existing_data)} rows, skipping fetch"
+        dataset_hash = self.dataset_config_hash(dataset_config, self._get_experiment(experiment_id))
+        metadata = self.db.get_dataset_metadata(experiment_id, dataset_config.name)
+        if metadata is not None:
+            # Datasets stored before config hashes were recorded are kept as they are.
+            stored_hash = metadata.get("config_hash")
+            if stored_hash is None or stored_hash == dataset_hash:
+                logger.info(
+                    f"Dataset '{dataset_config.name}' already exists with {metadata['row_count']} rows, skipping fetch"
+                )
+                return True
+            logger.info(f"Dataset '{dataset_config.name}' config changed, re-fetching")
+
+        def store(data):
+            self.db.store_dataset(
+                experiment_id,
+                dataset_config.name,
+                data,
+                config_hash=dataset_hash,
+                time_range=dataset_config.timeRange,
             )
-            return True
 
         # Fetch and store dataset
         try:
@@ -52,19 +74,19 @@ class ExperimentProcessor(PanelProcessor):
             data = self.fetch_dataset(experiment_id, dataset_config)
 
             if data:
-                self.db.store_dataset(experiment_id, dataset_config.name, data)
+                store(data)
                 logger.info(f"Stored {len(data)} rows for dataset '{dataset_config.name}'")
                 return True
             else:
                 logger.warning(f"No data fetched for dataset '{dataset_config.name}'")
                 # Store empty dataset to mark it as attempted
-                self.db.store_dataset(experiment_id, dataset_config.name, [])
+                store([])
                 return False
 
         except Exception as e:
             logger.error(f"Failed to fetch dataset '{dataset_config.name}': {e}")
             # Store empty dataset to mark it as processed but failed
-            self.db.store_dataset(experiment_id, dataset_config.name, [])
+            store([])
             return False
 
     def process_experiment_datasets(
@@ -99,8 +121,12 @@ class ExperimentProcessor(PanelProcessor):
 
         return success_count
 
-    def process_experiment(self, experiment: ExperimentConfig) -> str:
-        """Process a complete experiment - store it, fetch datasets, store panels. Returns the experiment ID."""
+    def process_experiment(self, experiment: ExperimentConfig, force: bool = False) -> str:
+        """Process a complete experiment - store it, fetch datasets, store panels. Returns the experiment ID.
+
+        Only datasets and panels whose config hash changed are recomputed,
+        unless `force`, which regenerates every panel.
+        """
         experiment_id = self._ensure_experiment_id(experiment)
 
         logger.info(f"Processing experiment: {experiment_id} - {experiment.title}")
@@ -116,16 +142,94 @@ class ExperimentProcessor(PanelProcessor):
 
         self.db.store_experiment(experiment_dict)
 
-        # 2. Process datasets (datasets depend on datasources)
-        dataset_count = self.process_experiment_datasets(experiment)
+        # 2. Process datasets, and each panel as soon as its dataset is ready
+        dataset_count, panel_count = self._process_pipeline(experiment, force)
         logger.info(
             f"Processed {dataset_count}/{len(experiment.datasets)} datasets for experiment '{experiment_id}'"
         )
-
-        # 3. Process panels (panels depend on datasets)
-        panel_count = self.process_experiment_panels(experiment)
         logger.info(
             f"Processed {panel_count}/{len(experiment.panels)} panels for experiment '{experiment_id}'"
         )
 
         return experiment_id
+
+    def _process_pipeline(self, experiment: ExperimentConfig, force: bool) -> Tuple[int, int]:
+        """Process all datasets concurrently, submitting the panels of each one when it's done.
+
+        Fetches are bounded per datasource type by fetch_dataset, and panel
+        transforms by DST_PANEL_WORKERS. The frame of a dataset is dropped as
+        soon as its last panel is done. Returns the number of datasets and of
+        panels processed successfully.
+        """
+        panels_by_dataset = defaultdict(list)
+        for panel_config in experiment.panels:
+            panels_by_dataset[panel_config.dataset].append(panel_config)
+        outstanding_panels = Counter(
+            {name: len(panels) for name, panels in panels_by_dataset.items()}
+        )
+        outstanding_lock = threading.Lock()
+
+        def panel_done(dataset_name: str):
+            with outstanding_lock:
+                outstanding_panels[dataset_name] -= 1
+                last = outstanding_panels[dataset_name] == 0
+            if last:
+                self._release_dataset_frame(experiment.id, dataset_name)
+
+        dataset_count = 0
+        panel_count = 0
+        panel_futures = {}
+        self._dataset_frames = {}
+        try:
+            with ThreadPoolExecutor(max_workers=int(Constants.DST_PANEL_WORKERS)) as panel_executor:
+
+                def submit_panels(dataset_name: str):
+                    for panel_config in panels_by_dataset.pop(dataset_name, []):
+                        future = panel_executor.submit(
+                            self.process_panel, experiment.id, panel_config, force
+                        )
+                        panel_futures[future] = panel_config
+                        future.add_done_callback(lambda _, name=dataset_name: panel_done(name))
+
+                # Panels of datasets the experiment doesn't define have nothing to wait for.
+                dataset_names = {dataset_config.name for dataset_config in experiment.datasets}
+                for dataset_name in list(panels_by_dataset):
+                    if dataset_name not in dataset_names:
+                        submit_panels(dataset_name)
+
+                with ThreadPoolExecutor(
+                    max_workers=max(len(experiment.datasets), 1)
+                ) as dataset_executor:
+                    dataset_futures = {
+                        dataset_executor.submit(
+                            self.process_dataset, experiment.id, dataset_config
+                        ): dataset_config
+                        for dataset_config in experiment.datasets
+                    }
+                    for future in as_completed(dataset_futures):
+                        dataset_config = dataset_futures[future]
+                        try:
+                            if future.result():
+                                dataset_count += 1
+                        except Exception:
+                            logger.error(
+                                f"Dataset '{dataset_config.name}' processing raised unexpectedly",
+                                exc_info=True,
+                            )
+                        submit_panels(dataset_config.name)
+
+                for future in as_completed(panel_futures):
+                    panel_config = panel_futures[future]
+                    try:
+                        if future.result():
+                            panel_count += 1
+                    except Exception:
+                        logger.error(
+                            f"Panel '{panel_config.name}' processing raised unexpectedly",
+                            exc_info=True,
+                        )
+        finally:
+            self._dataset_frames = None
+            self._dataset_frame_locks = {}
+
+        return dataset_count, panel_count
@@ -0,0 +1,156 @@
+"""Vectorized data preparation on dataset frames, for dataset ingestion and panel transforms."""
+
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+PanelData = Union[pd.DataFrame, List[Dict[str, Any]]]
+
+
+def as_frame(data: PanelData) -> pd.DataFrame:
+    """Frame of panel data, which may also be given as row dicts."""
+    return data if isinstance(data, pd.DataFrame) else pd.DataFrame.from_records(data)
+
+
+def frame_to_rows(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Row dicts of a frame, leaving out the fields a row has no value for."""
+    if not df.isna().to_numpy().any():
+        return df.to_dict(orient="records")
+    return [
+        {key: value for key, value in row.items() if not _is_missing(value)}
+        for row in df.to_dict(orient="records")
+    ]
+
+
+def column(df: pd.DataFrame, field: str, default: Any = None) -> pd.Series:
+    """Values of `field`, with `default` for rows without it."""
+    if field not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    values = df[field]
+    return values if default is None else values.where(values.notna(), default)
+
+
+def regex_matches(values: pd.Series, pattern: Optional[str]) -> np.ndarray:
+    """Whether `pattern` is found in the string of each value, missing values being ''.
+
+    The pattern only runs once per distinct value, as fields like pod names
+    repeat over many rows.
+    """
+    if not pattern:
+        return np.zeros(len(values), dtype=bool)
+    codes, uniques = pd.factorize(values.astype(str).where(values.notna(), ""))
+    regex = re.compile(pattern)
+    unique_matches = np.array([regex.search(value) is not None for value in uniques], dtype=bool)
+    return unique_matches[codes] if len(codes) else np.zeros(0, dtype=bool)
+
+
+def serialize_x(values: pd.Series) -> List[str]:
+    """JSON-ready x values: datetimes as ISO strings, anything else as its string."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return [value.isoformat() for value in values]
+    if pd.api.types.infer_dtype(values, skipna=True) == "string":
+        return values.tolist()
+    return [
+        value.isoformat() if hasattr(value, "isoformat") else str(value)
+        for value in values.tolist()
+    ]
+
+
+def group_codes(groups: pd.Series) -> Tuple[np.ndarray, List[Any]]:
+    """Code of each row's group and the group names, in order of first appearance."""
+    codes, names = pd.factorize(groups, sort=False)
+    return codes, names.tolist()
+
+
+def top_groups_by_mean(codes: np.ndarray, values: np.ndarray, n_groups: int, top: int) -> List[int]:
+    """Codes of the `top` groups with the highest mean value, ties kept in first-appearance order."""
+    means = np.bincount(codes, values, n_groups) / np.bincount(codes, minlength=n_groups)
+    return np.argsort(-means, kind="stable")[:top].tolist()
+
+
+def boxplot_stats(
+    groups: pd.Series, values: pd.Series, top: Optional[int] = None
+) -> Tuple[List[Any], List[List[float]]]:
+    """Sorted group names and their [min, Q1, median, Q3, max] of the non-missing values.
+
+    Quartiles are the values at positions n // 4 and 3n // 4 of each sorted group.
+    If `top` is set, only the `top` groups with the highest mean are kept.
+    """
+    present = values.notna()
+    codes, names = group_codes(groups[present])
+    v = values[present].astype(float).to_numpy()
+
+    selected = range(len(names))
+    if top:
+        selected = top_groups_by_mean(codes, v, len(names), top)
+
+    order = np.lexsort((v, codes))
+    sorted_values = v[order]
+    counts = np.bincount(codes, minlength=len(names))
+    starts = np.cumsum(counts) - counts
+
+    categories = sorted(names[code] for code in selected)
+    code_of = {name: code for code, name in enumerate(names)}
+    stats = []
+    for category in categories:
+        code = code_of[category]
+        group = sorted_values[starts[code] : starts[code] + counts[code]]
+        n = len(group)
+        median = group[n // 2] if n % 2 == 1 else (group[n // 2 - 1] + group[n // 2]) / 2
+        stats.append(
+            [float(group[0]), float(group[n // 4]), float(median), float(group[3 * n // 4])]
+            + [float(group[-1])]
+        )
+    return categories, stats
+
+
+def timeseries_pairs(x: pd.Series, y: pd.Series) -> Tuple[pd.Series, List[List[Any]]]:
+    """Mask of the rows with both x and y, and their [x, y] pairs in row order."""
+    present = x.notna() & y.notna()
+    xs = serialize_x(x[present])
+    ys = y[present].astype(float).tolist()
+    return present, [[x_value, y_value] for x_value, y_value in zip(xs, ys)]
+
+
+def grouped_timeseries(
+    groups: pd.Series,
+    x: pd.Series,
+    y: pd.Series,
+    top: Optional[int] = None,
+    first_n: Optional[int] = None,
+) -> Dict[Any, List[List[Any]]]:
+    """[x, y] pairs of each group sorted by x, keyed by group name in name order.
+
+    If `top` is set, only the `top` groups with the highest mean y are kept,
+    otherwise if `first_n` is set, only the first `first_n` group names.
+    """
+    present, pairs = timeseries_pairs(x, y)
+    codes, names = group_codes(groups[present])
+
+    selected = range(len(names))
+    if top:
+        selected = top_groups_by_mean(
+            codes, np.array([p[1] for p in pairs], dtype=float), len(names), top
+        )
+    elif first_n:
+        first_names = set(sorted(names)[:first_n])
+        selected = [code for code, name in enumerate(names) if name in first_names]
+
+    points = pd.DataFrame({"code": codes, "x": [p[0] for p in pairs]})
+    order = points.sort_values(["code", "x"], kind="stable").index.to_numpy()
+    sorted_codes = codes[order]
+    bounds = np.searchsorted(sorted_codes, np.arange(len(names) + 1))
+
+    series = {}
+    for code in selected:
+        series[names[code]] = [pairs[i] for i in order[bounds[code] : bounds[code + 1]]]
+    return dict(sorted(series.items()))
+
+
+def _is_missing(value: Any) -> bool:
+    if value is None or value is pd.NaT:
+        return True
+    return isinstance(value, float) and math.isnan(value)
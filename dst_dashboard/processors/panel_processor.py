@@ -1,14 +1,28 @@
 """Panel processor - processes panel configurations and transformations."""
 
 import logging
-import re
-from collections import defaultdict
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from copy import deepcopy
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 from dst_dashboard.config.data_structures import DashboardFullConfig, ExperimentConfig, PanelConfig
+from dst_dashboard.config.utils import config_hash
 from dst_dashboard.processors.dataset_processor import DatasetProcessor
+from dst_dashboard.processors.downsampling import DEFAULT_MAX_POINTS, lod_levels
+from dst_dashboard.processors.frame_transforms import (
+    PanelData,
+    as_frame,
+    boxplot_stats,
+    column,
+    frame_to_rows,
+    grouped_timeseries,
+    regex_matches,
+    timeseries_pairs,
+)
 from dst_dashboard.storage.db import DSTDatabase
 
 logger = logging.getLogger(__name__)
@@ -37,22 +51,94 @@ class PanelProcessor(DatasetProcessor):
 
     def __init__(self, config: DashboardFullConfig, db: DSTDatabase):
         super().__init__(config, db)
-
-    def process_panel(self, experiment_id: str, panel_config: PanelConfig) -> bool:
-        """Process and store panel ECharts options. Returns True on success."""
+        # Dataset frames shared by the panels of an experiment while
+        # process_experiment_panels runs, so each dataset is loaded and parsed
+        # once however many panels read it. None outside of it.
+        self._dataset_frames: Optional[Dict[Tuple[str, str], Optional[pd.DataFrame]]] = None
+        self._dataset_frame_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._dataset_frames_lock = threading.Lock()
+
+    def _load_dataset_frame(self, experiment_id: str, dataset_name: str) -> Optional[pd.DataFrame]:
+        """Load a stored dataset as a frame, or None if it doesn't exist."""
+        rows = self.db.get_dataset(experiment_id, dataset_name)
+        return pd.DataFrame.from_records(rows) if rows is not None else None
+
+    def _get_dataset_frame(self, experiment_id: str, dataset_name: str) -> Optional[pd.DataFrame]:
+        """Frame of a dataset, shared with the other panels of the experiment being processed.
+
+        Transforms must not modify it in place.
+        """
+        if self._dataset_frames is None:
+            return self._load_dataset_frame(experiment_id, dataset_name)
+
+        key = (experiment_id, dataset_name)
+        with self._dataset_frames_lock:
+            key_lock = self._dataset_frame_locks.setdefault(key, threading.Lock())
+        # Panels reading the same dataset wait for the first one to load it.
+        with key_lock:
+            if key not in self._dataset_frames:
+                self._dataset_frames[key] = self._load_dataset_frame(experiment_id, dataset_name)
+            return self._dataset_frames[key]
+
+    def _release_dataset_frame(self, experiment_id: str, dataset_name: str) -> None:
+        """Drop the shared frame of a dataset, once no panel still to run reads it."""
+        key = (experiment_id, dataset_name)
+        with self._dataset_frames_lock:
+            if self._dataset_frames is not None:
+                self._dataset_frames.pop(key, None)
+            self._dataset_frame_locks.pop(key, None)
+
+    @staticmethod
+    def panel_config_hash(panel_config: PanelConfig, dataset_metadata: Dict[str, Any]) -> str:
+        """Hash of everything a panel is computed from: its config and the stored dataset.
+
+        The dataset is identified by its own config hash and when it was stored,
+        so re-fetching it also invalidates its panels.
+        """
+        return config_hash(
+            panel_config, dataset_metadata.get("config_hash"), dataset_metadata.get("created_at")
+        )
+
+    def process_panel(
+        self, experiment_id: str, panel_config: PanelConfig, force: bool = False
+    ) -> bool:
+        """Process and store panel ECharts options. Returns True on success.
+
+        Panels already stored from the same config and dataset are kept, unless `force`.
+        """
         logger.info(f"Processing panel: {panel_config.name}")
 
         # Verify that the dataset for this panel exists
-        if not self.db.dataset_exists(experiment_id, panel_config.dataset):
+        dataset_metadata = self.db.get_dataset_metadata(experiment_id, panel_config.dataset)
+        if dataset_metadata is None:
             logger.warning(
                 f"Panel '{panel_config.name}' references non-existent dataset '{panel_config.dataset}', skipping"
             )
             return False
 
+        panel_hash = self.panel_config_hash(panel_config, dataset_metadata)
+        if not force:
+            stored = self.db.get_panel_metadata(experiment_id, panel_config.name)
+            if stored is not None and stored.get("config_hash") == panel_hash:
+                logger.info(f"Panel '{panel_config.name}' is up to date, skipping")
+                return True
+
         try:
             # Generate and store ECharts options
             echarts_option = self.transform_panel_data(experiment_id, panel_config)
-            self.db.store_panel_data(experiment_id, panel_config.name, echarts_option)
+
+            # Timeseries are stored downsampled, with finer levels of detail next to them
+            levels = {}
+            if panel_config.type == "timeseries":
+                base_points = panel_config.transform.maxPoints or DEFAULT_MAX_POINTS
+                levels = lod_levels(echarts_option, base_points)
+                echarts_option = levels[base_points]
+
+            # Levels go first: the stored hash marks the panel and its levels as complete.
+            self.db.store_panel_levels(experiment_id, panel_config.name, levels)
+            self.db.store_panel_data(
+                experiment_id, panel_config.name, echarts_option, config_hash=panel_hash
+            )
             logger.info(f"Panel '{panel_config.name}' processed and stored successfully")
             return True
         except Exception as e:
@@ -64,6 +150,14 @@ class PanelProcessor(DatasetProcessor):
         if not experiment.panels:
             return 0
 
+        self._dataset_frames = {}
+        try:
+            return self._process_panels(experiment, max_workers)
+        finally:
+            self._dataset_frames = None
+            self._dataset_frame_locks = {}
+
+    def _process_panels(self, experiment: ExperimentConfig, max_workers: int) -> int:
         if len(experiment.panels) == 1 or max_workers <= 1:
             return sum(
                 self.process_panel(experiment.id, panel_config)
@@ -89,34 +183,27 @@ class PanelProcessor(DatasetProcessor):
         return success_count
 
     def _apply_derive_transformations(
-        self, data: List[Dict[str, Any]], panel_config: PanelConfig
-    ) -> List[Dict[str, Any]]:
-        """Apply derive transformations to create new fields."""
+        self, data: PanelData, panel_config: PanelConfig
+    ) -> PanelData:
+        """Apply derive transformations to create new fields, on a copy of the data."""
         if not panel_config.transform or not panel_config.transform.derive:
             return data
 
-        result = []
-        for row in data:
-            new_row = row.copy()
-
-            for derive in panel_config.transform.derive:
-                if derive.function == "regex_match":
-                    # Apply regex pattern to field
-                    field_value = str(row.get(derive.field, ""))
-                    if derive.pattern and re.search(derive.pattern, field_value):
-                        new_row[derive.name] = derive.match or "match"
-                    else:
-                        new_row[derive.name] = derive.no_match or "no_match"
-                else:
-                    logger.warning(f"Unknown derive function: {derive.function}")
-
-            result.append(new_row)
+        df = as_frame(data)
+        derived = {}
+        for derive in panel_config.transform.derive:
+            if derive.function == "regex_match":
+                # Apply regex pattern to field
+                matches = regex_matches(column(df, derive.field), derive.pattern)
+                derived[derive.name] = np.where(
+                    matches, derive.match or "match", derive.no_match or "no_match"
+                )
+            else:
+                logger.warning(f"Unknown derive function: {derive.function}")
 
-        return result
+        return df.assign(**derived)
 
-    def _transform_to_boxplot(
-        self, data: List[Dict[str, Any]], panel_config: PanelConfig
-    ) -> Dict[str, Any]:
+    def _transform_to_boxplot(self, data: PanelData, panel_config: PanelConfig) -> Dict[str, Any]:
         """Transform data for ECharts boxplot visualization."""
         transform = panel_config.transform
         group_by = transform.groupBy
@@ -125,47 +212,11 @@ class PanelProcessor(DatasetProcessor):
         if not group_by or not value_field:
             raise ValueError("Boxplot requires 'groupBy' and 'value' in transform")
 
-        # Group data by the groupBy field
-        grouped_data = defaultdict(list)
-        for row in data:
-            group_key = row.get(group_by, "unknown")
-            value = row.get(value_field)
-            if value is not None:
-                grouped_data[group_key].append(float(value))
-
-        # Apply top filter if specified - sort by average value
-        if transform.top:
-            # Calculate average for each group
-            group_stats = []
-            for group_name, values in grouped_data.items():
-                avg_val = sum(values) / len(values) if values else 0
-                group_stats.append((group_name, avg_val, values))
-
-            # Sort by average value (descending) and take top N
-            group_stats.sort(key=lambda x: x[1], reverse=True)
-            top_groups = group_stats[: transform.top]
-
-            # Rebuild grouped_data with only top groups
-            grouped_data = {name: values for name, _, values in top_groups}
-
-        # Sort categories and calculate boxplot stats
-        categories = sorted(grouped_data.keys())
-        boxplot_data = []
-
-        for category in categories:
-            values = sorted(grouped_data[category])
-            if not values:
-                continue
-
-            n = len(values)
-            min_val = values[0]
-            max_val = values[-1]
-            median = values[n // 2] if n % 2 == 1 else (values[n // 2 - 1] + values[n // 2]) / 2
-            q1 = values[n // 4]
-            q3 = values[3 * n // 4]
-
-            # ECharts boxplot format: [min, Q1, median, Q3, max]
-            boxplot_data.append([min_val, q1, median, q3, max_val])
+        # Group values by the groupBy field, keeping the top groups by average value if set
+        df = as_frame(data)
+        categories, boxplot_data = boxplot_stats(
+            column(df, group_by, "unknown"), column(df, value_field), transform.top
+        )
 
         # Build ECharts option
         option = {
@@ -236,7 +287,7 @@ class PanelProcessor(DatasetProcessor):
         return option
 
     def _transform_to_timeseries(
-        self, data: List[Dict[str, Any]], panel_config: PanelConfig
+        self, data: PanelData, panel_config: PanelConfig
     ) -> Dict[str, Any]:
         """Transform data for ECharts timeseries (line chart) visualization."""
         transform = panel_config.transform
@@ -246,42 +297,18 @@ class PanelProcessor(DatasetProcessor):
         if not x_field or not y_field:
             raise ValueError("Timeseries requires 'x' and 'y' in transform")
 
+        df = as_frame(data)
+
         # Group by a categorical field if groupBy is specified (for multi-series)
         if transform.groupBy:
-            grouped_series = defaultdict(list)
-
-            for row in data:
-                group_key = row.get(transform.groupBy, "default")
-                x_val = row.get(x_field)
-                y_val = row.get(y_field)
-
-                if x_val is not None and y_val is not None:
-                    # Convert datetime to ISO string for JSON serialization
-                    x_val_serialized = (
-                        x_val.isoformat() if hasattr(x_val, "isoformat") else str(x_val)
-                    )
-                    grouped_series[group_key].append(
-                        {"timestamp": x_val_serialized, "value": float(y_val)}
-                    )
-
-            # Apply top filter if specified (limit number of series)
-            if transform.top:
-                # Sort by average value to get most significant series
-                series_stats = []
-                for group_name, points in grouped_series.items():
-                    avg_val = sum(p["value"] for p in points) / len(points) if points else 0
-                    series_stats.append((group_name, avg_val, points))
-
-                # Sort by average value (descending) and take top N
-                series_stats.sort(key=lambda x: x[1], reverse=True)
-                top_series = dict(
-                    (name, points) for name, _, points in series_stats[: transform.top]
-                )
-                grouped_series = top_series
-            elif transform.firstN:
-                # Take first N series by name (no sorting by value)
-                sorted_names = sorted(grouped_series.keys())[: transform.firstN]
-                grouped_series = {name: grouped_series[name] for name in sorted_names}
+            # One series per group, sorted by timestamp, limited to top/firstN series if set
+            grouped_series = grouped_timeseries(
+                column(df, transform.groupBy, "default"),
+                column(df, x_field),
+                column(df, y_field),
+                top=transform.top,
+                first_n=transform.firstN,
+            )
 
             # Professional color palette - distinct and readable
             colors = [
@@ -299,13 +326,7 @@ class PanelProcessor(DatasetProcessor):
 
             # Build series for each group
             series = []
-            for idx, (group_name, points) in enumerate(sorted(grouped_series.items())):
-                # Sort points by timestamp to ensure proper line drawing
-                sorted_points = sorted(points, key=lambda p: p["timestamp"])
-
-                # Create [timestamp, value] pairs for ECharts - properly ordered
-                data_pairs = [[p["timestamp"], p["value"]] for p in sorted_points]
-
+            for idx, (group_name, data_pairs) in enumerate(grouped_series.items()):
                 color = colors[idx % len(colors)]
                 series.append(
                     {
@@ -323,18 +344,7 @@ class PanelProcessor(DatasetProcessor):
 
         else:
             # Assume single series
-            data_pairs = []
-
-            for row in data:
-                x_val = row.get(x_field)
-                y_val = row.get(y_field)
-
-                if x_val is not None and y_val is not None:
-                    # Convert datetime to ISO string for JSON serialization
-                    x_val_serialized = (
-                        x_val.isoformat() if hasattr(x_val, "isoformat") else str(x_val)
-                    )
-                    data_pairs.append([x_val_serialized, float(y_val)])
+            _, data_pairs = timeseries_pairs(column(df, x_field), column(df, y_field))
 
             series = [
                 {
@@ -462,8 +472,8 @@ class PanelProcessor(DatasetProcessor):
         self, experiment_id: str, panel_config: PanelConfig, viz_format: str = "echarts"
     ) -> Dict[str, Any]:
         """Transform dataset for panel visualization into the requested viz_format."""
-        dataset = self.db.get_dataset(experiment_id, panel_config.dataset)
-        if not dataset:
+        dataset = self._get_dataset_frame(experiment_id, panel_config.dataset)
+        if dataset is None or dataset.empty:
             raise ValueError(f"Dataset '{panel_config.dataset}' not found")
 
         # Apply derive transformations
@@ -478,9 +488,7 @@ class PanelProcessor(DatasetProcessor):
         else:
             raise ValueError(f"Unsupported visualization format: {viz_format}")
 
-    def _transform_to_echarts(
-        self, data: List[Dict[str, Any]], panel_config: PanelConfig
-    ) -> Dict[str, Any]:
+    def _transform_to_echarts(self, data: PanelData, panel_config: PanelConfig) -> Dict[str, Any]:
         """Transform data to ECharts format based on panel type."""
         if panel_config.type == "boxplot":
             return self._transform_to_boxplot(data, panel_config)
@@ -493,7 +501,8 @@ class PanelProcessor(DatasetProcessor):
             # TODO: Implement bar chart transformation
             raise NotImplementedError("Bar chart transformation not yet implemented")
         elif panel_config.type == "table":
-            # For tables, just return the data as-is
-            return {"type": "table", "title": panel_config.title, "data": data}
+            # For tables, just return the rows as-is
+            rows = frame_to_rows(data) if isinstance(data, pd.DataFrame) else data
+            return {"type": "table", "title": panel_config.title, "data": rows}
         else:
             raise ValueError(f"Unknown panel type: {panel_config.type}")
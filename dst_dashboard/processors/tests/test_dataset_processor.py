@@ -0,0 +1,64 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from dst_dashboard.config.data_structures import (
+    DashboardFullConfig,
+    DatasetConfig,
+    DatasetQuery,
+    SchemaField,
+    TimeRange,
+)
+from dst_dashboard.processors.dataset_processor import DatasetProcessor, _prometheus_samples
+
+
+def _dataset_config(schema) -> DatasetConfig:
+    return DatasetConfig(
+        name="test-dataset",
+        datasource="prometheus",
+        timeRange=TimeRange(start="2026-01-01T00:00:00", end="2026-01-01T01:00:00"),
+        query=DatasetQuery(),
+        schema=[SchemaField(name=name, type=field_type) for name, field_type in schema],
+    )
+
+
+class TestApplySchema:
+    """Tests for DatasetProcessor._apply_schema."""
+
+    def test_converts_fields_and_drops_failed_values_and_empty_rows(self):
+        """Should keep schema fields only, converted, dropping values and rows left empty."""
+        processor = DatasetProcessor(DashboardFullConfig(datasources=[]), MagicMock())
+        df = pd.DataFrame(
+            {
+                "ts": ["2026-01-01T00:00:00", "2026-01-01T00:00:15", None],
+                "delay": ["1.5", "x", None],
+                "pod": ["a", "b", None],
+                "ignored": [1, 2, 3],
+            }
+        )
+        config = _dataset_config([("ts", "datetime"), ("delay", "float"), ("pod", "string")])
+
+        result = processor._apply_schema(df, config)
+
+        assert list(result.columns) == ["ts", "delay", "pod"]
+        assert result["ts"].tolist() == [
+            pd.Timestamp("2026-01-01T00:00:00"),
+            pd.Timestamp("2026-01-01T00:00:15"),
+        ]
+        assert result["delay"].tolist()[0] == 1.5
+        assert pd.isna(result["delay"].tolist()[1])
+
+
+def test_prometheus_samples_repeat_series_labels():
+    """Should build one row per sample, with the labels of its series."""
+    result = [
+        {"metric": {"pod": "a"}, "values": [[0, "1"], [15, "2"]]},
+        {"metric": {"pod": "b", "job": "j"}, "values": [[0, "NaN"]]},
+    ]
+
+    df = _prometheus_samples(result)
+
+    assert df["timestamp"].tolist() == pd.to_datetime([0, 15, 0], unit="s").tolist()
+    assert df["value"].tolist()[:2] == [1.0, 2.0]
+    assert df["pod"].tolist() == ["a", "a", "b"]
+    assert df["job"].tolist() == [None, None, "j"]
@@ -0,0 +1,29 @@
+import numpy as np
+
+from dst_dashboard.processors.downsampling import downsample_pairs, min_max_indices
+
+
+def test_min_max_indices_keep_extremes_of_each_bucket():
+    y = np.array([0.0, 5.0, 1.0, 2.0, -3.0, 1.0, 0.0, 9.0, 1.0, 1.0])
+
+    indices = min_max_indices(y, 6)
+
+    assert len(indices) <= 6
+    assert {0, 9, 1, 4, 7}.issubset(indices)
+    assert list(indices) == sorted(indices)
+
+
+def test_short_series_are_untouched():
+    pairs = [["t2", 1.0], ["t1", 2.0]]
+
+    assert downsample_pairs(pairs, 10) is pairs
+
+
+def test_downsampled_pairs_are_ordered_by_time():
+    pairs = [[f"2026-01-01T00:00:{i:02d}Z", float(i)] for i in reversed(range(20))]
+
+    reduced = downsample_pairs(pairs, 6)
+
+    assert reduced[0] == ["2026-01-01T00:00:00Z", 0.0]
+    assert reduced[-1] == ["2026-01-01T00:00:19Z", 19.0]
+    assert reduced == sorted(reduced)
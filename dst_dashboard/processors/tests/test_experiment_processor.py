@@ -0,0 +1,196 @@
+import threading
+from unittest.mock import MagicMock
+
+from dst_dashboard.config.data_structures import (
+    DashboardFullConfig,
+    DatasetConfig,
+    DatasetQuery,
+    ExperimentConfig,
+    PanelConfig,
+    PanelTransform,
+    SchemaField,
+    TimeRange,
+)
+from dst_dashboard.processors.experiment_processor import ExperimentProcessor
+
+
+def _dataset_config(end: str = "2026-01-01T01:00:00", name: str = "test-dataset") -> DatasetConfig:
+    return DatasetConfig(
+        name=name,
+        datasource="prometheus",
+        timeRange=TimeRange(start="2026-01-01T00:00:00", end=end),
+        query=DatasetQuery(),
+        schema=[SchemaField(name="value", type="float")],
+    )
+
+
+def _make_processor(metadata) -> ExperimentProcessor:
+    db = MagicMock()
+    db.get_experiment.return_value = None
+    db.get_dataset_metadata.return_value = metadata
+    processor = ExperimentProcessor(DashboardFullConfig(datasources=[]), db)
+    processor.fetch_dataset = MagicMock(return_value=[{"value": 1.0}])
+    return processor
+
+
+class TestProcessDataset:
+    """Tests for ExperimentProcessor.process_dataset."""
+
+    def test_config_hash_covers_the_source_window(self):
+        """Should hash datasets fetched over different windows differently."""
+        processor = _make_processor(None)
+
+        assert processor.dataset_config_hash(_dataset_config(), None) == (
+            processor.dataset_config_hash(_dataset_config(), None)
+        )
+        assert processor.dataset_config_hash(_dataset_config(), None) != (
+            processor.dataset_config_hash(_dataset_config(end="2026-01-01T02:00:00"), None)
+        )
+
+    def test_skips_fetch_when_stored_hash_matches(self):
+        """Should keep a dataset stored with the same config hash, without reading its rows."""
+        processor = _make_processor(None)
+        config_hash = processor.dataset_config_hash(_dataset_config(), None)
+        processor.db.get_dataset_metadata.return_value = {
+            "row_count": 3,
+            "config_hash": config_hash,
+        }
+
+        assert processor.process_dataset("exp-1", _dataset_config())
+
+        processor.fetch_dataset.assert_not_called()
+        processor.db.store_dataset.assert_not_called()
+        processor.db.get_dataset.assert_not_called()
+
+    def test_refetches_when_config_changed(self):
+        """Should re-fetch and store a dataset whose config hash differs."""
+        processor = _make_processor({"row_count": 3, "config_hash": "stale"})
+        dataset_config = _dataset_config()
+
+        assert processor.process_dataset("exp-1", dataset_config)
+
+        processor.db.store_dataset.assert_called_once_with(
+            "exp-1",
+            "test-dataset",
+            [{"value": 1.0}],
+            config_hash=processor.dataset_config_hash(dataset_config, None),
+            time_range=dataset_config.timeRange,
+        )
+
+    def test_keeps_datasets_stored_without_hash(self):
+        """Should not re-fetch datasets stored before hashes were recorded."""
+        processor = _make_processor({"row_count": 3})
+
+        assert processor.process_dataset("exp-1", _dataset_config())
+
+        processor.fetch_dataset.assert_not_called()
+
+    def test_fetches_missing_dataset(self):
+        """Should fetch and store a dataset that isn't stored yet."""
+        processor = _make_processor(None)
+
+        assert processor.process_dataset("exp-1", _dataset_config())
+
+        processor.fetch_dataset.assert_called_once()
+        processor.db.store_dataset.assert_called_once()
+
+
+def _panel_config(name: str, dataset: str) -> PanelConfig:
+    return PanelConfig(
+        name=name,
+        title=name,
+        type="boxplot",
+        dataset=dataset,
+        transform=PanelTransform(),
+        publish=True,
+    )
+
+
+class TestProcessExperiment:
+    """Tests for the dataset and panel pipeline of ExperimentProcessor.process_experiment."""
+
+    def _experiment(self) -> ExperimentConfig:
+        return ExperimentConfig(
+            id="exp-1",
+            title="Test Experiment",
+            family="test/family",
+            metadata={},
+            datasets=[_dataset_config(name="fast"), _dataset_config(name="slow")],
+            panels=[
+                _panel_config("fast-panel", "fast"),
+                _panel_config("slow-panel", "slow"),
+                _panel_config("orphan-panel", "elsewhere"),
+            ],
+            publish=True,
+        )
+
+    def test_panels_start_as_soon_as_their_dataset_is_ready(self, mocker):
+        """Should process a panel while other datasets are still being fetched."""
+        processor = _make_processor(None)
+        fast_panel_done = threading.Event()
+
+        def process_dataset(experiment_id, dataset_config):
+            if dataset_config.name == "slow":
+                return fast_panel_done.wait(timeout=5)
+            return True
+
+        def process_panel(experiment_id, panel_config, force):
+            if panel_config.name == "fast-panel":
+                fast_panel_done.set()
+            return panel_config.name != "orphan-panel"
+
+        mocker.patch.object(processor, "process_dataset", side_effect=process_dataset)
+        mock_process_panel = mocker.patch.object(
+            processor, "process_panel", side_effect=process_panel
+        )
+
+        assert processor._process_pipeline(self._experiment(), force=False) == (2, 2)
+        assert fast_panel_done.is_set()
+        assert {call.args[1].name for call in mock_process_panel.call_args_list} == {
+            "fast-panel",
+            "slow-panel",
+            "orphan-panel",
+        }
+        assert processor._dataset_frames is None
+
+    def test_failing_dataset_still_submits_its_panels(self, mocker):
+        """Should count a raising dataset as failed, and still process its panels."""
+        processor = _make_processor(None)
+        mocker.patch.object(processor, "process_dataset", side_effect=RuntimeError("boom"))
+        mock_process_panel = mocker.patch.object(processor, "process_panel", return_value=True)
+
+        assert processor._process_pipeline(self._experiment(), force=True) == (0, 3)
+        assert all(call.args[2] is True for call in mock_process_panel.call_args_list)
+
+    def test_dataset_frames_are_dropped_after_their_last_panel(self, mocker):
+        """Should not hold a dataset's frame while other datasets are still being fetched."""
+        processor = _make_processor(None)
+        mocker.patch.object(processor, "_load_dataset_frame", return_value=MagicMock())
+        release = processor._release_dataset_frame
+        fast_released = threading.Event()
+        frames_while_slow = {}
+        locks_while_slow = set()
+
+        def release_dataset_frame(experiment_id, dataset_name):
+            release(experiment_id, dataset_name)
+            if dataset_name == "fast":
+                fast_released.set()
+
+        def process_dataset(experiment_id, dataset_config):
+            if dataset_config.name == "slow":
+                fast_released.wait(timeout=5)
+                frames_while_slow.update(processor._dataset_frames)
+                locks_while_slow.update(processor._dataset_frame_locks)
+            return True
+
+        def process_panel(experiment_id, panel_config, force):
+            return processor._get_dataset_frame(experiment_id, panel_config.dataset) is not None
+
+        mocker.patch.object(processor, "_release_dataset_frame", side_effect=release_dataset_frame)
+        mocker.patch.object(processor, "process_dataset", side_effect=process_dataset)
+        mocker.patch.object(processor, "process_panel", side_effect=process_panel)
+
+        assert processor._process_pipeline(self._experiment(), force=False) == (2, 3)
+        assert fast_released.is_set()
+        assert ("exp-1", "fast") not in frames_while_slow
+        assert ("exp-1", "fast") not in locks_while_slow
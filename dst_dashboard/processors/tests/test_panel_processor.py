@@ -109,7 +109,7 @@ class TestProcessPanel:
     def test_missing_dataset_returns_false_without_processing(self):
         """Should skip processing and return False when the panel's dataset doesn't exist."""
         db = MagicMock()
-        db.dataset_exists.return_value = False
+        db.get_dataset_metadata.return_value = None
         processor = _make_processor(db)
         panel_config = _create_panel_config(dataset="missing-dataset")
 
@@ -119,9 +119,10 @@ class TestProcessPanel:
         db.store_panel_data.assert_not_called()
 
     def test_successful_transform_stores_option_and_returns_true(self, mocker):
-        """Should store the transformed ECharts option and return True on success."""
+        """Should store the transformed ECharts option and its config hash, and return True."""
         db = MagicMock()
-        db.dataset_exists.return_value = True
+        db.get_dataset_metadata.return_value = {"config_hash": "dataset-hash"}
+        db.get_panel_metadata.return_value = None
         processor = _make_processor(db)
         panel_config = _create_panel_config(name="my-panel")
         echarts_option = {"title": {"text": "My Panel"}}
@@ -130,12 +131,45 @@ class TestProcessPanel:
         result = processor.process_panel("exp-1", panel_config)
 
         assert result is True
-        db.store_panel_data.assert_called_once_with("exp-1", "my-panel", echarts_option)
+        db.store_panel_data.assert_called_once_with(
+            "exp-1",
+            "my-panel",
+            echarts_option,
+            config_hash=processor.panel_config_hash(panel_config, {"config_hash": "dataset-hash"}),
+        )
+
+    def test_up_to_date_panel_is_kept_unless_forced(self, mocker):
+        """Should skip a panel stored from the same config and dataset, unless forced."""
+        db = MagicMock()
+        dataset_metadata = {"config_hash": "dataset-hash", "created_at": "2026-01-01T00:00:00"}
+        db.get_dataset_metadata.return_value = dataset_metadata
+        processor = _make_processor(db)
+        panel_config = _create_panel_config(name="my-panel")
+        db.get_panel_metadata.return_value = {
+            "config_hash": processor.panel_config_hash(panel_config, dataset_metadata)
+        }
+        transform = mocker.patch.object(processor, "transform_panel_data", return_value={})
+
+        assert processor.process_panel("exp-1", panel_config) is True
+        transform.assert_not_called()
+
+        assert processor.process_panel("exp-1", panel_config, force=True) is True
+        transform.assert_called_once()
+
+    def test_refetched_dataset_invalidates_panel(self):
+        """Should hash a panel differently once its dataset was stored again."""
+        panel_config = _create_panel_config()
+        first = {"config_hash": "dataset-hash", "created_at": "2026-01-01T00:00:00"}
+        second = {"config_hash": "dataset-hash", "created_at": "2026-01-02T00:00:00"}
+
+        assert PanelProcessor.panel_config_hash(panel_config, first) != (
+            PanelProcessor.panel_config_hash(panel_config, second)
+        )
 
     def test_transform_exception_is_caught_and_returns_false(self, mocker):
         """Should catch exceptions from the transform step and return False instead of raising."""
         db = MagicMock()
-        db.dataset_exists.return_value = True
+        db.get_panel_metadata.return_value = None
         processor = _make_processor(db)
         panel_config = _create_panel_config()
         mocker.patch.object(processor, "transform_panel_data", side_effect=ValueError("boom"))
@@ -145,6 +179,31 @@ class TestProcessPanel:
         assert result is False
         db.store_panel_data.assert_not_called()
 
+    def test_timeseries_are_stored_downsampled_with_levels(self, mocker):
+        """Should store timeseries at transform.maxPoints points per series, with finer levels."""
+        db = MagicMock()
+        db.get_panel_metadata.return_value = None
+        processor = _make_processor(db)
+        panel_config = _create_panel_config(
+            name="ts-panel",
+            panel_type="timeseries",
+            transform=PanelTransform(x="ts", y="v", maxPoints=10),
+        )
+        points = [[f"2026-01-01T00:00:{i:02d}", float(i % 7)] for i in range(50)]
+        mocker.patch.object(
+            processor,
+            "transform_panel_data",
+            return_value={"series": [{"type": "line", "data": points}]},
+        )
+
+        assert processor.process_panel("exp-1", panel_config) is True
+
+        stored = db.store_panel_data.call_args.args[2]
+        assert 4 < len(stored["series"][0]["data"]) <= 10
+        levels = db.store_panel_levels.call_args.args[2]
+        assert sorted(levels) == [10, 40, 160]
+        assert levels[160]["series"][0]["data"] == points
+
 
 # --------------------------------------------------------------------------- #
 # PanelProcessor.process_experiment_panels Tests
@@ -226,6 +285,22 @@ class TestProcessExperimentPanels:
 
         assert result == 1
 
+    def test_panels_of_the_same_dataset_share_one_load(self):
+        """Should load each dataset once per experiment, however many panels read it."""
+        db = MagicMock()
+        db.get_panel_metadata.return_value = None
+        db.get_dataset.return_value = [{"pod_name": "a", "delayMs": 1}]
+        processor = _make_processor(db)
+        transform = PanelTransform(groupBy="pod_name", value="delayMs")
+        panels = [_create_panel_config(name=f"p{i}", transform=transform) for i in range(3)]
+        experiment = _create_experiment_config(panels=panels)
+
+        result = processor.process_experiment_panels(experiment, max_workers=3)
+
+        assert result == 3
+        db.get_dataset.assert_called_once_with(experiment.id, "test-dataset")
+        assert processor._dataset_frames is None
+
 
 # --------------------------------------------------------------------------- #
 # PanelProcessor._apply_derive_transformations Tests
@@ -259,7 +334,9 @@ class TestApplyDeriveTransformations:
 
         result = processor._apply_derive_transformations(data, panel_config)
 
-        assert result == [{"pod_name": "nimp2p-slow-1", "pod_group": "slow"}]
+        assert result.to_dict(orient="records") == [
+            {"pod_name": "nimp2p-slow-1", "pod_group": "slow"}
+        ]
 
     def test_regex_no_match_assigns_no_match_value(self):
         """Should assign the 'no_match' value when the regex pattern doesn't match the field."""
@@ -277,7 +354,9 @@ class TestApplyDeriveTransformations:
 
         result = processor._apply_derive_transformations(data, panel_config)
 
-        assert result == [{"pod_name": "nimp2p-fast-1", "pod_group": "normal"}]
+        assert result.to_dict(orient="records") == [
+            {"pod_name": "nimp2p-fast-1", "pod_group": "normal"}
+        ]
 
     def test_unknown_derive_function_leaves_row_without_new_field(self):
         """Should leave the row without the derived field when the derive function is unknown."""
@@ -288,7 +367,7 @@ class TestApplyDeriveTransformations:
 
         result = processor._apply_derive_transformations(data, panel_config)
 
-        assert result == [{"pod_name": "node-1"}]
+        assert result.to_dict(orient="records") == [{"pod_name": "node-1"}]
 
     def test_original_data_rows_are_not_mutated(self):
         """Should return new row dicts instead of mutating the original input rows."""
@@ -628,7 +707,9 @@ class TestTransformPanelData:
 
         result = processor.transform_panel_data("exp-1", panel_config)
 
-        mock_derive.assert_called_once_with([{"pod_name": "node-1"}], panel_config)
+        (dataset, config), _ = mock_derive.call_args
+        assert dataset.to_dict(orient="records") == [{"pod_name": "node-1"}]
+        assert config is panel_config
         mock_echarts.assert_called_once_with(derived_data, panel_config)
         assert result == {"ok": True}
 
@@ -0,0 +1,137 @@
+"""Columnar encoding of dataset rows as fixed-size Parquet chunks."""
+
+import io
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Rows per chunk, large enough that a chunk is a cheap unit to fetch.
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Encoded size above which a chunk is split again, leaving room under MongoDB's
+# 16MB document limit for the rest of the chunk document. Rows of full log
+# lines can exceed it well before DEFAULT_CHUNK_ROWS rows.
+MAX_CHUNK_BYTES = 12 * 1024 * 1024
+
+
+def encode_chunks(
+    rows: List[Dict[str, Any]],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    max_chunk_bytes: int = MAX_CHUNK_BYTES,
+) -> List[Dict[str, Any]]:
+    """Split rows into chunks of at most `chunk_rows` rows, each encoded as Parquet bytes.
+
+    Chunks encoding to more than `max_chunk_bytes` are halved until they fit.
+    Every chunk records the min/max of its numeric and timestamp columns, so
+    readers can skip chunks outside a requested range without decoding them.
+
+    Raises pyarrow.ArrowException (or TypeError/ValueError) if a column mixes
+    values Arrow can't store in a single column, e.g. strings and numbers.
+    Raises ValueError if a single row encodes to more than `max_chunk_bytes`.
+    """
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    chunks = []
+    # Row ranges still to encode, next one last.
+    pending = [
+        (row_start, min(row_start + chunk_rows, len(rows)))
+        for row_start in reversed(range(0, len(rows), chunk_rows))
+    ]
+    while pending:
+        row_start, row_end = pending.pop()
+        chunk = rows[row_start:row_end]
+        # from_pylist only infers columns from the first row, so the columns
+        # are built explicitly from the keys of every row.
+        table = pa.table({column: [row.get(column) for row in chunk] for column in columns})
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer, compression="zstd")
+        data = buffer.getvalue()
+        if len(data) > max_chunk_bytes:
+            if len(chunk) == 1:
+                raise ValueError(
+                    f"Row {row_start} encodes to {len(data)} bytes, over {max_chunk_bytes}"
+                )
+            middle = row_start + len(chunk) // 2
+            pending.extend([(middle, row_end), (row_start, middle)])
+            continue
+        chunks.append(
+            {
+                "index": len(chunks),
+                "row_start": row_start,
+                "row_count": len(chunk),
+                "stats": _column_stats(table),
+                "data": data,
+            }
+        )
+    return chunks
+
+
+def decode_chunk(data: bytes, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """Decode a chunk back into rows, keeping only `columns` if given.
+
+    Rows match what the JSON storage returned: datetimes come back as ISO
+    strings, and null fields are left out of the row. Unknown columns are
+    ignored.
+    """
+    schema = pq.read_schema(io.BytesIO(data))
+    if columns is not None:
+        columns = [column for column in columns if column in schema.names]
+    table = pq.read_table(io.BytesIO(data), columns=columns)
+
+    rows = table.to_pylist()
+    for row in rows:
+        for key in [key for key, value in row.items() if value is None]:
+            del row[key]
+        for key, value in row.items():
+            if isinstance(value, datetime):
+                row[key] = value.isoformat()
+    return rows
+
+
+def chunk_overlaps(
+    stats: Dict[str, Dict[str, Any]], field: str, start: Any = None, end: Any = None
+) -> bool:
+    """Whether a chunk may hold rows with `start <= field <= end`, judging by its stats.
+
+    Chunks without stats for `field` (e.g. the field is a string) always may.
+    """
+    field_stats = stats.get(field)
+    if field_stats is None:
+        return True
+    try:
+        if start is not None and field_stats["max"] < start:
+            return False
+        if end is not None and field_stats["min"] > end:
+            return False
+    except TypeError:
+        # Bound and stats of different kinds (e.g. a datetime against numbers).
+        return True
+    return True
+
+
+def to_naive_utc(value: Any) -> Any:
+    """Convert an aware datetime to the naive UTC form MongoDB returns stats in."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _column_stats(table: pa.Table) -> Dict[str, Dict[str, Any]]:
+    stats = {}
+    for name, column in zip(table.column_names, table.columns):
+        if not (
+            pa.types.is_integer(column.type)
+            or pa.types.is_floating(column.type)
+            or pa.types.is_timestamp(column.type)
+        ):
+            continue
+        min_max = pc.min_max(column).as_py()
+        if min_max["min"] is None:
+            continue
+        stats[name] = {
+            "min": to_naive_utc(min_max["min"]),
+            "max": to_naive_utc(min_max["max"]),
+        }
+    return stats
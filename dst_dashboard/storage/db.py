@@ -1,14 +1,23 @@
 """MongoDB database client for storing experiments and datasets."""
 
 import json
+import logging
 import threading
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
+import pyarrow as pa
+from bson.errors import InvalidDocument
 from gridfs import GridFSBucket, NoFile
 from pymongo import MongoClient
+from pymongo.errors import PyMongoError
 
 from dst_dashboard.config.constants import Constants
-from dst_dashboard.config.data_structures import DataSourceConfig
+from dst_dashboard.config.data_structures import DataSourceConfig, TimeRange
+from dst_dashboard.storage import columnar
+from dst_dashboard.storage.row_filter import RowFilter
+
+logger = logging.getLogger(__name__)
 
 # Process-wide MongoClient. MongoClient manages its own internal connection
 # pool and is thread-safe, so a single instance is created lazily on first use
@@ -41,6 +50,13 @@ def _json_default(value: Any) -> str:
     raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
+def _project(row: Dict[str, Any], columns: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Keep only `columns` of a row, all of them if None."""
+    if columns is None:
+        return row
+    return {key: row[key] for key in columns if key in row}
+
+
 class DSTDatabase:
     """Database client for DST Dashboard, backed by MongoDB."""
 
@@ -60,6 +76,19 @@ class DSTDatabase:
         self.dataset_fs = GridFSBucket(self.db, bucket_name="datasets")
         self.panel_fs = GridFSBucket(self.db, bucket_name="panels")
 
+        # Columnar dataset storage: one manifest per dataset, and its rows
+        # split into fixed-size Parquet chunks, so readers only fetch the
+        # chunks and columns they need. Datasets written before this, or
+        # whose rows can't be stored as columns, live in `dataset_fs`.
+        self.dataset_manifests = self.db.dataset_manifests
+        self.dataset_chunks = self.db.dataset_chunks
+
+        # One small document per stored dataset, whichever storage holds its
+        # rows: row count, the hash of the config it was fetched with, its
+        # source window and when it was stored. Existence and staleness
+        # checks only read this index, never the rows.
+        self.dataset_index = self.db.dataset_index
+
         self._ensure_indexes()
 
     def _ensure_indexes(self):
@@ -75,6 +104,11 @@ class DSTDatabase:
             self.datasources.create_index("name", unique=True)
             self.db["datasets.files"].create_index("metadata.experiment_id")
             self.db["panels.files"].create_index("metadata.experiment_id")
+            self.dataset_manifests.create_index("id", unique=True)
+            self.dataset_manifests.create_index("experiment_id")
+            self.dataset_chunks.create_index([("dataset_id", 1), ("index", 1)], unique=True)
+            self.dataset_index.create_index("id", unique=True)
+            self.dataset_index.create_index("experiment_id")
             _indexes_ensured = True
 
     def store_experiment(self, experiment: Dict[str, Any]) -> str:
@@ -91,32 +125,204 @@ class DSTDatabase:
         return list(self.experiments.find({}, {"_id": 0}))
 
     def store_dataset(
-        self, experiment_id: str, dataset_name: str, data: List[Dict[str, Any]]
+        self,
+        experiment_id: str,
+        dataset_name: str,
+        data: List[Dict[str, Any]],
+        config_hash: Optional[str] = None,
+        time_range: Optional[TimeRange] = None,
     ) -> str:
-        """Store dataset data via GridFS. Returns the dataset ID."""
+        """Store dataset data, as columnar chunks unless disabled. Returns the dataset ID.
+
+        `config_hash` and `time_range` describe what the rows were fetched with,
+        and are recorded in the dataset index for staleness checks.
+        """
         dataset_id = f"{experiment_id}:{dataset_name}"
-        self._delete_gridfs_file(self.dataset_fs, dataset_id)
-        self.dataset_fs.upload_from_stream(
-            dataset_id,
-            json.dumps(data, default=_json_default).encode("utf-8"),
-            metadata={
+        self._delete_dataset_data(dataset_id)
+        storage = "gridfs"
+
+        if str(Constants.DST_DATASET_STORAGE) == "columnar":
+            try:
+                chunks = columnar.encode_chunks(data, int(Constants.DST_DATASET_CHUNK_ROWS))
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                logger.warning(
+                    f"Dataset '{dataset_id}' can't be stored as columns ({e}), storing it as JSON"
+                )
+            else:
+                try:
+                    self._store_dataset_chunks(
+                        dataset_id, experiment_id, dataset_name, data, chunks
+                    )
+                    storage = "columnar"
+                except (PyMongoError, InvalidDocument) as e:
+                    # InvalidDocument covers DocumentTooLarge, which isn't a PyMongoError.
+                    logger.warning(
+                        f"Dataset '{dataset_id}' chunks could not be stored ({e}), storing it as JSON"
+                    )
+                    self.dataset_manifests.delete_one({"id": dataset_id})
+                    self.dataset_chunks.delete_many({"dataset_id": dataset_id})
+
+        if storage == "gridfs":
+            self.dataset_fs.upload_from_stream(
+                dataset_id,
+                json.dumps(data, default=_json_default).encode("utf-8"),
+                metadata={
+                    "experiment_id": experiment_id,
+                    "name": dataset_name,
+                    "row_count": len(data),
+                },
+            )
+
+        # Indexed last, so an indexed dataset always has all its rows stored.
+        self.dataset_index.insert_one(
+            {
+                "id": dataset_id,
                 "experiment_id": experiment_id,
                 "name": dataset_name,
+                "storage": storage,
                 "row_count": len(data),
-            },
+                "config_hash": config_hash,
+                "source_start": columnar.to_naive_utc(time_range.start) if time_range else None,
+                "source_end": columnar.to_naive_utc(time_range.end) if time_range else None,
+                "created_at": datetime.now(timezone.utc),
+            }
         )
         return dataset_id
 
-    def get_dataset(self, experiment_id: str, dataset_name: str) -> Optional[List[Dict[str, Any]]]:
-        """Get dataset data."""
+    def _store_dataset_chunks(
+        self,
+        dataset_id: str,
+        experiment_id: str,
+        dataset_name: str,
+        data: List[Dict[str, Any]],
+        chunks: List[Dict[str, Any]],
+    ) -> None:
+        """Write the chunks of a dataset, then its manifest, which makes it visible to readers."""
+        if chunks:
+            self.dataset_chunks.insert_many([{"dataset_id": dataset_id, **c} for c in chunks])
+        self.dataset_manifests.insert_one(
+            {
+                "id": dataset_id,
+                "experiment_id": experiment_id,
+                "name": dataset_name,
+                "row_count": len(data),
+                "columns": list(dict.fromkeys(key for row in data for key in row)),
+                "chunk_count": len(chunks),
+            }
+        )
+
+    def get_dataset(
+        self, experiment_id: str, dataset_name: str, columns: Optional[Sequence[str]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Get dataset data, or None if it hasn't been stored.
+
+        :param columns: Only return these fields of each row. Columnar datasets
+            don't even read the others.
+        """
+        page = self.query_dataset(experiment_id, dataset_name, columns=columns)
+        return page[0] if page is not None else None
+
+    def query_dataset(
+        self,
+        experiment_id: str,
+        dataset_name: str,
+        columns: Optional[Sequence[str]] = None,
+        row_filter: Optional[RowFilter] = None,
+        cursor: int = 0,
+        limit: Optional[int] = None,
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+        """Get a page of the rows of a dataset matching `row_filter`, or None if it hasn't been stored.
+
+        Returns the rows and the cursor of the next page, None on the last one.
+        Chunks before `cursor` or outside the filter's range are not fetched.
+
+        :param columns: Only return these fields of each row.
+        :param cursor: Position of the first stored row to consider, as
+            returned for the previous page.
+        :param limit: Maximum number of rows returned, all of them if None.
+        """
+        chunks = self._read_dataset_chunks(experiment_id, dataset_name, columns, row_filter, cursor)
+        if chunks is None:
+            return None
+
+        rows = []
+        for row_start, chunk_rows in chunks:
+            for position, row in enumerate(chunk_rows, start=row_start):
+                if position < cursor or (row_filter is not None and not row_filter.matches(row)):
+                    continue
+                if limit is not None and len(rows) == limit:
+                    return rows, position
+                rows.append(_project(row, columns))
+        return rows, None
+
+    def iter_dataset_chunks(
+        self,
+        experiment_id: str,
+        dataset_name: str,
+        columns: Optional[Sequence[str]] = None,
+        row_filter: Optional[RowFilter] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the rows of a dataset matching `row_filter`, chunk by chunk, in order.
+
+        Only one chunk is held in memory at a time, and chunks outside the
+        filter's range are not fetched. Datasets stored as JSON are yielded as
+        a single chunk. Yields nothing if the dataset hasn't been stored.
+
+        :param columns: Only return these fields of each row.
+        """
+        chunks = self._read_dataset_chunks(experiment_id, dataset_name, columns, row_filter)
+        for _, chunk_rows in chunks or []:
+            rows = [
+                _project(row, columns)
+                for row in chunk_rows
+                if row_filter is None or row_filter.matches(row)
+            ]
+            if rows:
+                yield rows
+
+    def _read_dataset_chunks(
+        self,
+        experiment_id: str,
+        dataset_name: str,
+        columns: Optional[Sequence[str]],
+        row_filter: Optional[RowFilter],
+        cursor: int = 0,
+    ) -> Optional[Iterator[Tuple[int, List[Dict[str, Any]]]]]:
+        """Lazily read (row_start, rows) of the chunks that may hold rows past `cursor` matching `row_filter`.
+
+        Rows are read with `columns` and the fields `row_filter` needs, but are
+        neither filtered nor projected. Returns None if the dataset hasn't been stored.
+        """
         dataset_id = f"{experiment_id}:{dataset_name}"
-        payload = self._download_gridfs_file(self.dataset_fs, dataset_id)
-        return json.loads(payload) if payload is not None else None
+        if self.dataset_manifests.find_one({"id": dataset_id}, {"_id": 1}) is None:
+            payload = self._download_gridfs_file(self.dataset_fs, dataset_id)
+            return iter([(0, json.loads(payload))]) if payload is not None else None
+
+        if columns is not None and row_filter is not None:
+            columns = list(dict.fromkeys([*columns, *row_filter.fields]))
+        chunk_refs = self.dataset_chunks.find(
+            {"dataset_id": dataset_id}, {"_id": 1, "row_start": 1, "row_count": 1, "stats": 1}
+        ).sort("index", 1)
+        chunk_refs = [
+            doc
+            for doc in chunk_refs
+            if doc["row_start"] + doc["row_count"] > cursor
+            and (row_filter is None or row_filter.may_match_chunk(doc.get("stats", {})))
+        ]
+
+        def read_chunks():
+            # Chunks are fetched one at a time, so at most one is held in memory.
+            for doc in chunk_refs:
+                data = self.dataset_chunks.find_one({"_id": doc["_id"]}, {"data": 1})["data"]
+                yield doc["row_start"], columnar.decode_chunk(data, columns)
+
+        return read_chunks()
 
     def list_panels(self, experiment_id: str) -> List[Dict[str, Any]]:
         """List stored panel metadata for an experiment."""
         docs = self.db["panels.files"].find(
-            {"metadata.experiment_id": experiment_id}, {"_id": 0, "filename": 1, "metadata": 1}
+            {"metadata.experiment_id": experiment_id, "metadata.level_of": {"$exists": False}},
+            {"_id": 0, "filename": 1, "metadata": 1},
         )
         return [
             {
@@ -127,20 +333,81 @@ class DSTDatabase:
             for doc in docs
         ]
 
-    def store_panel_data(self, experiment_id: str, panel_name: str, data: Dict[str, Any]) -> str:
-        """Store transformed panel data via GridFS. Returns the panel data ID."""
+    def store_panel_data(
+        self,
+        experiment_id: str,
+        panel_name: str,
+        data: Dict[str, Any],
+        config_hash: Optional[str] = None,
+    ) -> str:
+        """Store transformed panel data via GridFS. Returns the panel data ID.
+
+        `config_hash` identifies what the panel was computed from, see get_panel_metadata.
+        """
         panel_id = f"{experiment_id}:{panel_name}"
         self._delete_gridfs_file(self.panel_fs, panel_id)
         self.panel_fs.upload_from_stream(
             panel_id,
             json.dumps(data, default=_json_default).encode("utf-8"),
-            metadata={"experiment_id": experiment_id, "name": panel_name},
+            metadata={
+                "experiment_id": experiment_id,
+                "name": panel_name,
+                "config_hash": config_hash,
+            },
         )
         return panel_id
 
-    def get_panel_data(self, experiment_id: str, panel_name: str) -> Optional[Dict[str, Any]]:
-        """Get transformed panel data."""
+    def get_panel_metadata(self, experiment_id: str, panel_name: str) -> Optional[Dict[str, Any]]:
+        """Get the metadata a panel was stored with, without its data, or None if it isn't stored."""
+        doc = self.db["panels.files"].find_one(
+            {"filename": f"{experiment_id}:{panel_name}"}, {"_id": 0, "metadata": 1}
+        )
+        return doc["metadata"] if doc is not None else None
+
+    def store_panel_levels(
+        self, experiment_id: str, panel_name: str, levels: Dict[int, Dict[str, Any]]
+    ) -> None:
+        """Replace the levels of detail of a panel, keyed by their maximum points per series."""
+        self._delete_gridfs_files_matching(
+            self.panel_fs,
+            "panels",
+            {"metadata.experiment_id": experiment_id, "metadata.level_of": panel_name},
+        )
+        for max_points, data in levels.items():
+            self.panel_fs.upload_from_stream(
+                f"{experiment_id}:{panel_name}@{max_points}",
+                json.dumps(data, default=_json_default).encode("utf-8"),
+                metadata={
+                    "experiment_id": experiment_id,
+                    "level_of": panel_name,
+                    "max_points": max_points,
+                },
+            )
+
+    def get_panel_data(
+        self, experiment_id: str, panel_name: str, max_points: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get transformed panel data.
+
+        :param max_points: Points per series wanted. Serves the coarsest level of
+            detail holding at least that many, or the finest one if none does.
+            Panels without levels always serve their default data.
+        """
         panel_id = f"{experiment_id}:{panel_name}"
+        if max_points is not None:
+            levels = list(
+                self.db["panels.files"].find(
+                    {"metadata.experiment_id": experiment_id, "metadata.level_of": panel_name},
+                    {"_id": 0, "filename": 1, "metadata.max_points": 1},
+                )
+            )
+            if levels:
+                levels.sort(key=lambda doc: doc["metadata"]["max_points"])
+                panel_id = next(
+                    (doc for doc in levels if doc["metadata"]["max_points"] >= max_points),
+                    levels[-1],
+                )["filename"]
+
         payload = self._download_gridfs_file(self.panel_fs, panel_id)
         return json.loads(payload) if payload is not None else None
 
@@ -159,13 +426,32 @@ class DSTDatabase:
     def dataset_exists(self, experiment_id: str, dataset_name: str) -> bool:
         """Check if dataset exists in database."""
         dataset_id = f"{experiment_id}:{dataset_name}"
+        if self.dataset_index.find_one({"id": dataset_id}, {"_id": 1}) is not None:
+            return True
+        # Datasets stored before the index existed.
+        if self.dataset_manifests.find_one({"id": dataset_id}, {"_id": 1}) is not None:
+            return True
         return self.db["datasets.files"].find_one({"filename": dataset_id}, {"_id": 1}) is not None
 
     def get_dataset_metadata(
         self, experiment_id: str, dataset_name: str
     ) -> Optional[Dict[str, Any]]:
-        """Get dataset metadata without data rows."""
+        """Get dataset metadata without data rows.
+
+        Indexed datasets also report their `config_hash`, `source_start`,
+        `source_end` and `created_at`, which are missing for older datasets.
+        """
         dataset_id = f"{experiment_id}:{dataset_name}"
+        entry = self.dataset_index.find_one({"id": dataset_id}, {"_id": 0})
+        if entry is not None:
+            return entry
+
+        manifest = self.dataset_manifests.find_one(
+            {"id": dataset_id}, {"_id": 0, "id": 1, "experiment_id": 1, "name": 1, "row_count": 1}
+        )
+        if manifest is not None:
+            return manifest
+
         doc = self.db["datasets.files"].find_one(
             {"filename": dataset_id}, {"_id": 0, "filename": 1, "metadata": 1}
         )
@@ -181,6 +467,13 @@ class DSTDatabase:
     def delete_experiment(self, experiment_id: str) -> bool:
         """Delete an experiment and cascade to its datasets and panels."""
         result = self.experiments.delete_one({"id": experiment_id})
+        self.dataset_index.delete_many({"experiment_id": experiment_id})
+        dataset_ids = [
+            doc["id"]
+            for doc in self.dataset_manifests.find({"experiment_id": experiment_id}, {"id": 1})
+        ]
+        self.dataset_chunks.delete_many({"dataset_id": {"$in": dataset_ids}})
+        self.dataset_manifests.delete_many({"experiment_id": experiment_id})
         self._delete_gridfs_files_matching(
             self.dataset_fs, "datasets", {"metadata.experiment_id": experiment_id}
         )
@@ -192,20 +485,33 @@ class DSTDatabase:
     def delete_dataset(self, experiment_id: str, dataset_name: str) -> bool:
         """Delete a dataset."""
         dataset_id = f"{experiment_id}:{dataset_name}"
-        return self._delete_gridfs_file(self.dataset_fs, dataset_id)
+        return self._delete_dataset_data(dataset_id)
 
     def delete_panel(self, experiment_id: str, panel_name: str) -> bool:
-        """Delete a panel."""
+        """Delete a panel and its levels of detail."""
         panel_id = f"{experiment_id}:{panel_name}"
+        self.store_panel_levels(experiment_id, panel_name, {})
         return self._delete_gridfs_file(self.panel_fs, panel_id)
 
     def clear_all_dataset_cache(self) -> int:
         """Delete all cached dataset data across every experiment. Returns count removed."""
         count = self.db["datasets.files"].count_documents({})
+        count += self.dataset_manifests.count_documents({})
+        self.dataset_index.delete_many({})
         self.db["datasets.chunks"].delete_many({})
         self.db["datasets.files"].delete_many({})
+        self.dataset_manifests.delete_many({})
+        self.dataset_chunks.delete_many({})
         return count
 
+    def _delete_dataset_data(self, dataset_id: str) -> bool:
+        """Delete a dataset from both storages. Returns True if it was found in either."""
+        # The index entry and manifest go first, so readers never see a dataset with missing rows.
+        deleted = self.dataset_index.delete_one({"id": dataset_id}).deleted_count > 0
+        deleted = self.dataset_manifests.delete_one({"id": dataset_id}).deleted_count > 0 or deleted
+        self.dataset_chunks.delete_many({"dataset_id": dataset_id})
+        return self._delete_gridfs_file(self.dataset_fs, dataset_id) or deleted
+
     @staticmethod
     def _delete_gridfs_file(bucket: GridFSBucket, filename: str) -> bool:
         """Delete a GridFS file by filename. Returns True if a file was found and deleted."""
@@ -0,0 +1,72 @@
+"""Row filters applied while reading datasets from storage."""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel
+
+from dst_dashboard.storage.columnar import chunk_overlaps, to_naive_utc
+
+Bound = Union[datetime, float, None]
+
+
+class RowFilter(BaseModel):
+    """Keep rows whose `range_field` is within [start, end] and whose `group_field` is one of `groups`.
+
+    Datetime bounds match datetime values and ISO strings, numeric bounds match
+    numbers. Rows whose value can't be compared with the bounds are dropped.
+    Groups are compared as strings, as they come from query parameters.
+    """
+
+    range_field: Optional[str] = None
+    start: Bound = None
+    end: Bound = None
+    group_field: Optional[str] = None
+    groups: Optional[List[str]] = None
+
+    @property
+    def fields(self) -> List[str]:
+        """Fields a row must be read with to be filtered."""
+        return [field for field in (self.range_field, self.group_field) if field is not None]
+
+    def may_match_chunk(self, stats: Dict[str, Dict[str, Any]]) -> bool:
+        """Whether a chunk may hold matching rows, judging by its min/max stats."""
+        if self.range_field is None:
+            return True
+        return chunk_overlaps(
+            stats, self.range_field, to_naive_utc(self.start), to_naive_utc(self.end)
+        )
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        if self.group_field is not None and self.groups is not None:
+            if str(row.get(self.group_field)) not in self.groups:
+                return False
+
+        if self.range_field is None or (self.start is None and self.end is None):
+            return True
+        value = self._comparable(row.get(self.range_field))
+        if value is None:
+            return False
+        try:
+            if self.start is not None and value < to_naive_utc(self.start):
+                return False
+            if self.end is not None and value > to_naive_utc(self.end):
+                return False
+        except TypeError:
+            return False
+        return True
+
+    def _comparable(self, value: Any) -> Any:
+        """`value` in the same kind as the bounds, or None if it can't be."""
+        bound = self.start if self.start is not None else self.end
+        if isinstance(bound, datetime):
+            if isinstance(value, str):
+                try:
+                    value = datetime.fromisoformat(value)
+                except ValueError:
+                    return None
+            return to_naive_utc(value) if isinstance(value, datetime) else None
+
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        return None
@@ -0,0 +1,78 @@
+import itertools
+import os
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pytest
+
+from dst_dashboard.storage.columnar import chunk_overlaps, decode_chunk, encode_chunks
+
+
+def test_round_trip_matches_json_storage():
+    rows = [
+        {"pod": "n-0", "value": 1, "time": datetime(2026, 1, 1, tzinfo=timezone.utc)},
+        {"pod": "n-1", "value": 2.5},
+        {"pod": "n-2", "extra": [1, 2]},
+    ]
+
+    [chunk] = encode_chunks(rows)
+
+    assert decode_chunk(chunk["data"]) == [
+        {"pod": "n-0", "value": 1.0, "time": "2026-01-01T00:00:00+00:00"},
+        {"pod": "n-1", "value": 2.5},
+        {"pod": "n-2", "extra": [1, 2]},
+    ]
+
+
+def test_chunks_have_fixed_size_and_stats():
+    rows = [{"i": i, "name": str(i)} for i in range(5)]
+
+    chunks = encode_chunks(rows, chunk_rows=2)
+
+    assert [(c["index"], c["row_start"], c["row_count"]) for c in chunks] == [
+        (0, 0, 2),
+        (1, 2, 2),
+        (2, 4, 1),
+    ]
+    assert [c["stats"] for c in chunks] == [
+        {"i": {"min": 0, "max": 1}},
+        {"i": {"min": 2, "max": 3}},
+        {"i": {"min": 4, "max": 4}},
+    ]
+    assert decode_chunk(chunks[1]["data"], columns=["name", "unknown"]) == [
+        {"name": "2"},
+        {"name": "3"},
+    ]
+
+
+def test_mixed_column_types_are_rejected():
+    with pytest.raises((pa.ArrowException, TypeError, ValueError)):
+        encode_chunks([{"value": 1}, {"value": "a"}])
+
+
+def test_chunk_overlaps():
+    stats = {"i": {"min": 2, "max": 3}}
+
+    assert chunk_overlaps(stats, "i", 3, 10)
+    assert not chunk_overlaps(stats, "i", 4, None)
+    assert not chunk_overlaps(stats, "i", None, 1)
+    assert chunk_overlaps(stats, "name", 4, None)
+
+
+def test_chunks_over_the_byte_limit_are_split():
+    rows = [{"i": i, "_msg": os.urandom(2_000).hex()} for i in range(40)]
+
+    chunks = encode_chunks(rows, chunk_rows=40, max_chunk_bytes=30_000)
+
+    assert len(chunks) > 1
+    assert all(len(c["data"]) <= 30_000 for c in chunks)
+    assert [c["index"] for c in chunks] == list(range(len(chunks)))
+    assert [c["row_start"] for c in chunks] == list(
+        itertools.accumulate([0] + [c["row_count"] for c in chunks[:-1]])
+    )
+    assert [row for c in chunks for row in decode_chunk(c["data"])] == rows
+
+
+def test_a_row_over_the_byte_limit_is_rejected():
+    with pytest.raises(ValueError):
+        encode_chunks([{"_msg": os.urandom(20_000).hex()}], max_chunk_bytes=10_000)
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from pymongo.errors import DocumentTooLarge
+
+from dst_dashboard.storage import db as db_module
+from dst_dashboard.storage.db import DSTDatabase
+
+
+def _database(mocker) -> DSTDatabase:
+    mocker.patch.object(
+        db_module,
+        "Constants",
+        SimpleNamespace(DST_DATASET_STORAGE="columnar", DST_DATASET_CHUNK_ROWS=2),
+    )
+    database = DSTDatabase.__new__(DSTDatabase)
+    for collection in ["dataset_fs", "dataset_manifests", "dataset_chunks", "dataset_index"]:
+        setattr(database, collection, MagicMock())
+    database.dataset_fs.find.return_value = []
+    database.dataset_index.delete_one.return_value.deleted_count = 0
+    database.dataset_manifests.delete_one.return_value.deleted_count = 0
+    return database
+
+
+class TestStoreDataset:
+    """Tests for DSTDatabase.store_dataset."""
+
+    def test_stores_chunks_and_manifest(self, mocker):
+        """Should store a dataset as columnar chunks by default."""
+        database = _database(mocker)
+
+        database.store_dataset("exp-1", "logs", [{"i": i} for i in range(3)])
+
+        assert len(database.dataset_chunks.insert_many.call_args.args[0]) == 2
+        database.dataset_fs.upload_from_stream.assert_not_called()
+        assert database.dataset_index.insert_one.call_args.args[0]["storage"] == "columnar"
+
+    def test_falls_back_to_gridfs_when_chunks_cant_be_written(self, mocker):
+        """Should remove the chunks already written and store the rows as JSON."""
+        database = _database(mocker)
+        database.dataset_chunks.insert_many.side_effect = DocumentTooLarge("too large")
+
+        database.store_dataset("exp-1", "logs", [{"i": i} for i in range(3)])
+
+        database.dataset_chunks.delete_many.assert_called_with({"dataset_id": "exp-1:logs"})
+        database.dataset_fs.upload_from_stream.assert_called_once()
+        assert database.dataset_index.insert_one.call_args.args[0]["storage"] == "gridfs"
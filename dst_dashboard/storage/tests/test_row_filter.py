@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+
+from dst_dashboard.storage.row_filter import RowFilter
+
+
+def test_datetime_range_matches_iso_strings():
+    row_filter = RowFilter(
+        range_field="ts",
+        start=datetime(2026, 1, 1, 1, tzinfo=timezone.utc),
+        end=datetime(2026, 1, 1, 2),
+    )
+
+    assert row_filter.matches({"ts": "2026-01-01T01:30:00+00:00"})
+    assert row_filter.matches({"ts": "2026-01-01T03:30:00+02:00"})
+    assert not row_filter.matches({"ts": "2026-01-01T00:59:59Z"})
+    assert not row_filter.matches({"ts": 1.5})
+    assert not row_filter.matches({"other": "2026-01-01T01:30:00"})
+
+
+def test_numeric_range_and_groups():
+    row_filter = RowFilter(range_field="v", start=2, group_field="pod", groups=["n-0", "1"])
+
+    assert row_filter.matches({"v": 2, "pod": "n-0"})
+    assert row_filter.matches({"v": 3.5, "pod": 1})
+    assert not row_filter.matches({"v": 1, "pod": "n-0"})
+    assert not row_filter.matches({"v": 3, "pod": "n-2"})
+    assert row_filter.fields == ["v", "pod"]
+
+
+def test_chunks_are_pruned_by_stats():
+    row_filter = RowFilter(range_field="ts", end=datetime(2026, 1, 1, 2, tzinfo=timezone.utc))
+    stats = {"ts": {"min": datetime(2026, 1, 1, 3), "max": datetime(2026, 1, 1, 4)}}
+
+    assert not row_filter.may_match_chunk(stats)
+    assert row_filter.may_match_chunk({})
+    assert RowFilter(group_field="pod", groups=["a"]).may_match_chunk(stats)
@@ -1,7 +1,7 @@
 # Python Imports
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import pandas as pd
 from pydantic import BaseModel
@@ -9,7 +9,7 @@ from result import Err, Ok, Result
 
 # Project Imports
 from src.analysis.data.data_handler import DataHandler
-from src.analysis.utils import file_utils
+from src.analysis.utils import dataframe_io, file_utils
 
 logger = logging.getLogger(__name__)
 
@@ -21,52 +21,75 @@ class DataPath(BaseModel):
     """Data path"""
 
 
+class DataFileCache:
+    """
+    Dataframes of the data files read during a plotting session. Each file is read once, whole,
+    and every reader gets the first rows and the columns it needs from the same dataframe.
+    Cached dataframes are shared, so readers must not modify them in place.
+    """
+
+    def __init__(self):
+        self._frames: Dict[Path, pd.DataFrame] = {}
+
+    def read(self, file_path: Path) -> pd.DataFrame:
+        key = Path(file_path).resolve()
+        if key not in self._frames:
+            logger.debug(f"Loading {file_path}")
+            self._frames[key] = dataframe_io.read_dataframe(
+                file_path, index_col="Time", parse_dates=["Time"]
+            )
+        return self._frames[key]
+
+    def clear(self):
+        self._frames.clear()
+
+
 class DataFileHandler(DataHandler):
-    def __init__(self, ignore_columns: Optional[List] = None, include_files: Optional[List] = None):
+    def __init__(
+        self,
+        ignore_columns: Optional[List] = None,
+        include_files: Optional[List] = None,
+        cache: Optional[DataFileCache] = None,
+    ):
+        """:param cache: Cache to read files through. Without it, every read goes to disk."""
         super().__init__(ignore_columns)
         self._include_files = include_files
+        self._cache = cache
 
     def concat_dataframes_from_folders_as_mean(self, folders: List, points: int):
+        folder_dfs = [self._dataframe]
         for folder in folders:
             folder_path = Path(folder)
-            folder_df = pd.DataFrame()
             match file_utils.get_files_from_folder_path(folder_path, self._include_files):
                 case Ok(data_files_names):
-                    folder_df = self._concat_files_as_mean(
-                        folder_df, data_files_names, folder_path, points
-                    )
+                    folder_df = self._concat_files_as_mean(data_files_names, folder_path, points)
                     folder_df["class"] = f"{folder_path.parent.name}/{folder_path.name}"
-                    self._dataframe = pd.concat([self._dataframe, folder_df])
+                    folder_dfs.append(folder_df)
                 case Err(error):
                     logger.error(error)
+        self._dataframe = pd.concat(folder_dfs)
 
     def _concat_files_as_mean(
-        self, target_df: pd.DataFrame, data_files_path: List, location: Path, points: int
+        self, data_files_path: List, location: Path, points: int
     ) -> pd.DataFrame:
+        """One column per file, holding the means of its columns, concatenated at once."""
+        means = []
         for file_path in data_files_path:
-            match self._concat_data_as_mean_from_file(target_df, location / file_path, points):
-                case Ok(result_df):
+            match self._data_mean_from_file(location / file_path, points):
+                case Ok(mean):
                     logger.info(f"{file_path} added")
-                    target_df = result_df
+                    means.append(mean)
                 case Err(msg):
                     logger.error(msg)
 
-        return target_df
+        return pd.concat(means, axis=1) if means else pd.DataFrame()
 
-    def _concat_data_as_mean_from_file(
-        self, target_df: pd.DataFrame, file_path: Path, points: int
-    ) -> Result[pd.DataFrame, str]:
+    def _data_mean_from_file(self, file_path: Path, points: int) -> Result[pd.Series, str]:
         if not file_path.exists():
             return Err(f"{file_path} cannot be dumped to memory.")
 
-        logger.info(f"Reading {file_path} with {points} datapoints")
-        file_df = pd.read_csv(file_path, parse_dates=["Time"], index_col="Time", nrows=points)
-        if len(file_df) < points:
-            logger.warning(f"Not enough datapoints in {file_path}")
-
-        target_df = self.concat_data_as_mean(target_df, file_df, file_path.name)
-
-        return Ok(target_df)
+        file_df = self._read_file(file_path, points)
+        return Ok(self.data_mean(file_df, file_path.name))
 
     def concat_dataframes_from_files(
         self,
@@ -74,17 +97,14 @@ class DataFileHandler(DataHandler):
         group_name: str,
         points: int,
     ):
+        file_dfs = [self._dataframe]
         for data_file in named_files:
             file_path = Path(data_file.path)
             if not file_path.exists():
                 logger.error(f"{file_path} cannot be loaded.")
                 continue
 
-            logger.info(f"Reading {file_path} with {points} datapoints")
-            file_df = pd.read_csv(file_path, parse_dates=["Time"], index_col="Time", nrows=points)
-            if len(file_df) < points:
-                logger.warning(f"Not enough datapoints in {file_path}")
-
+            file_df = self._read_file(file_path, points)
             if self._ignore_columns:
                 columns_to_drop = [
                     col
@@ -98,4 +118,18 @@ class DataFileHandler(DataHandler):
             file_df = file_df.reset_index(drop=True)
             file_df["class"] = group_name
             file_df["variable"] = data_file.name
-            self._dataframe = pd.concat([self._dataframe, file_df], ignore_index=True)
+            file_dfs.append(file_df)
+        self._dataframe = pd.concat(file_dfs, ignore_index=True)
+
+    def _read_file(self, file_path: Path, points: int) -> pd.DataFrame:
+        logger.info(f"Reading {file_path} with {points} datapoints")
+        if self._cache is not None:
+            file_df = self._cache.read(file_path).head(points)
+        else:
+            file_df = dataframe_io.read_dataframe(
+                file_path, index_col="Time", parse_dates=["Time"], nrows=points
+            )
+        if len(file_df) < points:
+            logger.warning(f"Not enough datapoints in {file_path}")
+
+        return file_df
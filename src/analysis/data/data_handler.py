@@ -5,7 +5,8 @@ from typing import List, Optional
 import pandas as pd
 
 # Project Imports
-from src.analysis.utils import path_utils
+from src.analysis.utils import dataframe_io, path_utils
+from src.analysis.utils.dataframe_io import DataFormat
 
 logger = logging.getLogger(__name__)
 
@@ -15,18 +16,22 @@ class DataHandler:
         self._ignore_columns = ignore_columns
         self._dataframe = pd.DataFrame()
 
-    def dump_dataframe(self, dump_path: str):
+    def dump_dataframe(self, dump_path: str, data_format: DataFormat = "csv"):
         result = path_utils.prepare_path_for_file(dump_path)
         if result.is_err():
             logger.error(f"{result.err_value}")
             exit(1)
 
-        self._dataframe.to_csv(result.ok_value)
+        dataframe_io.write_dataframe(self._dataframe, result.ok_value, data_format)
         logger.debug(f"{dump_path} data dumped")
 
     def concat_data_as_mean(
         self, target_df: pd.DataFrame, data_df: pd.DataFrame, column_name: str
     ) -> pd.DataFrame:
+        return pd.concat([target_df, self.data_mean(data_df, column_name)], axis=1)
+
+    def data_mean(self, data_df: pd.DataFrame, column_name: str) -> pd.Series:
+        """Mean of every column of `data_df` not ignored, as a series named `column_name`."""
         if self._ignore_columns:
             columns_to_drop = [
                 col
@@ -36,11 +41,7 @@ class DataHandler:
             logger.info(f"Dropping {len(columns_to_drop)} columns: {columns_to_drop}")
             data_df = data_df.drop(columns=columns_to_drop)
 
-        df_mean = data_df.mean()
-        df_mean = pd.DataFrame(df_mean, columns=[column_name])
-        target_df = pd.concat([target_df, df_mean], axis=1)
-
-        return target_df
+        return data_df.mean().rename(column_name)
 
     @property
     def dataframe(self) -> pd.DataFrame:
@@ -1,7 +1,8 @@
 # Python Imports
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 
+import numpy as np
 import pandas as pd
 
 # Project Imports
@@ -18,8 +19,16 @@ class DataRequestHandler(DataHandler):
         self._dataframe = pd.DataFrame()
 
     def create_dataframe_from_request(
-        self, extract_placeholder: str, container_name: Optional[str], metrics_path: Optional[str]
+        self,
+        extract_placeholder: str,
+        container_name: Optional[str],
+        metrics_path: Optional[str],
+        step: Optional[float] = None,
     ):
+        """
+        :param step: If set, timestamps are rounded to multiples of `step` seconds, so series
+        scraped with slightly different timestamps share rows.
+        """
         data_result = self._raw_data["data"]["result"]
         if container_name is not None:
             data_result = [
@@ -38,19 +47,39 @@ class DataRequestHandler(DataHandler):
 
         logger.info(f"Dumping {len(data_result)} instances")
 
+        column_names = []
+        seen_names = set()
+        sample_columns = []
+        sample_values = []
         for pod_result_dict in data_result:
             final_column_name = self._extract_column_name_from_result(
                 extract_placeholder, pod_result_dict
             )
-            if final_column_name in self._dataframe:
+            if final_column_name in seen_names:
                 duplicated += 1
+                final_column_name = f"{final_column_name}_{duplicated}"
+            column_names.append(final_column_name)
+            seen_names.add(final_column_name)
 
             values = pod_result_dict["values"]
-            pod_df = self._create_pod_df(final_column_name, values)
-
-            self._dataframe = pd.merge(
-                self._dataframe, pod_df, how="outer", left_index=True, right_index=True
+            sample_columns.append(np.full(len(values), len(column_names) - 1))
+            sample_values.extend(values)
+
+        if column_names:
+            # Every sample in one long frame, aligned with a single pivot on the union of
+            # timestamps instead of one merge per series.
+            samples = pd.DataFrame(sample_values, columns=["Time", "value"])
+            samples["Time"] = self._to_datetime(samples["Time"], step)
+            samples["column"] = np.concatenate(sample_columns)
+            samples = samples.drop_duplicates(["Time", "column"], keep="last")
+            self._dataframe = (
+                samples.set_index(["Time", "column"])["value"]
+                .unstack("column")
+                .reindex(columns=range(len(column_names)))
+                .astype(object)
+                .set_axis(column_names, axis=1)
             )
+            self._dataframe.columns.name = None
         if duplicated != 0:
             logger.warning(f"Duplicated data: {duplicated} of {len(self._dataframe.columns)}")
 
@@ -63,12 +92,13 @@ class DataRequestHandler(DataHandler):
 
         return final_column_name
 
-    def _create_pod_df(self, column_name: str, values: List) -> pd.DataFrame:
-        pod_df = pd.DataFrame(values, columns=["Time", column_name])
-        pod_df["Time"] = pd.to_datetime(pod_df["Time"], unit="s")
-        pod_df.set_index("Time", inplace=True)
+    @staticmethod
+    def _to_datetime(times: pd.Series, step: Optional[float] = None) -> pd.Series:
+        times = pd.to_datetime(times.astype(float), unit="s")
+        if step:
+            times = times.dt.round(pd.Timedelta(seconds=step))
 
-        return pod_df
+        return times
 
     def _sort_dataframe_columns(self):
         columns = list_utils.order_by_groups(self._dataframe.columns.tolist())
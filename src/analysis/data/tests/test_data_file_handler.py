@@ -0,0 +1,70 @@
+import pandas as pd
+
+from src.analysis.data import data_file_handler
+from src.analysis.data.data_file_handler import DataFileCache, DataFileHandler, DataPath
+
+
+def _write_metric(path, n_points: int):
+    df = pd.DataFrame(
+        {
+            "bootstrap-0": range(n_points),
+            "nodes-0": range(n_points),
+            "nodes-1": range(10, 10 + n_points),
+        },
+        index=pd.date_range("2026-08-05", periods=n_points, freq="min", name="Time"),
+    )
+    df.to_csv(path)
+    return path
+
+
+def _load(named_files, cache=None, points=3) -> pd.DataFrame:
+    handler = DataFileHandler(["bootstrap"], cache=cache)
+    handler.concat_dataframes_from_files(named_files, "muxer", points)
+    return handler.dataframe
+
+
+def test_cached_reads_match_direct_reads(tmp_path):
+    named_files = [
+        DataPath(name="v1", path=_write_metric(tmp_path / "v1", 5)),
+        DataPath(name="v2", path=_write_metric(tmp_path / "v2", 2)),
+        DataPath(name="missing", path=tmp_path / "missing"),
+    ]
+
+    direct = _load(named_files)
+
+    pd.testing.assert_frame_equal(_load(named_files, DataFileCache()), direct)
+    assert list(direct.columns) == ["nodes-0", "nodes-1", "class", "variable"]
+    assert direct["variable"].tolist() == ["v1"] * 3 + ["v2"] * 2
+
+
+def test_each_file_is_read_once_per_cache(tmp_path, monkeypatch):
+    reads = []
+    read_dataframe = data_file_handler.dataframe_io.read_dataframe
+
+    def counting_read(file_path, **kwargs):
+        reads.append(file_path)
+        return read_dataframe(file_path, **kwargs)
+
+    monkeypatch.setattr(data_file_handler.dataframe_io, "read_dataframe", counting_read)
+    named_files = [DataPath(name="v1", path=_write_metric(tmp_path / "v1", 5))]
+    cache = DataFileCache()
+
+    assert len(_load(named_files, cache, points=2)) == 2
+    assert len(_load(named_files, cache, points=4)) == 4
+    assert len(reads) == 1
+
+
+def test_folder_means_have_one_column_per_file(tmp_path):
+    folder = tmp_path / "run" / "muxer"
+    folder.mkdir(parents=True)
+    _write_metric(folder / "a.csv", 3)
+    _write_metric(folder / "b.csv", 5)
+    handler = DataFileHandler(["bootstrap"])
+
+    handler.concat_dataframes_from_folders_as_mean([folder], points=5)
+
+    df = handler.dataframe
+    assert sorted(df.columns) == ["a.csv", "b.csv", "class"]
+    assert df.loc["nodes-1", "a.csv"] == 11
+    assert df.loc["nodes-0", "b.csv"] == 2
+    assert set(df["class"]) == {"run/muxer"}
@@ -0,0 +1,57 @@
+import pandas as pd
+
+from src.analysis.data.data_request_handler import DataRequestHandler
+
+T0 = 1785892500
+
+
+def _series(pod: str, values, container: str = "waku"):
+    return {"metric": {"pod": pod, "container": container}, "values": values}
+
+
+def _dataframe(result, **kwargs) -> pd.DataFrame:
+    handler = DataRequestHandler({"data": {"result": result}})
+    handler.create_dataframe_from_request("pod", kwargs.pop("container", None), None, **kwargs)
+    return handler.dataframe
+
+
+def test_series_are_aligned_on_the_union_of_timestamps():
+    df = _dataframe(
+        [
+            _series("nodes-1", [[T0 + 60, "2"], [T0 + 120, "3"]]),
+            _series("nodes-0", [[T0, "1"], [T0 + 60, "4"]]),
+            _series("bootstrap-0", []),
+        ]
+    )
+
+    assert list(df.columns) == ["bootstrap-0", "nodes-0", "nodes-1"]
+    assert list(df.index) == list(pd.to_datetime([T0, T0 + 60, T0 + 120], unit="s"))
+    assert df.index.name == "Time"
+    assert df["nodes-0"].tolist()[:2] == ["1", "4"]
+    assert pd.isna(df["nodes-1"].iloc[0]) and df["bootstrap-0"].isna().all()
+
+
+def test_duplicated_columns_are_kept_and_filtered_by_container():
+    df = _dataframe(
+        [
+            _series("nodes-0", [[T0, "1"]]),
+            _series("nodes-0", [[T0, "2"]]),
+            _series("nodes-0", [[T0, "3"]], container="sidecar"),
+        ],
+        container="waku",
+    )
+
+    assert df.loc[pd.to_datetime(T0, unit="s")].tolist() == ["1", "2"]
+
+
+def test_timestamps_are_snapped_to_the_step():
+    df = _dataframe(
+        [
+            _series("nodes-0", [[T0 + 0.4, "1"], [T0 + 60.2, "2"]]),
+            _series("nodes-1", [[T0 - 0.3, "3"]]),
+        ],
+        step=60,
+    )
+
+    assert len(df) == 2
+    assert df.iloc[0].tolist() == ["1", "3"]
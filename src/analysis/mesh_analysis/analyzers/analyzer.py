@@ -12,6 +12,7 @@ from pydantic import BaseModel
 # Project Imports
 from src.analysis.mesh_analysis.analyzers.data_puller import DataPuller
 from src.analysis.utils import path_utils
+from src.analysis.utils.dataframe_io import DataFormat
 
 logger = logging.getLogger(__name__)
 sns.set_theme()
@@ -62,6 +63,8 @@ class Analyzer(BaseModel):
     _analysis_steps: List[AnalysisStep] = []
     data_puller: Optional[DataPuller] = None
     dump_analysis_dir: Optional[Path] = None
+    summary_format: DataFormat = "csv"
+    """Format of the summary files dumped in `dump_analysis_dir`."""
 
     def run(self) -> List[AnalysisResult]:
         self._set_up_paths()
@@ -95,6 +98,10 @@ class Analyzer(BaseModel):
         self.dump_analysis_dir = Path(dump_analysis_dir)
         return self
 
+    def with_summary_format(self, summary_format: DataFormat) -> Self:
+        self.summary_format = summary_format
+        return self
+
     def with_data_puller(self, data_puller: DataPuller) -> Self:
         self.data_puller = data_puller
         return self
@@ -1,5 +1,7 @@
 # Python Imports
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import ClassVar, Dict, Iterable, List, Literal, Optional, Self, Type
 
@@ -13,10 +15,12 @@ from src.analysis.mesh_analysis.readers.builders.victoria_reader_builder import
 )
 from src.analysis.mesh_analysis.readers.file_reader import FileReader
 from src.analysis.mesh_analysis.readers.reader import Reader
+from src.analysis.mesh_analysis.readers.trace_cache import TraceCache
 from src.analysis.mesh_analysis.readers.tracers.message_tracer import MessageTracer
 from src.analysis.mesh_analysis.stacks.file_stack_analysis import FileStackAnalysis
 from src.analysis.mesh_analysis.stacks.stack_analysis import StackAnalysis
 from src.analysis.mesh_analysis.stacks.vaclab_stack_analysis import VaclabStackAnalysis
+from src.analysis.utils.log_utils import apply_config, capture_current_logging, get_log_queue
 
 logger = logging.getLogger(__name__)
 sns.set_theme()
@@ -28,7 +32,54 @@ class DataPuller(BaseModel):
     _stack_cls: ClassVar[Type[StackAnalysis]]
     _source_type: str
     _local_folder: Optional[str] = None
-    _jobs: PositiveInt = 6
+    _jobs: Optional[PositiveInt] = None
+    _executor: Optional[ProcessPoolExecutor] = None
+    # Conservative bound for the queries VictoriaLogs runs at once (`-search.maxConcurrentRequests`).
+    default_max_concurrent_queries: ClassVar[int] = 16
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool shared by the queries of this puller, if it was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def with_jobs(self, jobs: PositiveInt) -> Self:
+        self._jobs = jobs
+        return self
+
+    def _get_jobs(self) -> int:
+        """
+        Number of workers. Parsing is CPU bound, so it is capped by the CPU count. For Victoria,
+        it is also capped by the number of queries the server runs at once (`max_concurrent_queries`
+        in kwargs), as further queries would just wait in the server's queue.
+        """
+        if self._jobs is not None:
+            return self._jobs
+        jobs = os.cpu_count() or 1
+        if self._source_type == "victoria":
+            max_queries = self.kwargs.get(
+                "max_concurrent_queries", self.default_max_concurrent_queries
+            )
+            jobs = min(jobs, max_queries)
+        return max(jobs, 1)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Worker pool created on first use and reused by every query of this puller."""
+        if self._executor is None:
+            jobs = self._get_jobs()
+            logger.debug(f"Starting pool of {jobs} workers")
+            self._executor = ProcessPoolExecutor(
+                jobs,
+                initializer=apply_config,
+                initargs=(capture_current_logging(), get_log_queue()),
+            )
+        return self._executor
 
     def with_local(self, folder: str) -> Self:
         self._local_folder = folder
@@ -50,7 +101,7 @@ class DataPuller(BaseModel):
         self._source_type = source
         return self
 
-    def _make_stack(self, tracer: MessageTracer) -> StackAnalysis:
+    def _make_stack(self, tracer: MessageTracer, parallel: bool = False) -> StackAnalysis:
         if self._source_type != "victoria":
             raise NotImplementedError(f"Cannot build stack for type: `{self._source_type}`")
         reader_builder = VictoriaReaderBuilder(
@@ -58,7 +109,19 @@ class DataPuller(BaseModel):
             kwargs=self.kwargs,
             extra_fields=self.kwargs["extra_fields"],
         )
-        return VaclabStackAnalysis(reader_builder)
+        return VaclabStackAnalysis(
+            reader_builder,
+            executor=self._get_executor() if parallel else None,
+            cache=self._make_cache(tracer),
+            pods_per_query=self.kwargs.get("pods_per_query"),
+        )
+
+    def _make_cache(self, tracer: MessageTracer) -> Optional[TraceCache]:
+        """Traced dataframes are cached on disk if `trace_cache_dir` is given in kwargs."""
+        cache_dir = self.kwargs.get("trace_cache_dir")
+        if cache_dir is None:
+            return None
+        return TraceCache(Path(cache_dir), self.kwargs, tracer)
 
     def get_all_node_dataframes(
         self,
@@ -67,10 +130,10 @@ class DataPuller(BaseModel):
         nodes_per_ss: List[NonNegativeInt],
     ) -> List[Dict[str, List[pd.DataFrame]]]:
         if self._source_type == "victoria":
-            stack = self._make_stack(tracer)
-            return stack.get_all_node_dataframes(stateful_sets, nodes_per_ss, self._jobs)
+            stack = self._make_stack(tracer, parallel=True)
+            return stack.get_all_node_dataframes(stateful_sets, nodes_per_ss, self._get_jobs())
         elif self._source_type == "local":
-            reader = FileReader(self._local_folder, tracer, self._jobs)
+            reader = FileReader(self._local_folder, tracer, self._get_jobs())
             dfs = reader.get_dataframes()
             return dfs
         raise NotImplementedError()
@@ -88,12 +151,12 @@ class DataPuller(BaseModel):
             return stack.get_number_nodes(stateful_sets)
         elif self._source_type == "local":
             tracer = MessageTracer().with_wildcard_pattern()
-            puller = FileReader(self._local_folder, tracer, self._jobs)
+            puller = FileReader(self._local_folder, tracer, self._get_jobs())
             stack = FileStackAnalysis(reader=puller)
             return stack.get_number_nodes(stateful_sets)
         raise NotImplementedError()
 
     def _dump_logs(self, nodes: Iterable[str], dump_analysis_dir: Path):
         tracer = MessageTracer().with_wildcard_pattern()
-        stack = self._make_stack(tracer)
-        stack.dump_node_logs(8, nodes, dump_analysis_dir)
+        stack = self._make_stack(tracer, parallel=True)
+        stack.dump_node_logs(self._get_jobs(), nodes, dump_analysis_dir)
@@ -6,6 +6,7 @@ import pandas as pd
 import seaborn as sns
 
 from src.analysis.mesh_analysis.analyzers.analyzer import AnalysisResult, Analyzer, OnFail
+from src.analysis.utils import dataframe_io
 from src.analysis.utils.plot_utils import add_boxplot_stat_labels
 
 logger = logging.getLogger(__name__)
@@ -87,9 +88,11 @@ class GossipsubPriorityQueuesAnalyzer(Analyzer):
         if self._dump_analysis_path:
             summary_dir = self._dump_analysis_path / "summary"
             summary_dir.mkdir(parents=True, exist_ok=True)
-            received_csv = summary_dir / "received.csv"
-            delay_df.to_csv(received_csv, index=False)
-            logger.info(f"Saved received messages to {received_csv}")
+            received_file = dataframe_io.with_format_extension(
+                summary_dir / "received.csv", self.summary_format
+            )
+            dataframe_io.write_dataframe(delay_df, received_file, self.summary_format, index=False)
+            logger.info(f"Saved received messages to {received_file}")
 
         # Generate boxplot
         if self._dump_analysis_path:
@@ -1,8 +1,10 @@
+import bisect
+import functools
 import hashlib
 import logging
 import re
 from collections import Counter
-from typing import Any, Dict, List, Optional, Self
+from typing import Any, Dict, Iterable, List, Optional, Self
 
 import numpy as np
 import pandas as pd
@@ -12,6 +14,10 @@ from src.analysis.mesh_analysis.readers.tracers.kad_dht_tracer import KadDHTTrac
 
 logger = logging.getLogger(__name__)
 
+BASE58_DIGITS = {
+    char: i for i, char in enumerate("123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz")
+}
+
 
 # -------------
 # HELPERS
@@ -32,18 +38,13 @@ def normalize_status(status: str) -> str:
     return value or "unknown"
 
 
+@functools.lru_cache(maxsize=None)
 def get_kad_id(peer_id_b58: str) -> bytes:
-    alphabet = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
     num = 0
     for char in peer_id_b58:
-        num = num * 58 + alphabet.index(char)
+        num = num * 58 + BASE58_DIGITS[char]
     raw_bytes = num.to_bytes((num.bit_length() + 7) // 8, "big")
-    pad = 0
-    for char in peer_id_b58:
-        if char == "1":
-            pad += 1
-        else:
-            break
+    pad = len(peer_id_b58) - len(peer_id_b58.lstrip("1"))
     raw_bytes = b"\x00" * pad + raw_bytes
     return hashlib.sha256(raw_bytes).digest()
 
@@ -52,29 +53,54 @@ def xor_distance(id1: bytes, id2: bytes) -> int:
     return int.from_bytes(id1, "big") ^ int.from_bytes(id2, "big")
 
 
-def compute_closeness_score(
-    target: str, returned_peers: List[Dict[str, Any]], all_pids: List[str]
-) -> Optional[int]:
-    try:
-        target_kad_id = get_kad_id(target)
-    except Exception:
-        return None
+class KadIdIndex:
+    """
+    Kad IDs of every known peer, kept as sorted integers.
 
-    all_pids_dists = []
-    for pid in all_pids:
+    The peers whose XOR distance to a target is below a bound are, for each set bit of the bound,
+    one contiguous range of the sorted IDs. Ranking a peer against all known peers is then at most
+    256 binary searches, instead of computing and sorting the distance to every peer.
+    """
+
+    def __init__(self, all_pids: Iterable[str]):
+        self._kad_ids: Dict[str, int] = {}
+        for pid in all_pids:
+            try:
+                self._kad_ids[pid] = int.from_bytes(get_kad_id(pid), "big")
+            except Exception:
+                pass
+        self._sorted_ids = sorted(self._kad_ids.values())
+
+    def count_closer(self, target_id: int, distance: int) -> int:
+        """Number of known peers whose XOR distance to `target_id` is lower than `distance`."""
+        count = 0
+        for bit in range(distance.bit_length() - 1, -1, -1):
+            if not (distance >> bit) & 1:
+                continue
+            # Same bits as `target ^ distance` above `bit`, and the target bit at `bit`.
+            prefix = (((target_id ^ distance) >> (bit + 1)) << 1) | ((target_id >> bit) & 1)
+            low = prefix << bit
+            count += bisect.bisect_left(self._sorted_ids, low + (1 << bit)) - bisect.bisect_left(
+                self._sorted_ids, low
+            )
+        return count
+
+    def closeness_score(self, target: str, returned_peers: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Rank, among all known peers sorted by XOR distance to `target`, of the closest returned peer.
+        """
         try:
-            all_pids_dists.append((pid, xor_distance(target_kad_id, get_kad_id(pid))))
+            target_id = int.from_bytes(get_kad_id(target), "big")
         except Exception:
-            pass
+            return None
 
-    all_pids_dists.sort(key=lambda x: x[1])
-    global_ranks = {pid: i for i, (pid, _) in enumerate(all_pids_dists, start=1)}
-
-    returned_ranks = [global_ranks[p["pid"]] for p in returned_peers if p["pid"] in global_ranks]
-    if not returned_ranks:
-        return None
+        distances = [
+            self._kad_ids[p["pid"]] ^ target_id for p in returned_peers if p["pid"] in self._kad_ids
+        ]
+        if not distances:
+            return None
 
-    return min(returned_ranks)
+        return self.count_closer(target_id, min(distances)) + 1
 
 
 def parse_peer(peer_str: str) -> Dict[str, Any]:
@@ -133,7 +159,7 @@ def infer_lookup_error_type(peers: List[Dict[str, Any]]) -> Optional[str]:
     return counts.most_common(1)[0][0]
 
 
-def parse_row(row: list, all_pids: List[str]) -> Dict[str, Any]:
+def parse_row(row: list, kad_index: KadIdIndex) -> Dict[str, Any]:
     target = row[0]
     duration_ms = int(row[1])
     peers_raw = row[2]
@@ -158,7 +184,7 @@ def parse_row(row: list, all_pids: List[str]) -> Dict[str, Any]:
             break
 
     lookup_score = rank_best_returned_peer(peers)
-    closeness_score = compute_closeness_score(target, peers, all_pids)
+    closeness_score = kad_index.closeness_score(target, peers)
     lookup_outcome = classify_lookup(peers)
     lookup_error_type = infer_lookup_error_type(peers)
 
@@ -392,8 +418,8 @@ class KadDHTAnalyzer(Analyzer):
             logger.info("No lookup events found.")
             return AnalysisResult(name="kad_dht_lookups", intermediates={}, status="passed")
 
-        all_pids = self._extract_all_pids()
-        parsed = [parse_row(row, all_pids) for row in log_lines]
+        kad_index = KadIdIndex(self._extract_all_pids())
+        parsed = [parse_row(row, kad_index) for row in log_lines]
 
         metrics = calculate_lookups_metrics(parsed)
 
@@ -3,6 +3,7 @@ import traceback
 from pathlib import Path
 from typing import Iterable, List, Optional, Self
 
+import numpy as np
 import pandas as pd
 import seaborn as sns
 from pydantic import BaseModel, NonNegativeInt
@@ -12,7 +13,7 @@ from result import Err, Ok, Result
 from src.analysis.mesh_analysis.analyzers.analyzer import AnalysisResult, Analyzer, OnFail
 from src.analysis.mesh_analysis.readers.tracers.message_tracer import MessageTracer
 from src.analysis.mesh_analysis.readers.tracers.nimlibp2p_tracer import Nimlibp2pTracer
-from src.analysis.utils import file_utils, path_utils
+from src.analysis.utils import dataframe_io, file_utils, path_utils
 
 logger = logging.getLogger(__name__)
 sns.set_theme()
@@ -258,21 +259,19 @@ class Nimlibp2pAnalyzer(Analyzer):
             ].map(pod_to_peer_map)
 
     def _dump_dfs(self, dfs: List[pd.DataFrame]) -> Result:
-        received = dfs[0].reset_index()
-        received = received.astype(str)
+        received = self._summary_df(dfs[0])
         logger.info("Dumping received information")
-        result = file_utils.dump_df_as_csv(
-            received, self._dump_analysis_path / "summary" / "received.csv", False
+        result = file_utils.dump_df(
+            received, self._summary_path("received.csv"), False, self.summary_format
         )
         if result.is_err():
             logger.warning(result.err_value)
             return Err(result.err_value)
 
-        sent = dfs[1].reset_index()
-        sent = sent.astype(str)
+        sent = self._summary_df(dfs[1])
         logger.info("Dumping sent information")
-        result = file_utils.dump_df_as_csv(
-            sent, self._dump_analysis_path / "summary" / "sent.csv", False
+        result = file_utils.dump_df(
+            sent, self._summary_path("sent.csv"), False, self.summary_format
         )
         if result.is_err():
             logger.warning(result.err_value)
@@ -280,6 +279,16 @@ class Nimlibp2pAnalyzer(Analyzer):
 
         return Ok(None)
 
+    def _summary_path(self, file_name: str) -> Path:
+        return dataframe_io.with_format_extension(
+            self._dump_analysis_path / "summary" / file_name, self.summary_format
+        )
+
+    def _summary_df(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.reset_index()
+        # CSV is written as text anyway, Parquet keeps the column types.
+        return df.astype(str) if self.summary_format == "csv" else df
+
     def _merge_dfs(self, dfs: List[List[pd.DataFrame]], has_shard: bool) -> List[pd.DataFrame]:
         logger.info("Merging and sorting information")
 
@@ -390,41 +399,60 @@ class Nimlibp2pAnalyzer(Analyzer):
         peer_identifier: str,
         df: pd.DataFrame,
     ) -> Optional[MissingMessages]:
-        unique_messages = len(df.index.get_level_values(msg_identifier).unique())
-        grouped = df.groupby([msg_identifier, peer_identifier]).size().reset_index(name="count")
-        pivot_df = grouped.pivot_table(
-            index=msg_identifier,
-            columns=peer_identifier,
-            values="count",
-            fill_value=0,
-        )
+        msg_codes, messages = pd.factorize(df.index.get_level_values(msg_identifier), sort=True)
+        peer_codes, peers = pd.factorize(df[peer_identifier], sort=True)
+        unique_messages = len(messages)
+
+        delivered = np.unique(self._delivery_codes(msg_codes, peer_codes, unique_messages))
+        delivered_peers, delivered_msgs = np.divmod(delivered, max(unique_messages, 1))
+        received_per_peer = np.bincount(delivered_peers, minlength=len(peers))
+        received_per_msg = np.bincount(delivered_msgs, minlength=unique_messages)
 
-        peers_missing_msg = pivot_df.columns[pivot_df.sum() != unique_messages].to_list()
-        missing_messages = pivot_df.index[pivot_df.eq(0).any(axis=1)].tolist()
+        peers_missing_msg = np.flatnonzero(received_per_peer != unique_messages)
+        missing_messages = messages[received_per_msg != len(peers)].tolist()
 
-        if not peers_missing_msg:
+        if peers_missing_msg.size == 0:
             logger.info(f"All peers received all messages for shard {shard}")
             return None
 
         logger.warning(f"Nodes missed messages on shard {shard}")
-        logger.warning(f"Nodes who missed messages: {peers_missing_msg}")
+        logger.warning(f"Nodes who missed messages: {peers[peers_missing_msg].tolist()}")
         logger.warning(f"Missing messages: {missing_messages}")
 
-        column_sums = pivot_df.sum()
-        filtered_sums = column_sums[column_sums != unique_messages]
+        # `delivered` is sorted, so the deliveries of each peer are a contiguous slice of it.
+        bounds = np.searchsorted(delivered, np.arange(len(peers) + 1) * unique_messages)
+        valid = peer_codes >= 0
+        first_rows = np.flatnonzero(valid)[np.unique(peer_codes[valid], return_index=True)[1]]
+        pod_names = df["kubernetes.pod_name"].to_numpy()[first_rows]
+
         nodes: List[Node] = []
-        for item in list(filtered_sums.items()):
-            pod, count = item
-            missing_hashes = pivot_df[pivot_df[pod] == 0].index.tolist()
-            missing_hashes.extend(pivot_df[pivot_df[pod].isna()].index.tolist())
-            pod_name = df[df[peer_identifier] == item[0]]["kubernetes.pod_name"].iloc[0]
-            node_id = None if peer_identifier == "kubernetes.pod_name" else item[0]
+        for code in peers_missing_msg:
+            peer = peers[code]
+            received = delivered_msgs[bounds[code] : bounds[code + 1]]
+            missing_hashes = messages[np.setdiff1d(np.arange(unique_messages), received)].tolist()
+            pod_name = pod_names[code]
+            node_id = None if peer_identifier == "kubernetes.pod_name" else peer
             nodes.append(Node(name=pod_name, id=node_id))
             logger.warning(
-                f"Node {item[0]} ({pod_name}) {item[1]}/{unique_messages}: {missing_hashes}"
+                f"Node {peer} ({pod_name}) {received_per_peer[code]}/{unique_messages}: "
+                f"{missing_hashes}"
             )
         return MissingMessages(shard=shard, messages=missing_messages, nodes=nodes)
 
+    @staticmethod
+    def _delivery_codes(
+        msg_codes: np.ndarray, peer_codes: np.ndarray, num_messages: int
+    ) -> np.ndarray:
+        """
+        Encode each (peer, message) delivery as `peer * num_messages + message`.
+
+        The unique codes are a sparse messages × peers delivery matrix: memory grows with the
+        number of log lines instead of peers × messages. Rows with a missing peer or message are
+        dropped, as `pivot_table` would.
+        """
+        valid = (msg_codes >= 0) & (peer_codes >= 0)
+        return peer_codes[valid].astype(np.int64) * num_messages + msg_codes[valid]
+
     def _log_received_messages(
         self,
         df: pd.DataFrame,
@@ -458,15 +486,17 @@ class Nimlibp2pAnalyzer(Analyzer):
         peer_identifier: str,
     ) -> List:
         messages_sent_to_peer = []
+        sent_msgs = sent_df.index.get_level_values(self.msg_hash_key)
+        sent_missing = sent_df[sent_msgs.isin(missing.messages)]
+        if sent_missing.empty or peer_identifier not in sent_missing.columns:
+            logger.warning(
+                f"Message {missing.messages} has not been sent by any other node on shard {missing.shard}."
+            )
+            return messages_sent_to_peer
+
+        sent_per_peer = dict(tuple(sent_missing.groupby(peer_identifier, sort=False)))
         for node in missing.nodes:
             peer = node.id or node.name
-            try:
-                filtered_df = sent_df.loc[(slice(None), missing.messages), :]
-                filtered_df = filtered_df[filtered_df[peer_identifier] == peer]
-                messages_sent_to_peer.append((peer, filtered_df))
-            except KeyError as _:
-                logger.warning(
-                    f"Message {missing.messages} has not been sent to {peer} by any other node on shard {missing.shard}."
-                )
+            messages_sent_to_peer.append((peer, sent_per_peer.get(peer, sent_missing.iloc[0:0])))
 
         return messages_sent_to_peer
@@ -0,0 +1,43 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from src.analysis.mesh_analysis.analyzers import data_puller as data_puller_module
+from src.analysis.mesh_analysis.analyzers.data_puller import DataPuller
+from src.analysis.mesh_analysis.readers.tracers.message_tracer import MessageTracer
+
+STACK = {"url": "http://victoria/select/logsql/query", "extra_fields": ["kubernetes.pod_name"]}
+
+
+def test_jobs_are_bounded_by_cpus_and_victoria_concurrency(monkeypatch):
+    monkeypatch.setattr(data_puller_module.os, "cpu_count", lambda: 32)
+
+    assert DataPuller().with_kwargs(STACK)._get_jobs() == DataPuller.default_max_concurrent_queries
+    assert DataPuller().with_kwargs({**STACK, "max_concurrent_queries": 4})._get_jobs() == 4
+    assert DataPuller().with_local("logs")._get_jobs() == 32
+    assert DataPuller().with_kwargs(STACK).with_jobs(3)._get_jobs() == 3
+
+
+def test_pool_is_shared_by_the_stacks_and_closed_once(monkeypatch):
+    created = []
+
+    def make_pool(jobs, **kwargs):
+        created.append(ThreadPoolExecutor(jobs))
+        return created[-1]
+
+    monkeypatch.setattr(data_puller_module, "ProcessPoolExecutor", make_pool)
+    monkeypatch.setattr(data_puller_module, "capture_current_logging", lambda: None)
+    monkeypatch.setattr(data_puller_module, "get_log_queue", lambda: None)
+
+    tracer = MessageTracer().with_wildcard_pattern()
+    with DataPuller().with_kwargs(STACK) as puller:
+        first = puller._make_stack(tracer, parallel=True)
+        second = puller._make_stack(tracer, parallel=True)
+        sequential = puller._make_stack(tracer)
+
+        assert len(created) == 1
+        assert first._executor is second._executor is created[0]
+        assert sequential._executor is None
+        assert pickle.loads(pickle.dumps(first))._executor is None
+
+    assert puller._executor is None
+    assert created[0]._shutdown
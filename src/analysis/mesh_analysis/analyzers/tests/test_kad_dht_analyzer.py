@@ -0,0 +1,44 @@
+import random
+
+from src.analysis.mesh_analysis.analyzers.kad_dht_analyzer import (
+    BASE58_DIGITS,
+    KadIdIndex,
+    get_kad_id,
+    xor_distance,
+)
+
+
+def _pids(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    digits = list(BASE58_DIGITS)
+    return ["12D3KooW" + "".join(rng.choices(digits, k=44)) for _ in range(n)]
+
+
+def _sorted_ranks(target: str, pids):
+    dists = sorted(pids, key=lambda pid: xor_distance(get_kad_id(target), get_kad_id(pid)))
+    return {pid: i for i, pid in enumerate(dists, start=1)}
+
+
+def test_closeness_score_matches_full_sort():
+    pids = _pids(200)
+    index = KadIdIndex(pids)
+    rng = random.Random(1)
+
+    for target in _pids(20, seed=2):
+        ranks = _sorted_ranks(target, pids)
+        returned = [{"pid": pid} for pid in rng.sample(pids, 3)]
+        expected = min(ranks[p["pid"]] for p in returned)
+        assert index.closeness_score(target, returned) == expected
+
+
+def test_unknown_peers_and_invalid_ids_are_ignored():
+    pids = _pids(10)
+    index = KadIdIndex(pids + ["not-base58-0OIl"])
+
+    assert index.closeness_score(pids[0], [{"pid": pids[0]}]) == 1
+    assert index.closeness_score(pids[0], [{"pid": "unknown"}, {"pid": None}]) is None
+    assert index.closeness_score("0OIl", [{"pid": pids[0]}]) is None
+
+
+def test_leading_ones_are_zero_bytes():
+    assert get_kad_id("11") != get_kad_id("1")
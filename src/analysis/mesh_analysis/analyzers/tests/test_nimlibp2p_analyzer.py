@@ -0,0 +1,67 @@
+import pandas as pd
+
+from src.analysis.mesh_analysis.analyzers.nimlibp2p_analyzer import Nimlibp2pAnalyzer
+from src.analysis.mesh_analysis.analyzers.waku.waku_analyzer import WakuAnalyzer
+
+
+def _received(rows) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=["shard", "msg_hash", "timestamp", "receiver_peer_id"])
+    df["kubernetes.pod_name"] = "pod-" + df["receiver_peer_id"]
+    return df.set_index(["shard", "msg_hash", "timestamp"]).sort_index()
+
+
+def test_all_delivered_has_no_missing_messages():
+    df = _received([(0, m, i, p) for i, (m, p) in enumerate([("a", "x"), ("a", "y")])])
+
+    assert (
+        WakuAnalyzer()._get_peers_missing_messages("shard", "msg_hash", "receiver_peer_id", df)
+        == []
+    )
+
+
+def test_missing_deliveries_per_shard():
+    deliveries = [
+        (0, "a", "x"),
+        (0, "a", "y"),
+        (0, "b", "x"),
+        (0, "c", "y"),
+        (1, "d", "z"),
+        (1, "d", "w"),
+    ]
+    df = _received([(s, m, i, p) for i, (s, m, p) in enumerate(deliveries)])
+
+    missing = WakuAnalyzer()._get_peers_missing_messages(
+        "shard", "msg_hash", "receiver_peer_id", df
+    )
+
+    assert len(missing) == 1
+    assert missing[0].shard == 0
+    assert missing[0].messages == ["b", "c"]
+    assert [(node.name, node.id) for node in missing[0].nodes] == [("pod-x", "x"), ("pod-y", "y")]
+
+
+def test_duplicated_deliveries_are_not_missing_messages():
+    df = pd.DataFrame(
+        {
+            "msgId": [1, 1, 1, 2, 2],
+            "timestamp": [0, 1, 2, 3, 4],
+            "kubernetes.pod_name": ["n-0", "n-0", "n-1", "n-0", "n-1"],
+        }
+    ).set_index(["msgId", "timestamp"])
+
+    assert (
+        Nimlibp2pAnalyzer()._get_peers_missing_messages(None, "msgId", "kubernetes.pod_name", df)
+        == []
+    )
+
+
+def test_sent_messages_are_split_per_missing_peer():
+    df = _received([(0, "a", 0, "x"), (0, "a", 1, "y"), (0, "b", 2, "x")])
+    sent = _received([(0, "a", 0, "x"), (0, "b", 1, "y"), (0, "b", 2, "x")])
+    analyzer = WakuAnalyzer()
+    [missing] = analyzer._get_peers_missing_messages("shard", "msg_hash", "receiver_peer_id", df)
+
+    [(peer, sent_to_peer)] = analyzer._check_if_msg_has_been_sent(missing, sent, "receiver_peer_id")
+
+    assert peer == "y"
+    assert sent_to_peer.index.get_level_values("msg_hash").tolist() == ["b"]
@@ -11,6 +11,7 @@ from matplotlib import pyplot as plt
 from result import Err, Ok, Result
 
 # Project Imports
+from src.analysis.utils import dataframe_io
 from src.analysis.utils.path_utils import (
     check_params_path_exists_by_position,
     check_params_path_exists_by_position_or_kwargs,
@@ -40,8 +41,8 @@ def plot_message_distribution_libp2pmix(
 
     sns.set_theme()
 
-    df = pd.read_csv(received_summary_path, parse_dates=["timestamp"])
-    other_df = pd.read_csv(compare, parse_dates=["timestamp"])
+    df = dataframe_io.read_dataframe(received_summary_path, parse_dates=["timestamp"])
+    other_df = dataframe_io.read_dataframe(compare, parse_dates=["timestamp"])
 
     # Check unique messages and pods
     all_msgs = df["msg_id"].unique()
@@ -173,7 +174,7 @@ def plot_message_latency_distributions(
 
     # Process each file separately
     for path in received_summary_paths:
-        df = pd.read_csv(path)
+        df = dataframe_io.read_dataframe(path)
 
         df["source"] = path.stem  # label dataset
 
@@ -217,7 +218,7 @@ def plot_message_distribution(
 
     sns.set_theme()
 
-    df = pd.read_csv(received_summary_path, parse_dates=["timestamp"])
+    df = dataframe_io.read_dataframe(received_summary_path, parse_dates=["timestamp"])
     df.set_index(["shard", "msg_hash", "timestamp"], inplace=True)
 
     time_ranges = df.groupby(level="msg_hash").apply(
@@ -296,10 +297,10 @@ def plot_message_distribution_mixnet(
 
     sns.set_theme()
 
-    df_received = pd.read_csv(received_summary_path, parse_dates=["timestamp"])
+    df_received = dataframe_io.read_dataframe(received_summary_path, parse_dates=["timestamp"])
     df_received.set_index(["shard", "msg_hash", "timestamp"], inplace=True)
 
-    df_sent = pd.read_csv(sent_summary_path, parse_dates=["timestamp"])
+    df_sent = dataframe_io.read_dataframe(sent_summary_path, parse_dates=["timestamp"])
     df_sent.set_index(["shard", "msg_hash", "timestamp"], inplace=True)
 
     ###################
@@ -374,9 +375,7 @@ def check_time_to_reach_value_plot(
 
     def calculate_time_to_target(file_path: Path, threshold_value: float) -> pd.Series:
         """Calculate time to reach the target value for a given dataset."""
-        df = pd.read_csv(file_path)
-        df["Time"] = pd.to_datetime(df["Time"])
-        df.set_index("Time", inplace=True)
+        df = dataframe_io.read_dataframe(file_path, index_col="Time", parse_dates=["Time"])
 
         mask = df >= threshold_value
         first_reach = mask.idxmax()
@@ -1,11 +1,12 @@
 # Python Imports
 from typing import List, Optional, Self
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 # Project Imports
 from src.analysis.mesh_analysis.readers.tracers.message_tracer import MessageTracer
 from src.analysis.mesh_analysis.readers.victoria_reader import VictoriaReader
+from src.analysis.mesh_analysis.readers.victoria_transport import VictoriaTransport
 
 
 class VictoriaQueryBuilder(BaseModel):
@@ -41,6 +42,11 @@ class VictoriaQueryBuilder(BaseModel):
         self.filters.append(f"kubernetes.pod_name:{name}-{index if index is not None else ''} ")
         return self
 
+    def with_pod_names(self, pod_names: List[str]) -> Self:
+        quoted = ", ".join(f'"{pod_name}"' for pod_name in pod_names)
+        self.filters.append(f"kubernetes.pod_name:in({quoted}) ")
+        return self
+
     def with_pod_identifier(self, pod_name: str) -> Self:
         self.filters.append(f"kubernetes.pod_name:{pod_name} ")
         return self
@@ -80,9 +86,11 @@ class VictoriaQueryBuilder(BaseModel):
 
 
 class VictoriaReaderBuilder(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
     kwargs: dict
     tracer: MessageTracer
     extra_fields: Optional[List[str]] = None
+    transport: Optional[VictoriaTransport] = None
 
     def _query_builder(
         self, *, uniq_by: Optional[str] = None, order_by: Optional[str] = None
@@ -109,7 +117,9 @@ class VictoriaReaderBuilder(BaseModel):
             pod_name
         )
         query = query_builder.build_query_config()
-        return VictoriaReader(self.tracer, query, extra_fields=self.extra_fields)
+        return VictoriaReader(
+            self.tracer, query, extra_fields=self.extra_fields, transport=self.transport
+        )
 
     def build_with_statefulset(
         self,
@@ -123,7 +133,25 @@ class VictoriaReaderBuilder(BaseModel):
             .with_stateful_set(stateful_set_name, node_index)
             .build_query_config()
         )
-        return VictoriaReader(self.tracer, query_config, extra_fields=self.extra_fields)
+        return VictoriaReader(
+            self.tracer, query_config, extra_fields=self.extra_fields, transport=self.transport
+        )
+
+    def build_with_statefulset_pods(
+        self, stateful_set_name: str, node_indices: List[int], sort_by: Optional[str] = None
+    ) -> VictoriaReader:
+        """
+        Reader for several pods of a StatefulSet with one query per pattern group.
+        Use `VictoriaReader.get_dataframes_per_pod` to split the rows back per pod.
+        """
+        query_config = (
+            self._query_builder(order_by=sort_by)
+            .with_pod_names([f"{stateful_set_name}-{index}" for index in node_indices])
+            .build_query_config()
+        )
+        return VictoriaReader(
+            self.tracer, query_config, extra_fields=self.extra_fields, transport=self.transport
+        )
 
     def build_with_pod_name(
         self, pod_name: str, uniq_by: Optional[str] = None, sort_by: Optional[str] = None
@@ -133,4 +161,6 @@ class VictoriaReaderBuilder(BaseModel):
             .with_pod_identifier(pod_name)
             .build_query_config()
         )
-        return VictoriaReader(self.tracer, query_params, extra_fields=self.extra_fields)
+        return VictoriaReader(
+            self.tracer, query_params, extra_fields=self.extra_fields, transport=self.transport
+        )
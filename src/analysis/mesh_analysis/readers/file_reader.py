@@ -1,9 +1,9 @@
 # Python Imports
+import itertools
 import logging
 import multiprocessing
-import re
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -32,10 +32,26 @@ def merge_logs_per_pattern(tracer: MessageTracer, files_logs) -> List:
 
 
 class FileReader(Reader):
-    def __init__(self, folder: Path, tracer: MessageTracer, n_jobs: int):
+    def __init__(
+        self,
+        folder: Path,
+        tracer: MessageTracer,
+        n_jobs: int,
+        chunk_size: int = 1 << 20,
+        shard_size: int = 64 << 20,
+    ):
+        """
+        :param chunk_size: Size in bytes of the blocks each log file is streamed in. Peak memory
+        per worker is bounded by this and the matched lines, not by the size of the log file.
+        :param shard_size: Files bigger than this are split into line-aligned byte ranges of about
+        this size, which are read by different workers. This keeps every core busy when one log
+        (e.g. a hub or bootstrap node) is much bigger than the rest.
+        """
         self._folder_path = folder
         self._tracer = tracer
         self._n_jobs = n_jobs
+        self._chunk_size = chunk_size
+        self._shard_size = shard_size
 
     def get_dataframes(self) -> List[Dict[str, List[pd.DataFrame]]]:
         logger.info(f"Reading {self._folder_path}")
@@ -51,31 +67,43 @@ class FileReader(Reader):
         dfs = [self._tracer.trace(logs) for logs in parsed_logs]
         return dfs
 
+    def _make_shards(self, files: List[str]) -> List[Tuple[str, int, int]]:
+        shards = []
+        for file in files:
+            ranges = file_utils.line_aligned_ranges(
+                Path(self._folder_path) / file, self._shard_size
+            )
+            if len(ranges) > 1:
+                logger.debug(f"Splitting {file} in {len(ranges)} shards")
+            shards.extend((file, start, end) for start, end in ranges)
+
+        return shards
+
     def _read_files(self, files: List) -> List:
+        shards = self._make_shards(files)
         with multiprocessing.Pool(processes=self._n_jobs) as pool:
-            parsed_logs = pool.map(self._read_file_patterns, files)
+            shards_logs = pool.starmap(self._read_file_patterns, shards)
+
+        # Shards are returned in submission order, so merging consecutive shards of the same
+        # file keeps the original line order.
+        parsed_logs = []
+        for _, file_shards in itertools.groupby(
+            zip(shards, shards_logs), key=lambda shard: shard[0][0]
+        ):
+            parsed_logs.append(
+                merge_logs_per_pattern(self._tracer, [logs for _, logs in file_shards])
+            )
 
         return parsed_logs
 
-    def _read_file_patterns(self, file: str) -> List:
-        results = [[] for p in self._tracer.patterns]
-
-        with open(Path(self._folder_path) / file) as log_file:
-            lines = log_file.readlines()
-            # TODO: Potential for optimizations for reading here.
-
-        for i, pattern_group in enumerate(self._tracer.patterns):
-            query_results = [[] for _ in pattern_group.trace_pairs]
-
-            for line in lines:
-                for j, trace_pair in enumerate(pattern_group.trace_pairs):
-                    match = re.search(trace_pair.regex, line)
-                    if match:
-                        match_as_list = list(match.groups())
-                        match_as_list.append(file)
-                        query_results[j].append(match_as_list)
-                        break
+    def _read_file_patterns(self, file: str, start: int = 0, end: Optional[int] = None) -> List:
+        matcher = self._tracer.matcher(first_match_only=True)
+        results = matcher.empty_results()
 
-            results[i].extend(query_results)
+        lines = file_utils.iter_file_lines(
+            Path(self._folder_path) / file, self._chunk_size, start=start, end=end
+        )
+        for line in lines:
+            matcher.add_matches(results, line, extra=(file,))
 
         return results
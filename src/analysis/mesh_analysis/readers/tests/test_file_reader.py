@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+
+from src.analysis.mesh_analysis.readers.file_reader import FileReader
+from src.analysis.mesh_analysis.readers.tracers.nimlibp2p_tracer import Nimlibp2pTracer
+from src.analysis.utils.file_utils import line_aligned_ranges
+
+
+def _received(msg_id: int) -> str:
+    return (
+        f"INF 2026-08-05 01:15:19.582+00:00 Received message   tid=1 msgId={msg_id} "
+        f"sentAt=1785892519584947712 current=1785892519585947712 delayMs=1\n"
+    )
+
+
+def _sent(msg_id: int) -> str:
+    return f"INF 2026-08-05 01:15:19.582+00:00 Sent message msgId={msg_id} timestamp=1785892519584947712\n"
+
+
+@pytest.fixture
+def log_folder(tmp_path: Path) -> Path:
+    (tmp_path / "hub-0.log").write_text(
+        "".join(_received(i) if i % 3 else _sent(i) for i in range(300))
+    )
+    (tmp_path / "pod-0.log").write_text(_received(1000) + "DBG unrelated\n" + _sent(1001))
+    (tmp_path / "pod-1.log").write_text("")
+    return tmp_path
+
+
+def _tracer() -> Nimlibp2pTracer:
+    return Nimlibp2pTracer().with_received_pattern_group().with_sent_pattern_group()
+
+
+def _read(folder: Path, shard_size: int):
+    reader = FileReader(folder, _tracer(), n_jobs=3, chunk_size=64, shard_size=shard_size)
+    files = sorted(p.name for p in folder.glob("*.log"))
+    return reader._read_files(files)
+
+
+def test_sharded_read_matches_whole_file_read(log_folder):
+    whole = _read(log_folder, shard_size=1 << 30)
+    sharded = _read(log_folder, shard_size=500)
+
+    assert sharded == whole
+    hub_received, hub_sent = whole[0][0][0], whole[0][1][0]
+    assert [int(row[0]) for row in hub_received] == [i for i in range(300) if i % 3]
+    assert [int(row[0]) for row in hub_sent] == list(range(0, 300, 3))
+    assert whole[2] == [[[]], [[]]]
+
+
+def test_ranges_are_line_aligned_and_cover_the_file(log_folder):
+    path = log_folder / "hub-0.log"
+    content = path.read_bytes()
+    ranges = line_aligned_ranges(path, 1000)
+
+    assert len(ranges) > 1
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(content)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert content[start - 1 : start] == b"\n"
@@ -0,0 +1,87 @@
+import pandas as pd
+
+from src.analysis.mesh_analysis.readers.trace_cache import TraceCache
+from src.analysis.mesh_analysis.readers.tracers.message_tracer import MessageTracer
+from src.analysis.mesh_analysis.readers.tracers.nimlibp2p_tracer import Nimlibp2pTracer
+
+STACK = {
+    "url": "http://victoria/select/logsql/query",
+    "start_time": "2026-08-05T01:00:00",
+    "end_time": "2026-08-05T02:00:00",
+    "namespace": "zerotesting",
+}
+
+
+def _tracer() -> Nimlibp2pTracer:
+    return (
+        Nimlibp2pTracer()
+        .with_extra_fields(["kubernetes.pod_name"])
+        .with_received_pattern_group()
+        .with_sent_pattern_group()
+    )
+
+
+def _traced(tracer) -> dict:
+    return tracer.trace(
+        [
+            [[["1", "1785892519584947712", "1785892519585947712", "-1", "nodes-0"]]],
+            [[]],
+        ]
+    )
+
+
+def test_round_trip_keeps_dtypes(tmp_path):
+    tracer = _tracer()
+    traced = _traced(tracer)
+    cache = TraceCache(tmp_path, STACK, tracer)
+
+    assert cache.load("nodes-0") is None
+    cache.store("nodes-0", traced)
+    loaded = cache.load("nodes-0")
+
+    pd.testing.assert_frame_equal(loaded["received"][0], traced["received"][0])
+    assert loaded["sent"][0].empty
+    assert list(loaded["sent"][0].columns) == list(traced["sent"][0].columns)
+
+
+def test_key_covers_pod_window_and_patterns(tmp_path):
+    tracer = _tracer()
+    TraceCache(tmp_path, STACK, tracer).store("nodes-0", _traced(tracer))
+
+    assert TraceCache(tmp_path, STACK, tracer).load("nodes-1") is None
+    later = {**STACK, "end_time": "2026-08-05T03:00:00"}
+    assert TraceCache(tmp_path, later, tracer).load("nodes-0") is None
+
+    changed = _tracer()
+    changed.patterns[0].trace_pairs[0].regex += ".*"
+    assert TraceCache(tmp_path, STACK, changed).load("nodes-0") is None
+
+
+def test_open_window_is_not_cached(tmp_path):
+    tracer = _tracer()
+    cache = TraceCache(tmp_path, {**STACK, "end_time": None}, tracer)
+    cache.store("nodes-0", _traced(tracer))
+
+    assert cache.load("nodes-0") is None
+    assert not any(tmp_path.iterdir())
+
+
+def test_groups_not_converted_to_dataframes_are_not_cached(tmp_path):
+    tracer = MessageTracer().with_wildcard_pattern()
+    cache = TraceCache(tmp_path, STACK, tracer)
+    cache.store("nodes-0", tracer.trace([[[["a log line"]]]]))
+
+    assert cache.load("nodes-0") is None
+
+
+def test_a_group_that_cant_be_written_is_left_uncached(tmp_path):
+    tracer = _tracer()
+    traced = _traced(tracer)
+    # A column mixing types, which Parquet can't encode.
+    traced["received"][0]["mixed"] = [object()] * len(traced["received"][0])
+    cache = TraceCache(tmp_path, STACK, tracer)
+
+    cache.store("nodes-0", traced)
+
+    assert cache.load("nodes-0") is None
+    assert not any(path.name.endswith(".tmp") for path in tmp_path.iterdir())
@@ -0,0 +1,95 @@
+from typing import Dict, List
+
+from src.analysis.mesh_analysis.readers.builders.victoria_reader_builder import (
+    VictoriaReaderBuilder,
+)
+from src.analysis.mesh_analysis.readers.tracers.nimlibp2p_tracer import Nimlibp2pTracer
+from src.analysis.mesh_analysis.readers.victoria_transport import VictoriaTransport
+
+KWARGS = {
+    "url": "http://victoria/select/logsql/query",
+    "start_time": "2026-08-05T01:00:00",
+    "end_time": "2026-08-05T02:00:00",
+}
+
+
+class FakeTransport(VictoriaTransport):
+    def __init__(self, rows_per_query: List[List[Dict]]):
+        super().__init__()
+        self._rows_per_query = rows_per_query
+        self.queries = []
+
+    def fetch_rows(self, url: str, headers: Dict, params: Dict) -> List[Dict]:
+        self.queries.append(params["query"])
+        return self._rows_per_query.pop(0)
+
+
+def _received(msg_id: int, pod: str) -> Dict:
+    return {
+        "_msg": f"Received message msgId={msg_id} sentAt=1785892519584947712 "
+        f"current=1785892519585947712 delayMs=1",
+        "kubernetes.pod_name": pod,
+        "kubernetes.pod_node_name": "host-1",
+    }
+
+
+def _sent(msg_id: int, pod: str) -> Dict:
+    return {
+        "_msg": f"Sent message msgId={msg_id} timestamp=1785892519584947712",
+        "kubernetes.pod_name": pod,
+        "kubernetes.pod_node_name": "host-1",
+    }
+
+
+def _builder(transport: VictoriaTransport, extra_fields: List[str]) -> VictoriaReaderBuilder:
+    tracer = (
+        Nimlibp2pTracer()
+        .with_extra_fields(extra_fields)
+        .with_received_pattern_group()
+        .with_sent_pattern_group()
+    )
+    return VictoriaReaderBuilder(
+        kwargs=KWARGS, tracer=tracer, extra_fields=extra_fields, transport=transport
+    )
+
+
+def test_statefulset_pods_are_filtered_in_one_query():
+    builder = _builder(FakeTransport([]), ["kubernetes.pod_name"])
+    reader = builder.build_with_statefulset_pods("nodes", [0, 1, 2])
+
+    received_query = reader._config_query["params"][0]["query"]
+    assert 'kubernetes.pod_name:in("nodes-0", "nodes-1", "nodes-2")' in received_query
+
+
+def test_rows_are_split_per_pod():
+    transport = FakeTransport(
+        [
+            [_received(1, "nodes-0"), _received(2, "nodes-1"), _received(3, "nodes-0")],
+            [_sent(4, "nodes-1")],
+        ]
+    )
+    reader = _builder(transport, ["kubernetes.pod_name"]).build_with_statefulset_pods(
+        "nodes", [0, 1, 2]
+    )
+
+    dfs = reader.get_dataframes_per_pod(["nodes-0", "nodes-1", "nodes-2"])
+
+    assert len(transport.queries) == 2
+    assert list(dfs["nodes-0"]["received"][0]["msgId"]) == [1, 3]
+    assert list(dfs["nodes-1"]["received"][0]["msgId"]) == [2]
+    assert list(dfs["nodes-1"]["sent"][0]["msgId"]) == [4]
+    assert dfs["nodes-2"]["received"][0].empty
+    assert list(dfs["nodes-0"]["received"][0]["kubernetes.pod_name"]) == ["nodes-0"] * 2
+
+
+def test_pod_field_is_fetched_but_not_returned_when_not_an_extra_field():
+    transport = FakeTransport([[_received(1, "nodes-0")], []])
+    reader = _builder(transport, ["kubernetes.pod_node_name"]).build_with_statefulset_pods(
+        "nodes", [0]
+    )
+
+    results = reader.make_queries_per_pod(["nodes-0"])
+
+    assert results["nodes-0"][0][0] == [
+        ["1", "1785892519584947712", "1785892519585947712", "1", "host-1"]
+    ]
@@ -0,0 +1,105 @@
+import json
+import pickle
+from typing import Dict, List
+
+import pytest
+import requests
+
+from src.analysis.mesh_analysis.readers.victoria_transport import VictoriaTransport
+
+URL = "http://victoria/select/logsql/query"
+ORDERED = {"query": "kubernetes.pod_name:pod-0 AND Received|order by (_time)"}
+UNORDERED = {"query": "kubernetes.pod_name:pod-0 AND Received"}
+
+
+class FakeResponse:
+    def __init__(self, rows: List[Dict], cut_after: int = None, status_code: int = 200):
+        self._rows = rows
+        self._cut_after = cut_after
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+    def iter_lines(self):
+        for i, row in enumerate(self._rows):
+            if i == self._cut_after:
+                raise requests.exceptions.ChunkedEncodingError("connection reset")
+            yield json.dumps(row).encode()
+
+
+class FakeSession:
+    def __init__(self, responses: List[FakeResponse]):
+        self._responses = responses
+        self.queries = []
+
+    def post(self, url, **kwargs):
+        self.queries.append(kwargs["params"]["query"])
+        return self._responses.pop(0)
+
+
+def _rows(times: List[str]) -> List[Dict]:
+    return [{"_msg": f"msg {i}", "_time": t} for i, t in enumerate(times)]
+
+
+def _transport(responses: List[FakeResponse], **kwargs) -> VictoriaTransport:
+    transport = VictoriaTransport(**kwargs)
+    transport._session = FakeSession(responses)
+    return transport
+
+
+def test_full_stream_is_returned():
+    rows = _rows(["t1", "t2"])
+    transport = _transport([FakeResponse(rows)])
+
+    assert transport.fetch_rows(URL, {}, ORDERED) == rows
+
+
+def test_ordered_query_resumes_from_last_timestamp():
+    rows = _rows(["t1", "t2", "t2", "t3"])
+    # The first stream is cut after one of the two `t2` rows, the resumed one starts at `t2`.
+    transport = _transport([FakeResponse(rows, cut_after=2), FakeResponse(rows[1:])])
+
+    assert transport.fetch_rows(URL, {}, ORDERED) == rows
+    assert transport.session.queries[1] == f"_time:>=t2 AND {ORDERED['query']}"
+
+
+def test_unordered_query_is_fetched_again_from_the_start():
+    rows = _rows(["t2", "t1", "t3"])
+    transport = _transport([FakeResponse(rows, cut_after=2), FakeResponse(rows)])
+
+    assert transport.fetch_rows(URL, {}, UNORDERED) == rows
+    assert transport.session.queries == [UNORDERED["query"]] * 2
+
+
+def test_gives_up_after_max_resumes():
+    rows = _rows(["t1", "t2"])
+    transport = _transport(
+        [FakeResponse(rows, cut_after=1), FakeResponse(rows, cut_after=1)], max_resumes=1
+    )
+
+    with pytest.raises(requests.RequestException):
+        transport.fetch_rows(URL, {}, UNORDERED)
+
+
+def test_rejected_query_is_raised():
+    transport = _transport([FakeResponse([], status_code=400)])
+
+    with pytest.raises(requests.HTTPError):
+        transport.fetch_rows(URL, {}, UNORDERED)
+
+
+def test_session_is_pooled_and_not_pickled():
+    transport = VictoriaTransport(pool_size=4)
+    adapter = transport.session.get_adapter(URL)
+
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == transport.retries
+    assert pickle.loads(pickle.dumps(transport))._session is None
@@ -0,0 +1,105 @@
+# Python Imports
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+# Project Imports
+from src.analysis.mesh_analysis.readers.tracers.message_tracer import MessageTracer, PatternGroup
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the cached files changes, so old entries are not read.
+CACHE_VERSION = 1
+
+# Stack kwargs that change which log lines a query returns.
+QUERY_KWARGS = ("url", "start_time", "end_time", "namespace", "container_name")
+
+
+class TraceCache:
+    """
+    On-disk Parquet cache of the dataframes returned by `MessageTracer.trace` for a single pod.
+
+    Each pattern group of a pod is stored in its own directory, named after a hash of everything
+    that determines its content: the stack query kwargs (url, time window, namespace, container),
+    the pod, the pattern group name, query and regexes, the tracer class and the extra fields.
+    Changing any of them is a cache miss, so no explicit invalidation is needed.
+
+    Only closed time windows are cached, as a window without `end_time` keeps getting new logs.
+    """
+
+    def __init__(self, cache_dir: Path, stack_kwargs: Dict, tracer: MessageTracer):
+        self._cache_dir = Path(cache_dir)
+        self._query_kwargs = {key: stack_kwargs.get(key) for key in QUERY_KWARGS}
+        self._tracer = tracer
+        self.enabled = bool(stack_kwargs.get("start_time") and stack_kwargs.get("end_time"))
+        if not self.enabled:
+            logger.warning("Trace cache disabled: it needs both start_time and end_time")
+
+    def _fingerprint(self, pod_name: str, pattern_group: PatternGroup) -> str:
+        key = {
+            "version": CACHE_VERSION,
+            "query_kwargs": self._query_kwargs,
+            "pod_name": pod_name,
+            "tracer": type(self._tracer).__name__,
+            "extra_fields": list(self._tracer.extra_fields),
+            "group": pattern_group.name,
+            "query": pattern_group.query,
+            "regexes": [trace_pair.regex for trace_pair in pattern_group.trace_pairs],
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+    def _group_dir(self, pod_name: str, pattern_group: PatternGroup) -> Path:
+        return self._cache_dir / self._fingerprint(pod_name, pattern_group)
+
+    def load(self, pod_name: str) -> Optional[Dict[str, List[pd.DataFrame]]]:
+        """Returns the cached trace of `pod_name`, or None unless every pattern group is cached."""
+        if not self.enabled:
+            return None
+
+        result = {}
+        for pattern_group in self._tracer.patterns:
+            group_dir = self._group_dir(pod_name, pattern_group)
+            if not (group_dir / "_complete").exists():
+                return None
+            result[pattern_group.name] = [
+                pd.read_parquet(group_dir / f"{i}.parquet")
+                for i in range(len(pattern_group.trace_pairs))
+            ]
+
+        logger.debug(f"Trace cache hit for {pod_name}")
+        return result
+
+    def store(self, pod_name: str, traced: Dict[str, List[pd.DataFrame]]) -> None:
+        """Caches the trace of `pod_name`. Groups not converted to dataframes are not cached.
+
+        A group that can't be written, e.g. on a full disk or with a column Parquet can't
+        encode, is logged and left uncached, as the cache must never fail the analysis.
+        """
+        if not self.enabled:
+            return
+
+        for pattern_group in self._tracer.patterns:
+            dfs = traced.get(pattern_group.name, [])
+            if not all(isinstance(df, pd.DataFrame) for df in dfs):
+                continue
+
+            group_dir = self._group_dir(pod_name, pattern_group)
+            tmp_dir = group_dir.with_name(f"{group_dir.name}.tmp")
+            try:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                tmp_dir.mkdir(parents=True)
+                for i, df in enumerate(dfs):
+                    df.to_parquet(tmp_dir / f"{i}.parquet")
+                (tmp_dir / "_complete").touch()
+                # Written under a temporary name and renamed, so readers never see a partial entry.
+                shutil.rmtree(group_dir, ignore_errors=True)
+                tmp_dir.rename(group_dir)
+            except (OSError, ValueError, pa.ArrowException) as e:
+                logger.warning(f"Could not cache {pattern_group.name} of {pod_name}: {e}")
+                shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -1,7 +1,8 @@
 # Python Imports
 import logging
+import re
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Self, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Self, Sequence, Tuple
 
 import pandas as pd
 from pydantic import BaseModel, Field
@@ -22,6 +23,145 @@ class PatternGroup:
     query: str
 
 
+def required_literal(regex: str) -> Optional[str]:
+    """
+    Returns the longest plain substring that every match of `regex` must contain, or None if
+    no such literal can be safely extracted (top-level alternation, inline flags, ...).
+    Only the top level of the pattern is inspected; the contents of groups and character
+    classes are skipped, and a literal character followed by a quantifier ends the current run.
+    """
+    if "(?i" in regex or "(?x" in regex:
+        return None
+
+    runs = []
+    run = ""
+    depth = 0
+    i = 0
+    while i < len(regex):
+        char = regex[i]
+        literal = None
+        if char == "\\":
+            escaped = regex[i + 1 : i + 2]
+            i += 2
+            if depth == 0 and escaped and not escaped.isalnum():
+                literal = escaped
+        elif char == "[":
+            # Skip the whole character class, `]` right after `[` or `[^` is a literal.
+            i += 2 if regex[i + 1 : i + 2] == "^" else 1
+            i += 1 if regex[i : i + 1] == "]" else 0
+            while i < len(regex) and regex[i] != "]":
+                i += 2 if regex[i] == "\\" else 1
+            i += 1
+        elif char == "(":
+            depth += 1
+            i += 1
+        elif char == ")":
+            depth -= 1
+            i += 1
+        elif char == "|" and depth == 0:
+            return None
+        else:
+            i += 1
+            if depth == 0 and char not in ".^$*+?{}|":
+                literal = char
+
+        if literal is None:
+            if depth == 0 or char in "()":
+                runs.append(run)
+                run = ""
+            continue
+
+        quantifier = regex[i : i + 1]
+        if quantifier in ("*", "?", "{"):
+            runs.append(run)
+            run = ""
+        elif quantifier == "+":
+            runs.append(run + literal)
+            run = ""
+        else:
+            run += literal
+    runs.append(run)
+
+    longest = max(runs, key=len)
+    return longest or None
+
+
+class PatternMatcher:
+    """
+    Matches log lines against every TracePair of a list of PatternGroups in a single pass.
+
+    All regexes are compiled once. Each pair also gets the literal text its matches must contain,
+    and all of those literals are joined into one prefilter regex, so lines that cannot match any
+    pair are discarded with a single scan. Regexes are only run for the pairs whose literal is in
+    the line.
+
+    :param first_match_only: Stop at the first matching pair of each group, as FileReader does.
+    Otherwise every matching pair of the group gets the line, as VictoriaReader does.
+    """
+
+    def __init__(self, patterns: List[PatternGroup], first_match_only: bool = False):
+        self._first_match_only = first_match_only
+        self._groups: List[List[Tuple[int, Optional[str], re.Pattern]]] = []
+        literals = set()
+        always_run = False
+        for group in patterns:
+            compiled = []
+            for j, trace_pair in enumerate(group.trace_pairs):
+                literal = required_literal(trace_pair.regex)
+                if literal is None:
+                    always_run = True
+                else:
+                    literals.add(literal)
+                compiled.append((j, literal, re.compile(trace_pair.regex)))
+            self._groups.append(compiled)
+
+        self._prefilter: Optional[re.Pattern] = None
+        if literals and not always_run:
+            self._prefilter = re.compile(
+                "|".join(re.escape(literal) for literal in sorted(literals, key=len, reverse=True))
+            )
+
+    def empty_results(self) -> List[List[List]]:
+        """Returns the [pattern_groups -> patterns -> matched_lines] structure with no matches."""
+        return [[[] for _ in group] for group in self._groups]
+
+    def match(
+        self, line: str, group_indices: Optional[Sequence[int]] = None
+    ) -> Iterator[Tuple[int, int, List[str]]]:
+        """
+        Yields (group_index, pair_index, captured_groups) for each TracePair matching `line`.
+
+        :param group_indices: Restrict matching to these pattern groups. Defaults to all of them.
+        """
+        if self._prefilter is not None and self._prefilter.search(line) is None:
+            return
+
+        if group_indices is None:
+            group_indices = range(len(self._groups))
+
+        for i in group_indices:
+            for j, literal, regex in self._groups[i]:
+                if literal is not None and literal not in line:
+                    continue
+                match = regex.search(line)
+                if match:
+                    yield i, j, list(match.groups())
+                    if self._first_match_only:
+                        break
+
+    def add_matches(
+        self,
+        results: List[List[List]],
+        line: str,
+        extra: Sequence = (),
+        group_indices: Optional[Sequence[int]] = None,
+    ) -> None:
+        """Appends the captured groups of `line`, followed by `extra`, to `results`."""
+        for i, j, match_as_list in self.match(line, group_indices):
+            match_as_list.extend(extra)
+            results[i][j].append(match_as_list)
+
+
 class MessageTracer(BaseModel):
     patterns: List[PatternGroup] = Field(default_factory=list)
     extra_fields: List[str] = Field(default_factory=list)
@@ -39,6 +179,9 @@ class MessageTracer(BaseModel):
         )
         return self
 
+    def matcher(self, first_match_only: bool = False) -> PatternMatcher:
+        return PatternMatcher(self.patterns, first_match_only=first_match_only)
+
     def trace(self, parsed_logs: List[List[Tuple]]) -> Dict[str, List[pd.DataFrame]]:
         """
         :type parsed_logs: List[List[List]]
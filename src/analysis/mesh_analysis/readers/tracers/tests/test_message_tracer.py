@@ -0,0 +1,108 @@
+import re
+
+import pytest
+
+from src.analysis.mesh_analysis.readers.tracers.connmanager_tracer import ConnManagerTracer
+from src.analysis.mesh_analysis.readers.tracers.message_tracer import (
+    MessageTracer,
+    required_literal,
+)
+from src.analysis.mesh_analysis.readers.tracers.waku_tracer import WakuTracer
+
+LINES = [
+    "received relay message my_peer_id=16U*GiNg1a msg_hash=0x17cf from_peer_id=16U*wJXtuH "
+    "receivedTime=1763643976019361536",
+    "sent relay message my_peer_id=16U*GiNg1a msg_hash=0x17cf to_peer_id=16U*wJXtuH "
+    "sentTime=1763643976019361536",
+    'handling lightpush request topics="waku lightpush legacy" tid=7 peer_id=12D*YCde2H '
+    "msg_hash=0x1441 receivedTime=1763646635380167168",
+    "handling lightpush request my_peer_id=16U*GiNg1a peer_id=16U*wJXtuH msg_hash=0x17cf "
+    "receivedTime=1763643976019361536",
+    "DBG 2025-11-20 13:06:16.015+00:00 unrelated line",
+]
+
+
+def naive_matches(tracer, lines, first_match_only):
+    """The per-pair `re.search` loop the readers used before the combined matcher."""
+    results = [[[] for _ in group.trace_pairs] for group in tracer.patterns]
+    for i, group in enumerate(tracer.patterns):
+        for line in lines:
+            for j, trace_pair in enumerate(group.trace_pairs):
+                match = re.search(trace_pair.regex, line)
+                if match:
+                    results[i][j].append(list(match.groups()) + ["pod-0"])
+                    if first_match_only:
+                        break
+    return results
+
+
+def matcher_matches(tracer, lines, first_match_only):
+    matcher = tracer.matcher(first_match_only=first_match_only)
+    results = matcher.empty_results()
+    for line in lines:
+        matcher.add_matches(results, line, extra=("pod-0",))
+    return results
+
+
+@pytest.mark.parametrize("first_match_only", [True, False])
+def test_matcher_is_equivalent_to_per_pair_search(first_match_only):
+    tracer = WakuTracer().with_received_pattern_group().with_sent_pattern_group()
+
+    expected = naive_matches(tracer, LINES, first_match_only)
+    assert matcher_matches(tracer, LINES, first_match_only) == expected
+    assert len(expected[0][0]) == 1
+    assert len(expected[1][0]) == 1
+
+
+def test_first_match_only_stops_at_first_pair():
+    tracer = WakuTracer().with_received_pattern_group()
+    # The legacy lightpush line also matches the nwaku pattern through `peer_id=`.
+    line = (
+        'handling lightpush request topics="waku lightpush legacy" my_peer_id=16U*GiNg1a '
+        "peer_id=12D*YCde2H msg_hash=0x1441 receivedTime=1763646635380167168"
+    )
+
+    all_pairs = [(i, j) for i, j, _ in tracer.matcher().match(line)]
+    first_pair = [(i, j) for i, j, _ in tracer.matcher(first_match_only=True).match(line)]
+
+    assert all_pairs == [(0, 1), (0, 2)]
+    assert first_pair == [(0, 1)]
+
+
+def test_group_indices_restrict_matching():
+    tracer = WakuTracer().with_received_pattern_group().with_sent_pattern_group()
+    matcher = tracer.matcher()
+
+    assert [i for i, _, _ in matcher.match(LINES[1])] == [1]
+    assert list(matcher.match(LINES[1], group_indices=(0,))) == []
+
+
+def test_named_groups_are_returned_positionally():
+    tracer = ConnManagerTracer().with_stored_muxer_pattern()
+    line = "Stored muxer muxer=16U*abc:1 direction=In peers=3"
+
+    assert list(tracer.matcher().match(line)) == [(0, 0, ["16U*abc", "In", "3"])]
+
+
+def test_wildcard_pattern_disables_prefilter():
+    tracer = MessageTracer().with_wildcard_pattern()
+
+    assert list(tracer.matcher().match("anything")) == [(0, 0, ["anything"])]
+
+
+@pytest.mark.parametrize(
+    "regex, literal",
+    [
+        (r"Received message.*?msgId=([\w*]+)", "Received message"),
+        (r"(?:Peer|Hub) started.*?peerId=(?P<peer_id>\S+)", " started"),
+        (r"^NTC\s+(\d{4})(?=.*\bpeerId=(?P<peerId>\S+))", "NTC"),
+        (r"msg_hash[\s\":=]+(0x[\da-f]+)", "msg_hash"),
+        (r"x\.y?z", "x."),
+        (r"ab+c", "ab"),
+        (r"(.*)", None),
+        (r"Connected|Warmup", None),
+        (r"(?i)received", None),
+    ],
+)
+def test_required_literal(regex, literal):
+    assert required_literal(regex) == literal
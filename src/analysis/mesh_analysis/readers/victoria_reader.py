@@ -1,17 +1,16 @@
 # Python Imports
 import json
 import logging
-import re
 from typing import Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
-import requests
 from httpx import Response
 from result import Err, Ok, Result
 
 # Project Imports
 from src.analysis.mesh_analysis.readers.reader import Reader
 from src.analysis.mesh_analysis.readers.tracers.message_tracer import MessageTracer
+from src.analysis.mesh_analysis.readers.victoria_transport import VictoriaTransport
 
 logger = logging.getLogger(__name__)
 
@@ -22,33 +21,31 @@ class VictoriaReader(Reader):
         tracer: Optional[MessageTracer],
         victoria_config_query: Dict,
         extra_fields: Optional[List[str]] = None,
+        transport: Optional[VictoriaTransport] = None,
     ):
         """
         :param tracer: MessageTracer instance to retrieve raw message patterns from Victoria.
         :param victoria_config_query: Configuration for the Victoria query. This allows to do a first filtering by the
         monitoring stack retrieving only the lines we are interested in, saving time in the parsing process.
+        :param transport: HTTP transport for the queries. Defaults to the one shared by the process.
         """
         self._tracer: MessageTracer = tracer
         self._config_query = victoria_config_query
+        self._transport = transport if transport is not None else VictoriaTransport.shared()
 
     def _fetch_data(self, url: str, headers: Dict, params: Dict, extra_fields: List[str]):
         logs = []
         logger.debug(f"Fetching {params}")
-        with requests.post(url=url, headers=headers, params=params, stream=True) as response:
-            for line in response.iter_lines():
-                if line:
-                    try:
-                        parsed_object = json.loads(line)
-                    except json.decoder.JSONDecodeError as e:
-                        logger.info(line)
-                        exit()
-                    try:
-                        logs.append(
-                            (parsed_object["_msg"],) + tuple(parsed_object[k] for k in extra_fields)
-                        )
-                    except KeyError as e:
-                        logger.warning(f"Malformed log line skipped due to missing key {e}: {line}")
-                        continue
+        for parsed_object in self._transport.fetch_rows(url, headers, params):
+            try:
+                logs.append(
+                    (parsed_object["_msg"],) + tuple(parsed_object[k] for k in extra_fields)
+                )
+            except KeyError as e:
+                logger.warning(
+                    f"Malformed log line skipped due to missing key {e}: {parsed_object}"
+                )
+                continue
         logger.debug(f"Fetched {len(logs)} log lines")
 
         return logs
@@ -69,25 +66,17 @@ class VictoriaReader(Reader):
         if isinstance(params, Dict):
             params = [params]
 
-        results = [[] for _ in self._tracer.patterns]
-        for i, pattern_group in enumerate(self._tracer.patterns):
+        matcher = self._tracer.matcher()
+        results = matcher.empty_results()
+        for i in range(len(self._tracer.patterns)):
             logs = self._fetch_data(
                 self._config_query["url"],
                 self._config_query["headers"],
                 params[i],
                 self._tracer.extra_fields,
             )
-            query_results = [[] for _ in pattern_group.trace_pairs]
             for log_line in logs:
-                for j, trace_pair in enumerate(pattern_group.trace_pairs):
-                    pattern = trace_pair.regex
-                    match = re.search(pattern, log_line[0])
-                    if match:
-                        match_as_list = list(match.groups())
-                        match_as_list.extend(log_line[1:])
-                        query_results[j].append(match_as_list)
-
-            results[i].extend(query_results)
+                matcher.add_matches(results, log_line[0], extra=log_line[1:], group_indices=(i,))
 
         return results
 
@@ -97,8 +86,53 @@ class VictoriaReader(Reader):
 
         return dfs
 
+    def make_queries_per_pod(
+        self, pod_names: List[str], pod_field: str = "kubernetes.pod_name"
+    ) -> Dict[str, List[List[Tuple]]]:
+        """
+        Same as `make_queries`, but for a query that covers several pods. The rows are split by the
+        value of `pod_field`, and each pod gets its own [pattern_groups -> patterns -> matched_lines]
+        structure. Every pod in `pod_names` is in the result, even if it has no matching lines.
+        """
+        params = self._config_query["params"]
+        if isinstance(params, Dict):
+            params = [params]
+
+        extra_fields = list(self._tracer.extra_fields)
+        fetch_fields = extra_fields if pod_field in extra_fields else extra_fields + [pod_field]
+        pod_position = 1 + fetch_fields.index(pod_field)
+
+        matcher = self._tracer.matcher()
+        results = {pod_name: matcher.empty_results() for pod_name in pod_names}
+        for i in range(len(self._tracer.patterns)):
+            logs = self._fetch_data(
+                self._config_query["url"],
+                self._config_query["headers"],
+                params[i],
+                fetch_fields,
+            )
+            for log_line in logs:
+                pod_results = results.get(log_line[pod_position])
+                if pod_results is None:
+                    continue
+                matcher.add_matches(
+                    pod_results,
+                    log_line[0],
+                    extra=log_line[1 : 1 + len(extra_fields)],
+                    group_indices=(i,),
+                )
+
+        return results
+
+    def get_dataframes_per_pod(
+        self, pod_names: List[str], pod_field: str = "kubernetes.pod_name"
+    ) -> Dict[str, Dict[str, List[pd.DataFrame]]]:
+        results = self.make_queries_per_pod(pod_names, pod_field)
+
+        return {pod_name: self._tracer.trace(logs) for pod_name, logs in results.items()}
+
     def single_query_info(self) -> Result[Dict, Response]:
-        response = requests.post(**self._config_query)
+        response = self._transport.post(**self._config_query)
         if response.status_code != 200:
             logger.error(f"Request failed with status code: {response.status_code}")
             return Err(response)
@@ -113,7 +147,7 @@ class VictoriaReader(Reader):
             return Err(response)
 
     def multiline_query_info(self) -> Result[Iterator, str]:
-        response = requests.post(
+        response = self._transport.post(
             self._config_query["url"],
             headers=self._config_query["headers"],
             params=self._config_query["params"],
@@ -0,0 +1,146 @@
+# Python Imports
+import json
+import logging
+import re
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+class VictoriaTransport:
+    """
+    HTTP transport for VictoriaLogs queries.
+
+    All requests go through one `requests.Session`, so connections are kept alive and reused across
+    queries instead of paying a TCP/TLS setup per query. 5xx answers and connection errors are
+    retried with exponential backoff. If a streamed response is cut off halfway, the query is sent
+    again: queries ordered by `_time` resume from the last received timestamp, other queries are
+    fetched again from the start.
+
+    The session is not pickled, each process opens its own connections on first use.
+    """
+
+    _shared: Optional["VictoriaTransport"] = None
+
+    def __init__(
+        self,
+        pool_size: int = 16,
+        retries: int = 5,
+        backoff_factor: float = 0.5,
+        max_resumes: int = 5,
+        timeout: Optional[float] = None,
+    ):
+        """
+        :param pool_size: Number of connections kept alive per host.
+        :param retries: Retries for connection errors and 5xx answers, before any data is received.
+        :param backoff_factor: Sleep `backoff_factor * 2 ** (retry - 1)` seconds between retries.
+        :param max_resumes: Times a query is sent again after its response stream is cut off.
+        :param timeout: Connect and read timeout, in seconds. None waits forever.
+        """
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_resumes = max_resumes
+        self.timeout = timeout
+        self._session: Optional[requests.Session] = None
+
+    @classmethod
+    def shared(cls) -> "VictoriaTransport":
+        """Transport used by default by every reader of the current process."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state["_session"] = None
+        return state
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            retry = Retry(
+                total=self.retries,
+                backoff_factor=self.backoff_factor,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=None,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry
+            )
+            self._session = requests.Session()
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.post(url, **kwargs)
+
+    def fetch_rows(self, url: str, headers: Dict, params: Dict) -> List[Dict]:
+        """
+        Run a query and return every JSON row of its streamed response.
+
+        :raises requests.HTTPError: The query was rejected (4xx), or still failed after retries.
+        :raises requests.RequestException: The stream kept being cut off after `max_resumes`.
+        """
+        rows: List[Dict] = []
+        resumable = _is_ordered_by_time(params.get("query", ""))
+        query_params = params
+        # Rows received with the last timestamp, the resumed query returns them again.
+        seen_at_last_time = 0
+
+        for attempt in range(self.max_resumes + 1):
+            to_skip = seen_at_last_time
+            try:
+                with self.post(url, headers=headers, params=query_params, stream=True) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        row = json.loads(line)
+                        if to_skip and row.get("_time") == rows[-1].get("_time"):
+                            to_skip -= 1
+                            continue
+                        if rows and row.get("_time") == rows[-1].get("_time"):
+                            seen_at_last_time += 1
+                        else:
+                            seen_at_last_time = 1
+                        rows.append(row)
+                return rows
+            except (
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ConnectionError,
+                json.JSONDecodeError,
+            ) as e:
+                if attempt == self.max_resumes:
+                    raise requests.RequestException(
+                        f"Query {params} cut off {attempt + 1} times, giving up"
+                    ) from e
+                if resumable and rows and "_time" in rows[-1]:
+                    logger.warning(
+                        f"Stream cut off after {len(rows)} rows ({e}), resuming from "
+                        f"{rows[-1]['_time']}"
+                    )
+                    query_params = {
+                        **params,
+                        "query": f"_time:>={rows[-1]['_time']} AND {params['query']}",
+                    }
+                else:
+                    logger.warning(f"Stream cut off after {len(rows)} rows ({e}), querying again")
+                    rows = []
+                    seen_at_last_time = 0
+
+        return rows
+
+
+def _is_ordered_by_time(query: str) -> bool:
+    """Whether the rows of `query` come in ascending `_time` order and can be resumed by time."""
+    return "uniq by" not in query and bool(
+        re.search(r"\|\s*(?:order|sort) by \(\s*_time\s*(?:asc\s*)?\)", query)
+    )
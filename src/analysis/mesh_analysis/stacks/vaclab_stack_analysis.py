@@ -1,9 +1,10 @@
 # Python Imports
 import logging
 import traceback
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 from pydantic import NonNegativeInt
@@ -12,6 +13,7 @@ from result import Err, Ok, Result
 from src.analysis.mesh_analysis.readers.builders.victoria_reader_builder import (
     VictoriaReaderBuilder,
 )
+from src.analysis.mesh_analysis.readers.trace_cache import TraceCache
 from src.analysis.mesh_analysis.stacks.stack_analysis import StackAnalysis
 from src.analysis.utils import path_utils
 from src.analysis.utils.log_utils import apply_config, capture_current_logging, get_log_queue
@@ -19,42 +21,77 @@ from src.analysis.utils.log_utils import apply_config, capture_current_logging,
 logger = logging.getLogger(__name__)
 
 
-import logging
-from typing import List
-
-
 class VaclabStackAnalysis(StackAnalysis):
-    def __init__(self, reader_builder: VictoriaReaderBuilder, **kwargs):
+    def __init__(
+        self,
+        reader_builder: VictoriaReaderBuilder,
+        executor: Optional[Executor] = None,
+        cache: Optional[TraceCache] = None,
+        **kwargs,
+    ):
+        """
+        :param executor: Long-lived pool to run the queries in. It is not shut down by the stack.
+        If None, a pool of `n_jobs` workers is created for each call.
+        :param cache: Cache of traced dataframes per pod. Cached pods are not queried again.
+        :param pods_per_query: If set, the logs of up to this many pods of a StatefulSet are
+        retrieved with a single query per pattern group, and split back per pod on the client.
+        Otherwise, there is one query per pod.
+        """
         super().__init__(reader_builder, **kwargs)
+        self._executor = executor
+        self._cache = cache
+        self._pods_per_query: Optional[int] = kwargs.get("pods_per_query")
+
+    def __getstate__(self) -> Dict:
+        # Bound methods are sent to the workers, the pool itself stays in the parent process.
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+    @contextmanager
+    def _pool(self, n_jobs: int) -> Iterator[Executor]:
+        if self._executor is not None:
+            yield self._executor
+            return
+
+        with ProcessPoolExecutor(
+            n_jobs, initializer=apply_config, initargs=(capture_current_logging(), get_log_queue())
+        ) as executor:
+            yield executor
 
     def get_all_node_dataframes(
         self, stateful_sets: List[str], nodes_per_stateful_set: List[NonNegativeInt], n_jobs: int
     ) -> List[Dict[str, List[pd.DataFrame]]]:
         dfs = []
 
-        for stateful_set_name, num_nodes_in_stateful_set in zip(
-            stateful_sets, nodes_per_stateful_set
-        ):
-            with ProcessPoolExecutor(
-                n_jobs,
-                initializer=apply_config,
-                initargs=(capture_current_logging(), get_log_queue()),
-            ) as executor:
-                futures = {
-                    executor.submit(
-                        self._extract_dataframe_single_node, stateful_set_name, node_index
-                    ): node_index
-                    for node_index in range(num_nodes_in_stateful_set)
-                }
-
-                for i, future in enumerate(as_completed(futures)):
-                    i = i + 1
+        with self._pool(n_jobs) as executor:
+            for stateful_set_name, num_nodes_in_stateful_set in zip(
+                stateful_sets, nodes_per_stateful_set
+            ):
+                if self._pods_per_query:
+                    futures = {
+                        executor.submit(
+                            self._extract_dataframes_pod_batch, stateful_set_name, node_indices
+                        ): node_indices
+                        for node_indices in self._batch_indices(num_nodes_in_stateful_set)
+                    }
+                else:
+                    futures = {
+                        executor.submit(
+                            self._extract_dataframe_single_node, stateful_set_name, node_index
+                        ): [node_index]
+                        for node_index in range(num_nodes_in_stateful_set)
+                    }
+
+                i = 0
+                for future in as_completed(futures):
+                    previous, i = i, i + len(futures[future])
                     try:
-                        statefulset_name, node_index, df_dict = future.result()
-                        dfs.append(df_dict)
-                        if i % 50 == 0 or i == num_nodes_in_stateful_set:
+                        statefulset_name, node_indices, df_dicts = future.result()
+                        dfs.extend(df_dicts)
+                        if i // 50 != previous // 50 or i == num_nodes_in_stateful_set:
                             logger.info(
-                                f"Processed {statefulset_name}-{node_index} {i}/{num_nodes_in_stateful_set} nodes in stateful set <{stateful_set_name}>"
+                                f"Processed {statefulset_name}-{node_indices[-1]} {i}/{num_nodes_in_stateful_set} nodes in stateful set <{stateful_set_name}>"
                             )
 
                     except Exception as e:
@@ -63,12 +100,45 @@ class VaclabStackAnalysis(StackAnalysis):
 
         return dfs
 
+    def _batch_indices(self, num_nodes: int) -> List[List[int]]:
+        return [
+            list(range(start, min(start + self._pods_per_query, num_nodes)))
+            for start in range(0, num_nodes, self._pods_per_query)
+        ]
+
     def _extract_dataframe_single_node(
         self, statefulset_name: str, node_index: int
-    ) -> Tuple[str, int, Dict[str, List[pd.DataFrame]]]:
-        reader = self._reader_builder.build_with_statefulset(statefulset_name, node_index)
-        data = reader.get_dataframes()
-        return statefulset_name, node_index, data
+    ) -> Tuple[str, List[int], List[Dict[str, List[pd.DataFrame]]]]:
+        pod_name = f"{statefulset_name}-{node_index}"
+        data = self._cache.load(pod_name) if self._cache else None
+        if data is None:
+            reader = self._reader_builder.build_with_statefulset(statefulset_name, node_index)
+            data = reader.get_dataframes()
+            if self._cache:
+                self._cache.store(pod_name, data)
+        return statefulset_name, [node_index], [data]
+
+    def _extract_dataframes_pod_batch(
+        self, statefulset_name: str, node_indices: List[int]
+    ) -> Tuple[str, List[int], List[Dict[str, List[pd.DataFrame]]]]:
+        pod_names = [f"{statefulset_name}-{index}" for index in node_indices]
+        data = {}
+        if self._cache:
+            data = {pod_name: self._cache.load(pod_name) for pod_name in pod_names}
+            data = {pod_name: dfs for pod_name, dfs in data.items() if dfs is not None}
+
+        missing = [
+            index for index, pod_name in zip(node_indices, pod_names) if pod_name not in data
+        ]
+        if missing:
+            reader = self._reader_builder.build_with_statefulset_pods(statefulset_name, missing)
+            fetched = reader.get_dataframes_per_pod([f"{statefulset_name}-{i}" for i in missing])
+            if self._cache:
+                for pod_name, dfs in fetched.items():
+                    self._cache.store(pod_name, dfs)
+            data.update(fetched)
+
+        return statefulset_name, node_indices, [data[pod_name] for pod_name in pod_names]
 
     def _dump_logs_for_single_node(self, node: str, dump_path: Path) -> Result[Path, None]:
         reader = self._reader_builder.build_with_pod_name(node, sort_by="(_time)")
@@ -101,9 +171,7 @@ class VaclabStackAnalysis(StackAnalysis):
         return num_nodes_per_stateful_set
 
     def dump_node_logs(self, n_jobs: int, identifiers: List[str], dump_path: Path) -> None:
-        with ProcessPoolExecutor(
-            n_jobs, initializer=apply_config, initargs=(capture_current_logging(), get_log_queue())
-        ) as executor:
+        with self._pool(n_jobs) as executor:
             futures_map = {
                 executor.submit(self._dump_logs_for_single_node, identifier, dump_path): identifier
                 for identifier in identifiers
@@ -5,6 +5,8 @@ from typing import Any, List, Optional
 import yaml
 from pydantic import BaseModel, Field
 
+from src.analysis.metrics import scrape_utils
+from src.analysis.utils.dataframe_io import DataFormat
 from src.analysis.utils.time_utils import TimeRange
 
 
@@ -23,7 +25,12 @@ class ScrapeConfig(BaseModel):
 
     url: str = "https://metrics.lab.vac.dev/select/0/prometheus/api/v1/"
     step: str = "60s"
+    max_points_per_query: int = scrape_utils.MAX_POINTS_PER_QUERY
+    """Longer range queries are split, to stay under the server's points per series limit."""
+    snap_to_step: bool = False
+    """Round sample timestamps to multiples of `step`, so series with jittered timestamps align."""
     dump_location: Path = Field(default_factory=lambda: Path("test_results/"))
+    dump_format: DataFormat = "csv"
     metrics_to_scrape: List[MetricToScrape] = Field(default_factory=list)
     name: str
     interval: TimeRange
@@ -19,6 +19,8 @@ from typing import Dict, Optional
 
 import pandas as pd
 
+from src.analysis.utils import dataframe_io
+
 # Relay pods are pod-0..pod-(N-1); this excludes the bootstrap and the publisher
 # (named bootstrap-* / pod-api-requester-* on the cluster).
 _RELAY_POD = re.compile(r"pod-\d+$")
@@ -55,7 +57,7 @@ def _per_node_values(metrics_dir: Path, folder: str, muxer: str) -> Optional[pd.
     if not csv.exists():
         logger.warning(f"gossipsub summary: missing {csv}")
         return None
-    df = pd.read_csv(csv, parse_dates=["Time"], index_col="Time")
+    df = dataframe_io.read_dataframe(csv, index_col="Time", parse_dates=["Time"])
     cols = [c for c in df.columns if _RELAY_POD.fullmatch(c)]
     if not cols:
         return None
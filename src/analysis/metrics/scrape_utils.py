@@ -1,45 +1,171 @@
 # Pyton Imports
-import json
 import logging
+import re
+import threading
 import urllib.parse
-import urllib.request
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
+import requests
+from requests.adapters import HTTPAdapter
 from result import Err, Ok, Result
+from urllib3.util.retry import Retry
 
 from src.analysis.utils.time_utils import to_utc_timestamp
 
 logger = logging.getLogger(__name__)
 
+# Prometheus rejects range queries returning more than 11000 points per series.
+MAX_POINTS_PER_QUERY = 11000
+
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800, "y": 31536000}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Session shared by every query of the process, so connections to the metrics server are kept
+    alive. Connection errors, 429 and 5xx answers are retried with exponential backoff.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=None,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+            _session = requests.Session()
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def parse_step(step: int | float | str) -> float:
+    """Seconds in a Prometheus step, given as a number of seconds or a duration like `60s` or `1m`."""
+    if isinstance(step, (int, float)):
+        return float(step)
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|s|m|h|d|w|y)?", step.strip())
+    if not parts or "".join(value + unit for value, unit in parts) != step.strip():
+        raise ValueError(f"Invalid step: {step}")
+    return sum(float(value) * DURATION_UNITS[unit or "s"] for value, unit in parts)
+
 
 def create_promql(
     address: str, query: str, start_scrape: datetime, finish_scrape: datetime, step: int
 ) -> str:
-    query = urllib.parse.quote(query)
-    promql = address + "query_range?query=" + query
-
     start = to_utc_timestamp(start_scrape)
     end = to_utc_timestamp(finish_scrape)
 
+    return _create_range_url(address, query, start, end, step)
+
+
+def _create_range_url(address: str, query: str, start: float, end: float, step) -> str:
+    query = urllib.parse.quote(query)
+    promql = address + "query_range?query=" + query
+
     promql = promql + "&start=" + str(start) + "&end=" + str(end) + "&step=" + str(step)
 
     return promql
 
 
-def get_query_data(request: str) -> Result[Dict, str]:
-    response = urllib.request.urlopen(request, timeout=30)
+def split_range(
+    start: float, end: float, step: float, max_points: int = MAX_POINTS_PER_QUERY
+) -> List[Tuple[float, float]]:
+    """
+    Split [start, end] into sub-ranges of at most `max_points` evaluation steps.
 
-    logger.debug(f"Response: {response.status}")
-    if response.status != 200:
-        return Err(
-            f"Error in query. Status code {response.status}. {response.read().decode('utf-8')}"
-        )
+    Every sub-range starts on the `start + k * step` grid, right after the last point of the previous
+    one, so together they return the same points as a single query.
+    """
+    span = step * (max_points - 1)
+    ranges = []
+    while start <= end:
+        sub_end = min(start + span, end)
+        ranges.append((start, sub_end))
+        start = sub_end + step
+    return ranges
 
-    logger.debug(f"Response: {response.status}")
-    json_response = json.loads(str(response.read(), "utf-8"))
+
+def merge_query_data(responses: List[Dict]) -> Dict:
+    """Merge range query responses of consecutive sub-ranges into a single response."""
+    series: Dict[Tuple, Dict] = {}
+    for response in responses:
+        for item in response["data"]["result"]:
+            key = tuple(sorted(item["metric"].items()))
+            if key in series:
+                series[key]["values"].extend(item["values"])
+            else:
+                series[key] = {"metric": item["metric"], "values": list(item["values"])}
+
+    merged = dict(responses[0])
+    merged["data"] = {**responses[0]["data"], "result": list(series.values())}
+    return merged
+
+
+def _request_json(request: str, timeout: float) -> Result[Dict, str]:
+    try:
+        response = get_session().get(request, timeout=timeout)
+    except requests.RequestException as e:
+        return Err(f"Error in query. {e}")
+
+    logger.debug(f"Response: {response.status_code}")
+    if response.status_code != 200:
+        return Err(f"Error in query. Status code {response.status_code}. {response.text}")
+
+    return Ok(response.json())
+
+
+def get_query_data(request: str, timeout: float = 30) -> Result[Dict, str]:
+    match _request_json(request, timeout):
+        case Ok(json_response):
+            pass
+        case Err(err):
+            return Err(err)
 
     if len(json_response["data"]["result"]) == 0:
         return Err(f"Returned data is empty.")
 
     return Ok(json_response)
+
+
+def get_query_range_data(
+    address: str,
+    query: str,
+    start_scrape: datetime,
+    finish_scrape: datetime,
+    step: int | float | str,
+    max_points: int = MAX_POINTS_PER_QUERY,
+    timeout: float = 30,
+) -> Result[Dict, str]:
+    """
+    Run a range query, split in sub-ranges of at most `max_points` steps so long windows are not
+    rejected by the server.
+    """
+    sub_ranges = split_range(
+        to_utc_timestamp(start_scrape),
+        to_utc_timestamp(finish_scrape),
+        parse_step(step),
+        max_points,
+    )
+    if len(sub_ranges) > 1:
+        logger.debug(f"Splitting query in {len(sub_ranges)} sub-ranges")
+
+    responses = []
+    for start, end in sub_ranges:
+        match _request_json(_create_range_url(address, query, start, end, step), timeout):
+            case Ok(json_response):
+                responses.append(json_response)
+            case Err(err):
+                return Err(err)
+
+    data = merge_query_data(responses)
+    if len(data["data"]["result"]) == 0:
+        return Err(f"Returned data is empty.")
+
+    return Ok(data)
@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Optional
 
 from pydantic import BaseModel
@@ -6,7 +7,7 @@ from result import Err, Ok
 
 from src.analysis.data.data_request_handler import DataRequestHandler
 from src.analysis.metrics import kubernetes_manager, scrape_utils
-from src.analysis.metrics.config import ScrapeConfig
+from src.analysis.metrics.config import MetricToScrape, ScrapeConfig
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +16,19 @@ class Scrapper(BaseModel):
     url: str
     _config: ScrapeConfig
     _k8s: object
+    _max_in_flight: int
 
-    def __init__(self, kube_config: Optional[str] = None, config: ScrapeConfig = None):
+    def __init__(
+        self,
+        kube_config: Optional[str] = None,
+        config: ScrapeConfig = None,
+        max_in_flight: int = 8,
+    ):
+        """:param max_in_flight: Maximum number of metrics queried at the same time."""
         self._url = config.url
         self._config = config
         self._k8s = kubernetes_manager.KubernetesManager(kube_config) if kube_config else None
+        self._max_in_flight = max_in_flight
 
     def query_and_dump_metrics(self):
         # https://github.com/kubernetes-client/python/blob/master/examples/pod_portforward.py
@@ -27,27 +36,48 @@ class Scrapper(BaseModel):
         # Not needed anymore as we have a public address in the lab
 
         logger.info(f"Querying simulation {self._config.name}")
-        for metric_config in self._config.metrics_to_scrape:
-            logger.info(f"Querying metric {metric_config.name}")
-            promql = self._create_query(metric_config.query, self._config)
-            logger.debug(f"Query: {promql}")
-            match scrape_utils.get_query_data(promql):
-                case Ok(data):
-                    logger.debug(f"Successfully extracted {metric_config.name} data from response")
-                    file_location = (
-                        self._config.dump_location / metric_config.folder_name / self._config.name
-                    ).as_posix()
-                    self._dump_data(
-                        metric_config.name,
-                        metric_config.extract_field,
-                        metric_config.container,
-                        metric_config.metrics_path,
-                        data,
-                        file_location,
-                    )
-                case Err(err):
-                    logger.error(f"Error in {metric_config.name}. {err}")
-                    continue
+        with ThreadPoolExecutor(max_workers=self._max_in_flight) as executor:
+            futures = {
+                executor.submit(self._query_metric, metric_config): metric_config
+                for metric_config in self._config.metrics_to_scrape
+            }
+            # Each metric is dumped as soon as its data arrives, while the others are in flight.
+            for future in as_completed(futures):
+                metric_config = futures[future]
+                match future.result():
+                    case Ok(data):
+                        logger.debug(
+                            f"Successfully extracted {metric_config.name} data from response"
+                        )
+                        file_location = (
+                            self._config.dump_location
+                            / metric_config.folder_name
+                            / self._config.name
+                        ).as_posix()
+                        self._dump_data(
+                            metric_config.name,
+                            metric_config.extract_field,
+                            metric_config.container,
+                            metric_config.metrics_path,
+                            data,
+                            file_location,
+                        )
+                    case Err(err):
+                        logger.error(f"Error in {metric_config.name}. {err}")
+                        continue
+
+    def _query_metric(self, metric_config: MetricToScrape):
+        logger.info(f"Querying metric {metric_config.name}")
+        query = self._create_query(metric_config.query, self._config)
+        logger.debug(f"Query: {query}")
+        return scrape_utils.get_query_range_data(
+            self._url,
+            query,
+            self._config.start,
+            self._config.end,
+            self._config.step,
+            self._config.max_points_per_query,
+        )
 
     def _dump_data(
         self,
@@ -58,16 +88,16 @@ class Scrapper(BaseModel):
         data: Dict,
         dump_path: str,
     ):
-        logger.debug(f"Dumping {scrape_name} data to .csv")
+        logger.debug(f"Dumping {scrape_name} data to .{self._config.dump_format}")
         data_handler = DataRequestHandler(data)
-        data_handler.create_dataframe_from_request(extract_field, container_name, metrics_path)
-        data_handler.dump_dataframe(dump_path)
+        step = scrape_utils.parse_step(self._config.step) if self._config.snap_to_step else None
+        data_handler.create_dataframe_from_request(
+            extract_field, container_name, metrics_path, step
+        )
+        data_handler.dump_dataframe(dump_path, self._config.dump_format)
 
     def _create_query(self, metric: str, scrape_config: ScrapeConfig) -> str:
         if "__rate_interval" in metric:
             metric = metric.replace("$__rate_interval", scrape_config.rate_interval)
-        promql = scrape_utils.create_promql(
-            self._url, metric, scrape_config.start, scrape_config.end, scrape_config.step
-        )
 
-        return promql
+        return metric
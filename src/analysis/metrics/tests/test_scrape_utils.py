@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.analysis.metrics import scrape_utils
+
+START = datetime(2026, 8, 5, 1, 0, tzinfo=timezone.utc)
+END = datetime(2026, 8, 5, 1, 10, tzinfo=timezone.utc)
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Answers each range query with one point per step, for two series."""
+
+    def __init__(self):
+        self.ranges = []
+
+    def get(self, url, timeout):
+        params = parse_qs(urlparse(url).query)
+        start, end, step = (float(params[key][0].rstrip("s")) for key in ("start", "end", "step"))
+        self.ranges.append((start, end))
+        points = []
+        while start <= end:
+            points.append([start, "1"])
+            start += step
+        result = [{"metric": {"pod": pod}, "values": points} for pod in ("a", "b")]
+        return FakeResponse(
+            {"status": "success", "data": {"resultType": "matrix", "result": result}}
+        )
+
+
+@pytest.mark.parametrize("step, seconds", [("60s", 60), ("1m", 60), ("1m30s", 90), (15, 15)])
+def test_parse_step(step, seconds):
+    assert scrape_utils.parse_step(step) == seconds
+
+
+def test_split_range_keeps_the_step_grid():
+    assert scrape_utils.split_range(0, 100, 10, max_points=4) == [(0, 30), (40, 70), (80, 100)]
+    assert scrape_utils.split_range(0, 25, 10, max_points=4) == [(0, 25)]
+
+
+def test_long_range_is_split_and_merged(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(scrape_utils, "get_session", lambda: session)
+
+    data = scrape_utils.get_query_range_data("http://vm/api/v1/", "up", START, END, "60s", 4)
+
+    assert len(session.ranges) == 3
+    result = data.ok_value["data"]["result"]
+    assert [series["metric"]["pod"] for series in result] == ["a", "b"]
+    times = [t for t, _ in result[0]["values"]]
+    assert times == [START.timestamp() + 60 * i for i in range(11)]
+
+
+def test_failed_sub_range_is_an_error(monkeypatch):
+    session = FakeSession()
+    session.get = lambda url, timeout: FakeResponse("overloaded", status_code=422)
+    monkeypatch.setattr(scrape_utils, "get_session", lambda: session)
+
+    result = scrape_utils.get_query_range_data("http://vm/api/v1/", "up", START, END, "60s")
+
+    assert "422" in result.err_value
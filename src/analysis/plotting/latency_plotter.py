@@ -17,6 +17,8 @@ import pandas as pd
 import seaborn as sns
 from pydantic import BaseModel, Field, PositiveInt
 
+from src.analysis.utils import dataframe_io
+
 logger = logging.getLogger(__name__)
 sns.set_theme()
 
@@ -40,7 +42,9 @@ class LatencyPlotConfig(BaseModel):
 
 
 def _received_csv(run: Path) -> Path:
-    return run if run.suffix == ".csv" else run / SUMMARY_RECEIVED
+    if run.suffix in dataframe_io.EXTENSIONS.values():
+        return dataframe_io.find_data_file(run)
+    return dataframe_io.find_data_file(run / SUMMARY_RECEIVED)
 
 
 def load_delays(run: Union[str, Path]) -> pd.Series:
@@ -49,7 +53,7 @@ def load_delays(run: Union[str, Path]) -> pd.Series:
     if not csv.exists():
         logger.warning(f"latency: missing {csv}")
         return pd.Series(dtype="float64")
-    delays = pd.read_csv(csv, usecols=[DELAY_COLUMN])[DELAY_COLUMN]
+    delays = dataframe_io.read_dataframe(csv, columns=[DELAY_COLUMN])[DELAY_COLUMN]
     return pd.to_numeric(delays, errors="coerce").dropna()
 
 
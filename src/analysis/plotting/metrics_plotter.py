@@ -6,9 +6,9 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 from matplotlib import ticker
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
-from src.analysis.data.data_file_handler import DataFileHandler
+from src.analysis.data.data_file_handler import DataFileCache, DataFileHandler
 from src.analysis.plotting.config import DataPath, PlotConfig
 from src.analysis.utils.plot_utils import add_boxplot_stat_labels
 
@@ -18,12 +18,17 @@ sns.set_theme()
 
 class MetricsPlotter(BaseModel):
     configs: List[PlotConfig]
+    _cache: DataFileCache = PrivateAttr(default_factory=DataFileCache)
+    """Files read by the plots of one `create_plots` call, so plots sharing data read it once."""
 
     def create_plots(self):
-        for plot_config in self.configs:
-            logger.info(f'Plotting "{plot_config.name}"')
-            self._create_plot(plot_config)
-            logger.info(f'Plot "{plot_config.name}" finished')
+        try:
+            for plot_config in self.configs:
+                logger.info(f'Plotting "{plot_config.name}"')
+                self._create_plot(plot_config)
+                logger.info(f'Plot "{plot_config.name}" finished')
+        finally:
+            self._cache.clear()
 
     def _create_plot(self, plot_specs: PlotConfig):
         fig, axs = plt.subplots(
@@ -41,10 +46,10 @@ class MetricsPlotter(BaseModel):
 
     def _insert_data_in_axs(self, plot_specs: PlotConfig, axs: np.ndarray):
         for i, metric in enumerate(plot_specs.metrics):
-            metric_df = pd.DataFrame()
+            group_dfs = []
 
             for group in plot_specs.groups:
-                file_data_handler = DataFileHandler(plot_specs.ignore_columns)
+                file_data_handler = DataFileHandler(plot_specs.ignore_columns, cache=self._cache)
                 named_files = [
                     DataPath(name=data_path.name, path=data_path.path / metric)
                     for data_path in group.data_paths
@@ -63,7 +68,9 @@ class MetricsPlotter(BaseModel):
                         f"Subplot name: `{group.name}`"
                     )
 
-                metric_df = pd.concat([metric_df, group_df], ignore_index=True)
+                group_dfs.append(group_df)
+
+            metric_df = pd.concat(group_dfs, ignore_index=True)
 
             # Melt numeric columns only, keep class and variable as identifiers
             metric_df = pd.melt(
@@ -0,0 +1,112 @@
+# Python Imports
+import logging
+from pathlib import Path
+from typing import List, Literal, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DataFormat = Literal["csv", "parquet"]
+
+EXTENSIONS = {"csv": ".csv", "parquet": ".parquet"}
+
+PARQUET_MAGIC = b"PAR1"
+
+
+def detect_format(file_path: Path) -> DataFormat:
+    """Format of `file_path`, from its extension or, for files without one, its content."""
+    suffix = Path(file_path).suffix.lower()
+    for data_format, extension in EXTENSIONS.items():
+        if suffix == extension:
+            return data_format
+
+    with open(file_path, "rb") as file:
+        return "parquet" if file.read(len(PARQUET_MAGIC)) == PARQUET_MAGIC else "csv"
+
+
+def find_data_file(file_path: Path) -> Path:
+    """
+    `file_path` if it exists, otherwise the same file written in another format
+    (eg. `received.parquet` for `received.csv`). Falls back to `file_path` if there is none.
+    """
+    file_path = Path(file_path)
+    if file_path.exists() or file_path.suffix not in EXTENSIONS.values():
+        return file_path
+
+    for extension in EXTENSIONS.values():
+        candidate = file_path.with_suffix(extension)
+        if candidate.exists():
+            return candidate
+
+    return file_path
+
+
+def with_format_extension(file_path: Path, data_format: DataFormat) -> Path:
+    """Replace a known data extension of `file_path` by the one of `data_format`."""
+    file_path = Path(file_path)
+    if file_path.suffix in EXTENSIONS.values():
+        return file_path.with_suffix(EXTENSIONS[data_format])
+    return file_path
+
+
+def write_dataframe(
+    df: pd.DataFrame, file_path: Path, data_format: DataFormat = "csv", index: bool = True
+):
+    """
+    Write `df` as CSV or Parquet. For Parquet, object columns holding numbers as strings (as
+    returned by Prometheus) are stored as numbers, and other object columns as strings, so reading
+    it back gives the same dtypes as parsing the CSV.
+    """
+    if data_format == "csv":
+        df.to_csv(file_path, index=index)
+    elif data_format == "parquet":
+        _typed_for_parquet(df).to_parquet(file_path, index=index)
+    else:
+        raise ValueError(f"Unknown data format: {data_format}")
+
+
+def read_dataframe(
+    file_path: Path,
+    columns: Optional[List[str]] = None,
+    index_col: Optional[str] = None,
+    parse_dates: Optional[List[str]] = None,
+    nrows: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Read a dataframe written by `write_dataframe`, detecting the format.
+
+    :param columns: Only read these columns. Parquet files do not even load the others.
+    :param index_col: Column used as index.
+    :param parse_dates: Columns parsed as dates. Parquet keeps them typed, so only CSV needs it.
+    :param nrows: Only return the first `nrows` rows.
+    """
+    if columns is not None and index_col is not None:
+        columns = list(dict.fromkeys([*columns, index_col]))
+
+    if detect_format(file_path) == "csv":
+        return pd.read_csv(
+            file_path, usecols=columns, index_col=index_col, parse_dates=parse_dates, nrows=nrows
+        )
+
+    df = pd.read_parquet(file_path, columns=columns)
+    if index_col is not None and index_col not in df.index.names:
+        df = df.set_index(index_col)
+    if nrows is not None:
+        df = df.head(nrows)
+    return df
+
+
+def _typed_for_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    typed = df.copy(deep=False)
+    for column in df.columns[df.dtypes == object]:
+        values = df[column]
+        try:
+            typed[column] = pd.to_numeric(values)
+        except (ValueError, TypeError):
+            try:
+                # Handles the "NaN" and "+Inf" samples of Prometheus, unlike `pd.to_numeric`.
+                typed[column] = values.astype(float)
+            except (ValueError, TypeError):
+                typed[column] = values.where(values.isna(), values.astype(str))
+    return typed
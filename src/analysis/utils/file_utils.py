@@ -4,14 +4,15 @@ import logging
 import os
 import traceback
 from pathlib import Path
-from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import pandas as pd
 import yaml
 from result import Err, Ok, Result
 
 # Project Imports
-from src.analysis.utils import path_utils
+from src.analysis.utils import dataframe_io, path_utils
+from src.analysis.utils.dataframe_io import DataFormat
 
 logger = logging.getLogger(__name__)
 
@@ -45,12 +46,73 @@ def get_files_from_folder_path(
     return Ok(files)
 
 
+def iter_file_lines(
+    file_path: Path,
+    chunk_size: int = 1 << 20,
+    encoding: str = "utf-8",
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Yield the lines of `file_path` reading it in fixed-size binary chunks, so memory usage does not
+    depend on the file size. A line split across two chunks is carried over and yielded once it is
+    complete. Lines keep their trailing newline and CRLF endings become LF, like `readlines()` in
+    text mode.
+
+    :param start: Byte offset to start reading from. It should be the start of a line.
+    :param end: Byte offset to stop reading at (exclusive). Defaults to the end of the file.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        remaining = end - start if end is not None else None
+        partial = b""
+        while remaining is None or remaining > 0:
+            chunk = file.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            lines = (partial + chunk).split(b"\n")
+            partial = lines.pop()
+            for line in lines:
+                yield (line.removesuffix(b"\r") + b"\n").decode(encoding, errors="replace")
+        if partial:
+            yield partial.decode(encoding, errors="replace")
+
+
+def line_aligned_ranges(file_path: Path, shard_size: int) -> List[Tuple[int, int]]:
+    """
+    Split `file_path` into consecutive [start, end) byte ranges of about `shard_size` bytes each.
+    Every boundary is moved forward to just after the next newline, so no line is split between
+    two ranges.
+    """
+    size = os.path.getsize(file_path)
+    boundaries = [0]
+    with open(file_path, "rb") as file:
+        while boundaries[-1] + shard_size < size:
+            file.seek(boundaries[-1] + shard_size)
+            file.readline()
+            boundary = file.tell()
+            if boundary >= size:
+                break
+            boundaries.append(boundary)
+    boundaries.append(size)
+
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
 def dump_df_as_csv(
     df: pd.DataFrame, file_location: Path, with_index: bool = True
+) -> Result[pd.DataFrame, str]:
+    return dump_df(df, file_location, with_index, "csv")
+
+
+def dump_df(
+    df: pd.DataFrame, file_location: Path, with_index: bool = True, data_format: DataFormat = "csv"
 ) -> Result[pd.DataFrame, str]:
     result = path_utils.prepare_path_for_file(file_location)
     if result.is_ok():
-        df.to_csv(result.ok_value, index=with_index)
+        dataframe_io.write_dataframe(df, result.ok_value, data_format, index=with_index)
         logger.info(f"Dumped {file_location}")
         return Ok(df)
 
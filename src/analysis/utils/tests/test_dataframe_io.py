@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from src.analysis.utils import dataframe_io
+
+
+def _metrics_df() -> pd.DataFrame:
+    df = pd.DataFrame(
+        {"nodes-0": ["1", "NaN", "+Inf"], "nodes-1": ["2.5", None, "3"]},
+        index=pd.to_datetime([1785892500, 1785892560, 1785892620], unit="s"),
+    )
+    df.index.name = "Time"
+    return df
+
+
+@pytest.mark.parametrize("data_format", ["csv", "parquet"])
+def test_metrics_read_back_with_the_same_types(tmp_path, data_format):
+    # Scraped metrics are dumped without extension, the format is detected from the content.
+    path = tmp_path / "libp2p-peers"
+    dataframe_io.write_dataframe(_metrics_df(), path, data_format)
+
+    df = dataframe_io.read_dataframe(path, index_col="Time", parse_dates=["Time"], nrows=2)
+
+    assert dataframe_io.detect_format(path) == data_format
+    assert list(df.columns) == ["nodes-0", "nodes-1"]
+    assert df.index.dtype.kind == "M" and len(df) == 2
+    assert df["nodes-1"].tolist() == [2.5, pytest.approx(float("nan"), nan_ok=True)]
+
+
+def test_parquet_projects_columns(tmp_path):
+    df = pd.DataFrame({"msg_id": ["a", "b"], "delayMs": [1, 2], "pod": ["p", "q"]})
+    dataframe_io.write_dataframe(df, tmp_path / "received.parquet", "parquet", index=False)
+
+    loaded = dataframe_io.read_dataframe(tmp_path / "received.parquet", columns=["delayMs"])
+
+    assert list(loaded.columns) == ["delayMs"]
+    assert loaded["delayMs"].tolist() == [1, 2]
+
+
+def test_find_data_file_falls_back_to_other_formats(tmp_path):
+    (tmp_path / "received.parquet").touch()
+
+    assert dataframe_io.find_data_file(tmp_path / "received.csv") == tmp_path / "received.parquet"
+    assert dataframe_io.find_data_file(tmp_path / "sent.csv") == tmp_path / "sent.csv"
+    assert dataframe_io.with_format_extension(tmp_path / "sent.csv", "parquet").name == (
+        "sent.parquet"
+    )
@@ -0,0 +1,37 @@
+import pytest
+
+from src.analysis.utils.file_utils import iter_file_lines
+
+CONTENT = "first line\nsecond, longer line\n\nthird line without newline"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 11, 1 << 20])
+def test_lines_split_across_chunks_are_reassembled(tmp_path, chunk_size):
+    path = tmp_path / "node.log"
+    path.write_text(CONTENT)
+
+    with open(path) as file:
+        expected = file.readlines()
+
+    assert list(iter_file_lines(path, chunk_size)) == expected
+
+
+def test_crlf_endings_are_normalized(tmp_path):
+    path = tmp_path / "node.log"
+    path.write_bytes(b"a\r\nb\r\n")
+
+    assert list(iter_file_lines(path, chunk_size=2)) == ["a\n", "b\n"]
+
+
+def test_multibyte_characters_on_chunk_edges(tmp_path):
+    path = tmp_path / "node.log"
+    path.write_text("peer=ééé\nnext\n", encoding="utf-8")
+
+    assert list(iter_file_lines(path, chunk_size=1)) == ["peer=ééé\n", "next\n"]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "node.log"
+    path.write_text("")
+
+    assert list(iter_file_lines(path)) == []
@@ -1,14 +1,67 @@
 # Python Imports
 import logging
 import time
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
-from kubernetes import client
+from kubernetes import client, watch
 from kubernetes.client import ApiClient, ApiException
 from ruamel import yaml
 
 logger = logging.getLogger(__name__)
 
+# Label set on every object an experiment run deploys, whose value identifies the run.
+RUN_LABEL = "10ksim/run"
+
+# Controllers first, then pods, then the objects they use.
+DELETION_ORDER = [
+    "NetworkPolicy",
+    "Deployment",
+    "StatefulSet",
+    "DaemonSet",
+    "ReplicaSet",
+    "ReplicationController",
+    "Job",
+    "CronJob",
+    "Pod",
+    "Service",
+    "ConfigMap",
+    "RoleBinding",
+    "Role",
+    "ServiceAccount",
+    "PersistentVolumeClaim",
+]
+
+# Typed API and method suffix of each kind, e.g. `list_namespaced_stateful_set`.
+_KIND_METHODS = {
+    "Deployment": ("AppsV1Api", "deployment"),
+    "StatefulSet": ("AppsV1Api", "stateful_set"),
+    "DaemonSet": ("AppsV1Api", "daemon_set"),
+    "ReplicaSet": ("AppsV1Api", "replica_set"),
+    "ReplicationController": ("CoreV1Api", "replication_controller"),
+    "Job": ("BatchV1Api", "job"),
+    "CronJob": ("BatchV1Api", "cron_job"),
+    "Pod": ("CoreV1Api", "pod"),
+    "Service": ("CoreV1Api", "service"),
+    "ConfigMap": ("CoreV1Api", "config_map"),
+    "PersistentVolumeClaim": ("CoreV1Api", "persistent_volume_claim"),
+    "ServiceAccount": ("CoreV1Api", "service_account"),
+    "Role": ("RbacAuthorizationV1Api", "role"),
+    "RoleBinding": ("RbacAuthorizationV1Api", "role_binding"),
+    "NetworkPolicy": ("NetworkingV1Api", "network_policy"),
+}
+
+# Kinds `poll_namespace_has_objects` and `wait_for_no_objs_in_namespace` check by default.
+DEFAULT_NAMESPACE_CHECK_TYPES = ["Deployment", "StatefulSet", "DaemonSet", "ReplicaSet", "Pod"]
+
+# Longest single watch request; the watch resumes from the last resourceVersion seen.
+WATCH_TIMEOUT_SECONDS = 60
+
+
+def _namespaced_method(api_client: Optional[ApiClient], kind: str, verb: str) -> Callable:
+    """Typed API method `{verb}_namespaced_{kind}`, e.g. `delete_collection_namespaced_pod`."""
+    api_name, suffix = _KIND_METHODS[kind]
+    return getattr(getattr(client, api_name)(api_client), f"{verb}_namespaced_{suffix}")
+
 
 def get_cleanup_resources(yamls: List[yaml.YAMLObject], types: Optional[List[str]] = None):
     """
@@ -92,23 +145,6 @@ def cleanup_resources(
     resources: Dict mapping kind to list of names.
     """
     logger.info(f"Cleanup resources: `{resources}`")
-    deletion_order = [
-        "NetworkPolicy",
-        "Deployment",
-        "StatefulSet",
-        "DaemonSet",
-        "ReplicaSet",
-        "ReplicationController",
-        "Job",
-        "CronJob",
-        "Pod",
-        "Service",
-        "ConfigMap",
-        "RoleBinding",
-        "Role",
-        "ServiceAccount",
-        "PersistentVolumeClaim",
-    ]
 
     map = {
         "Deployment": lambda name: client.AppsV1Api(api_client).delete_namespaced_deployment(
@@ -158,7 +194,7 @@ def cleanup_resources(
         ).delete_namespaced_network_policy(name, namespace, body=client.V1DeleteOptions()),
     }
 
-    for kind in deletion_order:
+    for kind in DELETION_ORDER:
         logger.debug(f"Checking kind: `{kind}` in `{resources}`")
         names = resources.get(kind, [])
         logger.debug(f"Found {len(names)} names")
@@ -178,108 +214,156 @@ def cleanup_resources(
                     logger.warning(f"Error deleting {kind} `{name}`: {e}")
 
 
-def poll_cleanup_status(
-    resources: Dict[str, List[str]],
+def delete_by_label(
     namespace: str,
-    api_client: ApiClient,
-) -> bool:
-    """
-    Returns True if all specified resources are gone (deleted), False otherwise.
-    """
-    map = {
-        "Deployment": lambda name: client.AppsV1Api(api_client).read_namespaced_deployment(
-            name, namespace
-        ),
-        "StatefulSet": lambda name: client.AppsV1Api(api_client).read_namespaced_stateful_set(
-            name, namespace
-        ),
-        "DaemonSet": lambda name: client.AppsV1Api(api_client).read_namespaced_daemon_set(
-            name, namespace
-        ),
-        "ReplicaSet": lambda name: client.AppsV1Api(api_client).read_namespaced_replica_set(
-            name, namespace
-        ),
-        "ReplicationController": lambda name: client.CoreV1Api(
-            api_client
-        ).read_namespaced_replication_controller(name, namespace),
-        "Job": lambda name: client.BatchV1Api(api_client).read_namespaced_job(name, namespace),
-        "CronJob": lambda name: client.BatchV1beta1Api(api_client).read_namespaced_cron_job(
-            name, namespace
-        ),
-        "Pod": lambda name: client.CoreV1Api(api_client).read_namespaced_pod(name, namespace),
-        "Service": lambda name: client.CoreV1Api(api_client).read_namespaced_service(
-            name, namespace
-        ),
-        "ConfigMap": lambda name: client.CoreV1Api(api_client).read_namespaced_config_map(
-            name, namespace
-        ),
-        "ServiceAccount": lambda name: client.CoreV1Api(api_client).read_namespaced_service_account(
-            name, namespace
-        ),
-        "Role": lambda name: client.RbacAuthorizationV1Api(api_client).read_namespaced_role(
-            name, namespace
-        ),
-        "RoleBinding": lambda name: client.RbacAuthorizationV1Api(
-            api_client
-        ).read_namespaced_role_binding(name, namespace),
-    }
+    api_client: Optional[ApiClient],
+    label_selector: str,
+    kinds: Iterable[str],
+) -> None:
+    """Delete every object of the given kinds matching `label_selector`, one request per kind.
 
-    for kind, names in resources.items():
-        reader = map.get(kind.lower())
-        if not reader:
+    Deletion is in the foreground, so controllers only disappear once their pods are gone.
+    """
+    kinds = set(kinds)
+    for kind in DELETION_ORDER:
+        if kind not in kinds:
             continue
-        for name in names:
-            try:
-                reader(name)  # If no exception, resource still exists
-                return False
-            except ApiException as e:
-                if e.status == 404:
-                    continue  # Resource is gone
-                else:
-                    raise
-    return True  # All resources are gone
+        logger.info(f"Deleting {kind}s `{label_selector}` in namespace `{namespace}`.")
+        try:
+            _namespaced_method(api_client, kind, "delete_collection")(
+                namespace,
+                label_selector=label_selector,
+                body=client.V1DeleteOptions(propagation_policy="Foreground"),
+            )
+        except ApiException as e:
+            logger.warning(f"Error deleting {kind}s `{label_selector}`: {e}")
 
 
-def wait_for_cleanup(
-    resources: Dict[str, List[str]],
+def _describe(kind: str, obj) -> str:
+    description = f"{kind} `{obj.metadata.name}`"
+    if obj.metadata.deletion_timestamp is None:
+        return f"{description} (not being deleted)"
+    return f"{description} (deleting since {obj.metadata.deletion_timestamp}, finalizers: {obj.metadata.finalizers or []})"
+
+
+def _wait_until_gone(
+    kind: str,
     namespace: str,
-    api_client,
-    timeout: int = 600,
-    polling_interval: int = 8,
-):
+    api_client: Optional[ApiClient],
+    deadline: float,
+    label_selector: Optional[str] = None,
+    names: Optional[Iterable[str]] = None,
+) -> Dict[str, object]:
+    """Watch the objects of a kind until none is left, or `deadline` passes.
+
+    Only objects matching `label_selector`, and named in `names` if given, are waited for.
+    :return: The objects still present, by name.
     """
-    Wait until all specified resources are deleted.
-    """
-    start_time = time.time()
-    logger.info(
-        f"Waiting for cleanup of resources in namespace `{namespace}` (timeout: {timeout}s)..."
-    )
-    while True:
+    list_objects = _namespaced_method(api_client, kind, "list")
+    wanted = set(names) if names is not None else None
+    selector = {"label_selector": label_selector} if label_selector else {}
+
+    def tracked(obj) -> bool:
+        return wanted is None or obj.metadata.name in wanted
+
+    def snapshot():
+        listing = list_objects(namespace, **selector)
+        present = {obj.metadata.name: obj for obj in listing.items if tracked(obj)}
+        return present, listing.metadata.resource_version
+
+    try:
+        present, resource_version = snapshot()
+    except ApiException as e:
+        logger.warning(f"Could not list {kind}s in namespace `{namespace}`: {e}")
+        return {}
+
+    while present and time.monotonic() < deadline:
+        remaining = max(int(deadline - time.monotonic()), 1)
+        stream = watch.Watch()
         try:
-            cleaned_up = poll_cleanup_status(resources, namespace, api_client)
+            for event in stream.stream(
+                list_objects,
+                namespace,
+                resource_version=resource_version,
+                timeout_seconds=min(remaining, WATCH_TIMEOUT_SECONDS),
+                **selector,
+            ):
+                obj = event["object"]
+                resource_version = obj.metadata.resource_version
+                if not tracked(obj):
+                    continue
+                if event["type"] == "DELETED":
+                    present.pop(obj.metadata.name, None)
+                else:
+                    present[obj.metadata.name] = obj
+                if not present:
+                    stream.stop()
         except ApiException as e:
-            logger.warning(f"Error polling cleanup status: {e}")
-            time.sleep(polling_interval)
-            continue
+            if e.status != 410:
+                logger.warning(f"Watch of {kind}s in namespace `{namespace}` failed: {e}")
+                time.sleep(1)
+            # Start over from the current state, the resourceVersion may be gone.
+            try:
+                present, resource_version = snapshot()
+            except ApiException as e:
+                logger.warning(f"Could not list {kind}s in namespace `{namespace}`: {e}")
+    return present
 
-        logger.info(f"Cleanup status: {'complete' if cleaned_up else 'incomplete'}.")
 
-        if cleaned_up:
-            logger.info(f"All specified resources cleaned up in namespace `{namespace}`.")
-            return
+def wait_for_deletion(
+    namespace: str,
+    api_client: Optional[ApiClient],
+    kinds: Iterable[str],
+    *,
+    label_selector: Optional[str] = None,
+    names: Optional[Dict[str, List[str]]] = None,
+    timeout: int = 600,
+) -> None:
+    """
+    Wait until no object of the given kinds is left, following deletions with watches.
 
-        elapsed = time.time() - start_time
-        if elapsed > timeout:
-            raise TimeoutError(
-                f"Timeout waiting for cleanup of resources in namespace `{namespace}`."
-            )
+    :param label_selector: Only wait for objects with these labels.
+    :param names: Only wait for these objects, by kind.
+    :raises TimeoutError: If timeout is exceeded, naming every object still present.
+    """
+    logger.info(f"Waiting for deletions in namespace `{namespace}` (timeout: {timeout}s)...")
+    deadline = time.monotonic() + timeout
+    stuck = []
+    for kind in DELETION_ORDER:
+        if kind not in kinds or (names is not None and not names.get(kind)):
+            continue
+        present = _wait_until_gone(
+            kind,
+            namespace,
+            api_client,
+            deadline,
+            label_selector=label_selector,
+            names=names.get(kind) if names is not None else None,
+        )
+        stuck.extend(_describe(kind, obj) for obj in present.values())
 
-        time.sleep(polling_interval)
+    if stuck:
+        for description in stuck:
+            logger.error(f"Deletion is stuck in namespace `{namespace}`: {description}")
+        raise TimeoutError(
+            f"Timeout waiting for deletions in namespace `{namespace}`. Still present: {stuck}"
+        )
+    logger.info(f"All specified resources cleaned up in namespace `{namespace}`.")
 
 
 def get_cleanup(
-    api_client: ApiClient, namespace: str, deployments: List[yaml.YAMLObject]
+    api_client: ApiClient,
+    namespace: str,
+    deployments: List[yaml.YAMLObject],
+    label_selector: Optional[str] = None,
 ) -> Callable[[], None]:
+    """Cleanup deleting the given deployments and waiting until they are gone.
+
+    :param deployments: Read when the cleanup runs, so it may still grow until then.
+    :param label_selector: If given, every kind is deleted in one request by this selector,
+        which must match the deployments. Otherwise they are deleted one by one.
+    """
+
     def cleanup():
         logger.debug("Cleaning up resources.")
         resources_to_cleanup = get_cleanup_resources(deployments)
@@ -287,14 +371,23 @@ def get_cleanup(
 
         logger.debug(f"Start cleanup.")
         try:
-            cleanup_resources(resources_to_cleanup, namespace, api_client)
+            if label_selector:
+                delete_by_label(namespace, api_client, label_selector, resources_to_cleanup)
+            else:
+                cleanup_resources(resources_to_cleanup, namespace, api_client)
         except client.exceptions.ApiException as e:
             logger.error(
                 f"Exception cleaning up resources. Resources: `{resources_to_cleanup}` exception: `{e}`",
                 exc_info=True,
             )
         logger.debug(f"Waiting for cleanup. Resources: `{resources_to_cleanup}`")
-        wait_for_cleanup(resources_to_cleanup, namespace, api_client)
+        wait_for_deletion(
+            namespace,
+            api_client,
+            resources_to_cleanup,
+            label_selector=label_selector,
+            names=resources_to_cleanup,
+        )
         logger.info(f"Finished cleanup. Resources: `{resources_to_cleanup}`")
 
     return cleanup
@@ -314,7 +407,7 @@ def poll_namespace_has_objects(
     :return: True if any such resources are found, False otherwise.
     :rtype: bool
     """
-    types = types if types else ["Deployment", "StatefulSet", "DaemonSet", "ReplicaSet", "Pod"]
+    types = types if types else DEFAULT_NAMESPACE_CHECK_TYPES
     logger.debug(f"Checking in namespace `{namespace}` for types: `{types}`")
     v1 = client.CoreV1Api(api_client)
     apps_v1 = client.AppsV1Api(api_client)
@@ -350,12 +443,13 @@ def wait_for_no_objs_in_namespace(
     namespace: str,
     timeout: int = 300,
     api_client: ApiClient = None,
-    polling_interval: int = 2,
     types: Optional[List[str]] = None,
 ):
     """
     Wait until the namespace has no objects of any of the given types.
 
+    Each type is listed once, then watched until its last object is deleted.
+
     :param timeout: Timeout in seconds.
     :type timeout: int
     :param types: Which type of objects to check for.
@@ -363,25 +457,15 @@ def wait_for_no_objs_in_namespace(
     :type types: list, optional
     :raises TimeoutError: If timeout is exceeded.
     """
-    start_time = time.time()
     logger.info(
         f"Waiting for namespace to be clean. Namespace: `{namespace}` (timeout: {timeout}s)..."
     )
-    while True:
-        has_objects = poll_namespace_has_objects(
-            namespace,
-            api_client,
-            types,
+    try:
+        wait_for_deletion(
+            namespace, api_client, types or DEFAULT_NAMESPACE_CHECK_TYPES, timeout=timeout
         )
-
-        if not has_objects:
-            logger.info(f"`{namespace}` is empty.")
-            return
-
-        elapsed = time.time() - start_time
-        if elapsed > timeout:
-            raise TimeoutError(
-                f"Timeout waiting for namespace to be empty. Namespace: `{namespace}`"
-            )
-
-        time.sleep(polling_interval)
+    except TimeoutError as e:
+        raise TimeoutError(
+            f"Timeout waiting for namespace to be empty. Namespace: `{namespace}`"
+        ) from e
+    logger.info(f"`{namespace}` is empty.")
@@ -4,17 +4,38 @@ import logging
 import subprocess
 import tempfile
 from functools import lru_cache, partial
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from kubernetes import client, utils
 from kubernetes.utils import FailToCreateError
 from ruamel import yaml
 
-from src.deployments.core.k8s_kubeconfig import get_config_file
+from src.deployments.core.k8s_kubeconfig import get_api_client, get_config_file
 from src.deployments.core.k8s_object import V1Deployable, k8s_obj_to_dict
 
 logger = logging.getLogger(__name__)
 
+# Field manager of the objects applied server-side, as `kubectl apply --server-side` uses "kubectl".
+FIELD_MANAGER = "10ksim"
+
+# Resource name of each kind `_kubectl_apply` applies server-side, for its URL path.
+_KIND_PLURALS = {
+    "Deployment": "deployments",
+    "StatefulSet": "statefulsets",
+    "DaemonSet": "daemonsets",
+    "ReplicaSet": "replicasets",
+    "Job": "jobs",
+    "CronJob": "cronjobs",
+    "ReplicationController": "replicationcontrollers",
+    "Pod": "pods",
+    "Service": "services",
+    "Role": "roles",
+    "RoleBinding": "rolebindings",
+    "ConfigMap": "configmaps",
+    "ServiceAccount": "serviceaccounts",
+    "NetworkPolicy": "networkpolicies",
+}
+
 
 def _extract_kind_and_name(kube_yaml: dict) -> Tuple[str, str]:
     kind = kube_yaml.get("kind")
@@ -31,11 +52,11 @@ def _kind_api_map(operation: str) -> Dict[str, Tuple[str, str]]:
     kind_map = {
         "Deployment": ("apps", "deployment"),
         "StatefulSet": ("apps", "stateful_set"),
-        "DaemonSet": ("apps", "daemonset"),
-        "ReplicaSet": ("apps", "replicaset"),
+        "DaemonSet": ("apps", "daemon_set"),
+        "ReplicaSet": ("apps", "replica_set"),
         "Job": ("batch", "job"),
-        "CronJob": ("batch", "cronjob"),
-        "ReplicationController": ("core", "replicationcontroller"),
+        "CronJob": ("batch", "cron_job"),
+        "ReplicationController": ("core", "replication_controller"),
         "Pod": ("core", "pod"),
         "Service": ("core", "service"),
         "Role": ("rbac", "role"),
@@ -54,14 +75,28 @@ def _kind_api_map(operation: str) -> Dict[str, Tuple[str, str]]:
     return template
 
 
+@lru_cache(maxsize=16)
+def _typed_apis(api_client: client.ApiClient) -> Dict[str, object]:
+    """Typed API objects of each group, built once per ApiClient."""
+    return {
+        "apps": client.AppsV1Api(api_client),
+        "batch": client.BatchV1Api(api_client),
+        "core": client.CoreV1Api(api_client),
+        "rbac": client.RbacAuthorizationV1Api(api_client),
+        "networking": client.NetworkingV1Api(api_client),
+    }
+
+
 def _kubectl_operation(
     kube_yaml: dict,
     namespace: str,
     name: str,
     operation: str,
+    api_client: Optional[client.ApiClient] = None,
 ):
     """Execute kubectl operation for specific kind of Kubernetes resource."""
-    logger.debug(f"{operation} the following config:\n{yaml.dump(kube_yaml)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"{operation} the following config:\n{yaml.dump(kube_yaml)}")
     kind, _ = _extract_kind_and_name(kube_yaml)
 
     try:
@@ -71,15 +106,7 @@ def _kubectl_operation(
             f"The attempted operation is not supported for this resource. kind: `{kind}`"
         )
 
-    api_client = client.ApiClient()
-    api_group_map = {
-        "apps": client.AppsV1Api(api_client),
-        "batch": client.BatchV1Api(api_client),
-        "core": client.CoreV1Api(api_client),
-        "rbac": client.RbacAuthorizationV1Api(api_client),
-        "networking": client.NetworkingV1Api(api_client),
-    }
-    api = api_group_map[group]
+    api = _typed_apis(api_client or get_api_client())[group]
     method = getattr(api, method_name)
 
     if operation != "create":
@@ -93,18 +120,47 @@ def _kubectl_operation(
     return method()
 
 
-def _kubectl_create(kube_yaml: dict, namespace: str):
-    return _kubectl_operation(kube_yaml, namespace, "", "create")
+def _kubectl_create(kube_yaml: dict, namespace: str, api_client=None):
+    return _kubectl_operation(kube_yaml, namespace, "", "create", api_client)
 
 
-def _kubectl_patch(kube_yaml: dict, namespace: str):
+def _kubectl_patch(kube_yaml: dict, namespace: str, api_client=None):
     _, name = _extract_kind_and_name(kube_yaml)
-    return _kubectl_operation(kube_yaml, namespace, name, "patch")
+    return _kubectl_operation(kube_yaml, namespace, name, "patch", api_client)
 
 
-def _kubectl_replace(kube_yaml: dict, namespace: str):
+def _kubectl_replace(kube_yaml: dict, namespace: str, api_client=None):
     _, name = _extract_kind_and_name(kube_yaml)
-    return _kubectl_operation(kube_yaml, namespace, name, "replace")
+    return _kubectl_operation(kube_yaml, namespace, name, "replace", api_client)
+
+
+def _server_side_apply(kube_yaml: dict, namespace: str, api_client=None) -> dict:
+    """Create or update an object in a single request, like `kubectl apply --server-side`.
+
+    Fields owned by other managers are taken over (`--force-conflicts`), as the
+    same manifests are redeployed run after run.
+    The typed APIs can't send apply patches, so the request is made directly.
+    """
+    kind, name = _extract_kind_and_name(kube_yaml)
+    api_version = kube_yaml.get("apiVersion")
+    if not api_version:
+        raise ValueError(f"YAML missing nessesary attribute 'apiVersion'. yaml: `{kube_yaml}`")
+    prefix = "/apis" if "/" in api_version else "/api"
+    path = f"{prefix}/{api_version}/namespaces/{namespace}/{_KIND_PLURALS[kind]}/{name}"
+
+    return (api_client or get_api_client()).call_api(
+        path,
+        "PATCH",
+        query_params=[("fieldManager", FIELD_MANAGER), ("force", "true")],
+        header_params={
+            "Accept": "application/json",
+            "Content-Type": "application/apply-patch+yaml",
+        },
+        body=kube_yaml,
+        response_type="object",
+        auth_settings=["BearerToken"],
+        _return_http_data_only=True,
+    )
 
 
 def get_namespaced(obj: dict | V1Deployable):
@@ -119,42 +175,44 @@ def kubectl_apply(
     config_file=None,
     dry_run=False,
     exist_ok=False,
+    api_client=None,
 ):
     """Attempts to apply a yaml, similar to the command `kubectl apply`.
 
     Unlike `kubectl apply`, does not track previous resources; thus, does not prune old resources.
+
+    :param api_client: Client to apply with. Defaults to the shared client of `get_api_client`.
     """
     if dry_run:
         _kubectl_apply_dry_run(kube_yaml, namespace, config_file=config_file)
     else:
-        _kubectl_apply(kube_yaml, namespace, exist_ok=exist_ok)
+        _kubectl_apply(kube_yaml, namespace, exist_ok=exist_ok, api_client=api_client)
 
 
-def _kubectl_apply(kube_yaml: yaml.YAMLObject, namespace: str, *, exist_ok=True):
-    """Attempts to apply a yaml.
+def _kubectl_apply(kube_yaml: yaml.YAMLObject, namespace: str, *, exist_ok=True, api_client=None):
+    """Attempts to apply a yaml, in a single request for the kinds of `_KIND_PLURALS`.
 
     :param exists_ok:
-        If True, replaces the deployment if it already.
-        If False, reraises the exception if the deployment already exists."""
-    logger.debug(f"kubectl_apply the following config:\n{str(yaml.dump(kube_yaml))}")
-    kind = kube_yaml.get("kind")
-    name = kube_yaml.get("metadata", {}).get("name")
-    if not kind or not name:
-        raise ValueError(
-            f"YAML missing nessesary attributes 'kind' and 'metadata.name'. yaml: `{kube_yaml}`"
-        )
-
-    api_client = client.ApiClient()
-
-    try:
-        with tempfile.NamedTemporaryFile(mode="w+", suffix=".yaml", delete=False) as temp:
-            yaml.dump(kube_yaml, temp)
-            temp.flush()
-            utils.create_from_yaml(client.ApiClient(), yaml_file=temp.name, namespace=namespace)
-    except FailToCreateError as e:
-        if not (is_already_exists_error(e) and exist_ok):
-            raise
-        _kubectl_patch(kube_yaml, namespace)
+        If True, applies the deployment server-side, updating it if it already exists.
+        If False, creates the deployment, raising an ApiException if it already exists."""
+    if logger.isEnabledFor(logging.DEBUG):
+        # Dumping large manifests costs more than applying them, so only when it's logged.
+        logger.debug(f"kubectl_apply the following config:\n{str(yaml.dump(kube_yaml))}")
+    kind, name = _extract_kind_and_name(kube_yaml)
+    api_client = api_client or get_api_client()
+
+    if kind not in _KIND_PLURALS:
+        # Other kinds go through the generic helper, which finds their API from apiVersion.
+        try:
+            utils.create_from_dict(api_client, kube_yaml, namespace=namespace)
+        except FailToCreateError as e:
+            if not (is_already_exists_error(e) and exist_ok):
+                raise
+            _kubectl_patch(kube_yaml, namespace, api_client)
+    elif exist_ok:
+        _server_side_apply(kube_yaml, namespace, api_client)
+    else:
+        _kubectl_create(kube_yaml, namespace, api_client)
 
 
 def _kubectl_apply_dry_run(kube_yaml: yaml.YAMLObject, namespace: str, *, config_file: str):
@@ -1,11 +1,15 @@
 # Python Imports
-from typing import Optional
+import threading
+from typing import Dict, Optional, Tuple
 
-from kubernetes import client
+from kubernetes import client, config
 from kubernetes.client.models import V1Node
 
 _kube_config = None
 
+_api_clients: Dict[Tuple[Optional[str], Optional[str]], client.ApiClient] = {}
+_api_clients_lock = threading.Lock()
+
 
 def set_config_file(config: str):
     global _kube_config
@@ -16,6 +20,27 @@ def get_config_file() -> Optional[str]:
     return _kube_config
 
 
+def get_api_client(
+    config_file: Optional[str] = None, context: Optional[str] = None
+) -> client.ApiClient:
+    """Shared ApiClient of a kubeconfig file and context, created on first use.
+
+    Every caller reuses its connection pool instead of opening new connections.
+    The config file defaults to the one of `set_config_file`; without either,
+    the client uses the default configuration.
+    """
+    key = (config_file or get_config_file(), context)
+    with _api_clients_lock:
+        if key not in _api_clients:
+            if key == (None, None):
+                _api_clients[key] = client.ApiClient()
+            else:
+                _api_clients[key] = config.new_client_from_config(
+                    config_file=key[0], context=context
+                )
+        return _api_clients[key]
+
+
 def is_local() -> bool:
     """
     Detects if Kubernetes cluster is local.
@@ -1,11 +1,14 @@
 # Python Imports
 import asyncio
 import logging
+import threading
 import time
+import weakref
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Iterable, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-from kubernetes import client
+from kubernetes import client, watch
 from kubernetes.client import (
     ApiClient,
     ApiException,
@@ -16,31 +19,31 @@ from kubernetes.client import (
 )
 
 from src.deployments.core.k8s_deploy import get_namespaced
+from src.deployments.core.k8s_kubeconfig import get_api_client
 from src.deployments.core.k8s_object import V1Deployable, dict_to_k8s_object, k8s_obj_to_dict
 
 logger = logging.getLogger(__name__)
 
 
-def poll_rollout_status(
-    deployment: dict | V1Deployable,
-    *,
-    condition: Callable[[V1Deployable], bool] | None = None,
-) -> Tuple[int, int]:
-    """
-    Poll the rollout status for the given resource.
+# Kinds whose readiness is tracked, and the API and method suffix to read and watch them with.
+_TRACKED_KINDS = {
+    "deployment": ("AppsV1Api", "deployment"),
+    "statefulset": ("AppsV1Api", "stateful_set"),
+    "daemonset": ("AppsV1Api", "daemon_set"),
+    "pod": ("CoreV1Api", "pod"),
+}
+# Kinds that have no rollout status; they are available as soon as they are applied.
+_IMMEDIATELY_READY_KINDS = {"service", "role", "rolebinding", "serviceaccount", "configmap"}
 
-    :condition: Used to determine if the deployment is ready.
-    `condition(obj) -> bool`, should return `True` for ready and `False` for not ready.
-    If `None` and  `kind == StatefulSet`, checks that all pods are updated and ready.
-    If `None` and `kind == Pod`, checks that the pod has a status condition with `("Ready", "True")`.
-    etc.
-    """
-    if isinstance(deployment, dict):
-        deployment = dict_to_k8s_object(deployment, "V1" + deployment["kind"])
-    kind = deployment.kind.lower()
+# Server-side timeout of one watch request. The watch is resumed from the last
+# resourceVersion seen, and stops once nothing waits on its objects anymore.
+WATCH_TIMEOUT_SECONDS = 60
+# Pause before re-opening a watch that failed with anything but an expired resourceVersion.
+WATCH_RETRY_SECONDS = 5
 
-    obj = get_namespaced(deployment)
 
+def _default_condition(kind: str) -> Optional[Callable[[V1Deployable], bool]]:
+    """Readiness check of a kind, or None if the kind is ready as soon as it is applied."""
     if kind == "deployment":
 
         def default_condition(obj: V1Deployment):
@@ -64,7 +67,6 @@ def poll_rollout_status(
     elif kind == "daemonset":
 
         def default_condition(obj: V1DaemonSet):
-            desired = obj.spec.replicas
             desired = obj.status.desired_number_scheduled or 0
             available = obj.status.number_available or 0
             return available == desired
@@ -74,31 +76,267 @@ def poll_rollout_status(
         def default_condition(pod: V1Pod):
             return check_pod_condition(pod)
 
-    elif kind in ["service", "role", "rolebinding", "serviceaccount", "configmap"]:
-        # These deployments don't have a rollout status, they are immediately available
-        return True
+    elif kind in _IMMEDIATELY_READY_KINDS:
+        return None
 
     else:
         raise ValueError(f"Unsupported kind: `{kind}`")
 
+    return default_condition
+
+
+def poll_rollout_status(
+    deployment: dict | V1Deployable,
+    *,
+    condition: Callable[[V1Deployable], bool] | None = None,
+) -> Tuple[int, int]:
+    """
+    Poll the rollout status for the given resource.
+
+    :condition: Used to determine if the deployment is ready.
+    `condition(obj) -> bool`, should return `True` for ready and `False` for not ready.
+    If `None` and  `kind == StatefulSet`, checks that all pods are updated and ready.
+    If `None` and `kind == Pod`, checks that the pod has a status condition with `("Ready", "True")`.
+    etc.
+    """
+    if isinstance(deployment, dict):
+        deployment = dict_to_k8s_object(deployment, "V1" + deployment["kind"])
+    kind = deployment.kind.lower()
+
+    obj = get_namespaced(deployment)
+
+    default_condition = _default_condition(kind)
+    if default_condition is None:
+        # These deployments don't have a rollout status, they are immediately available
+        return True
+
     if condition is None:
         return default_condition(obj)
     return condition(obj)
 
 
+class _Waiter:
+    """A coroutine waiting for one object to satisfy a condition."""
+
+    def __init__(self, condition: Callable[[V1Deployable], bool]):
+        self.condition = condition
+        self.loop = asyncio.get_running_loop()
+        self.ready = self.loop.create_future()
+
+    def check(self, obj: V1Deployable) -> bool:
+        """Evaluate the condition against `obj`, waking the waiter if it holds. Thread-safe."""
+        try:
+            is_ready = self.condition(obj)
+        except Exception as e:
+            logger.warning(f"Readiness check of `{obj.metadata.name}` failed: `{e}`")
+            return False
+        if is_ready:
+            self.loop.call_soon_threadsafe(self._set_ready)
+        return is_ready
+
+    def _set_ready(self):
+        if not self.ready.done():
+            self.ready.set_result(True)
+
+
+class _KindWatch:
+    """One watch stream over all objects of a kind in a namespace, shared by their waiters.
+
+    The stream runs in a daemon thread while anything waits on it, and resumes
+    from the last resourceVersion it saw when the server ends a request.
+    Only a weak reference to the API client is kept, see `get_rollout_tracker`.
+    """
+
+    def __init__(self, api_client: ApiClient, kind: str, namespace: str):
+        self.kind = kind
+        self.namespace = namespace
+        self._api_client = weakref.ref(api_client)
+        self._waiters: Dict[str, List[_Waiter]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._watch: Optional[watch.Watch] = None
+
+    def _method(self, verb: str) -> Callable:
+        """Typed API method `{verb}_namespaced_{kind}`, bound to the API client."""
+        api_client = self._api_client()
+        if api_client is None:
+            raise RuntimeError(f"API client of the {self.kind} watch was garbage collected")
+        api_name, suffix = _TRACKED_KINDS[self.kind]
+        return getattr(getattr(client, api_name)(api_client), f"{verb}_namespaced_{suffix}")
+
+    def read_object(self, name: str, namespace: str) -> V1Deployable:
+        return self._method("read")(name=name, namespace=namespace)
+
+    def add(self, name: str, waiter: _Waiter) -> None:
+        with self._lock:
+            self._waiters[name].append(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"rollout-watch-{self.kind}-{self.namespace}",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def remove(self, name: str, waiter: _Waiter) -> None:
+        with self._lock:
+            self._waiters[name].remove(waiter)
+            if not self._waiters[name]:
+                del self._waiters[name]
+            if not self._waiters and self._watch is not None:
+                self._watch.stop()
+
+    def _waiters_of(self, name: str) -> List[_Waiter]:
+        with self._lock:
+            return list(self._waiters.get(name, []))
+
+    def _keep_running(self) -> bool:
+        with self._lock:
+            if not self._waiters:
+                self._thread = None
+                return False
+            return True
+
+    def _run(self) -> None:
+        resource_version = None
+        while self._keep_running():
+            self._watch = watch.Watch()
+            try:
+                # Without a resourceVersion, the stream starts with the current state of every object.
+                for event in self._watch.stream(
+                    self._method("list"),
+                    namespace=self.namespace,
+                    resource_version=resource_version,
+                    timeout_seconds=WATCH_TIMEOUT_SECONDS,
+                ):
+                    obj = event["object"]
+                    resource_version = obj.metadata.resource_version
+                    if event["type"] in ("ADDED", "MODIFIED"):
+                        for waiter in self._waiters_of(obj.metadata.name):
+                            waiter.check(obj)
+            except ApiException as e:
+                if e.status == 410:
+                    # The resourceVersion expired: start over from the current state.
+                    resource_version = None
+                else:
+                    logger.warning(f"Watch of {self.kind}s in `{self.namespace}` failed: `{e}`")
+                    time.sleep(WATCH_RETRY_SECONDS)
+            except Exception as e:
+                logger.warning(f"Watch of {self.kind}s in `{self.namespace}` failed: `{e}`")
+                time.sleep(WATCH_RETRY_SECONDS)
+
+
+class RolloutTracker:
+    """Waits for the rollout of many objects over a few watch streams.
+
+    Objects of the same kind and namespace share one watch, and readiness
+    events wake the coroutines waiting on them as soon as they arrive.
+    """
+
+    def __init__(self, api_client: ApiClient):
+        # Weak, so the tracker doesn't keep its own key in `_trackers` alive.
+        self._api_client = weakref.ref(api_client)
+        self._watches: Dict[Tuple[str, str], _KindWatch] = {}
+        self._lock = threading.Lock()
+
+    def _watch_for(self, kind: str, namespace: str) -> _KindWatch:
+        with self._lock:
+            key = (kind, namespace)
+            if key not in self._watches:
+                api_client = self._api_client()
+                if api_client is None:
+                    raise RuntimeError("API client of the rollout tracker was garbage collected")
+                self._watches[key] = _KindWatch(api_client, kind, namespace)
+            return self._watches[key]
+
+    async def wait(
+        self,
+        kind: str,
+        name: str,
+        namespace: str,
+        *,
+        timeout: float,
+        resync_interval: float,
+        condition: Optional[Callable[[V1Deployable], bool]] = None,
+    ) -> None:
+        """Wait until the object is ready. Raises TimeoutError if `timeout` seconds pass first.
+
+        The object is also read directly when the wait starts, and every
+        `resync_interval` seconds, in case the watch is unavailable.
+        """
+        kind = kind.lower()
+        default_condition = _default_condition(kind)
+        if default_condition is None:
+            return
+
+        kind_watch = self._watch_for(kind, namespace)
+        waiter = _Waiter(condition or default_condition)
+        # Registered before the first read, so no change can fall between the two.
+        kind_watch.add(name, waiter)
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    obj = await asyncio.to_thread(
+                        kind_watch.read_object, name=name, namespace=namespace
+                    )
+                except ApiException as e:
+                    logger.warning(f"Error fetching `{kind}`: `{e}`")
+                else:
+                    if waiter.check(obj):
+                        return
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Timeout waiting for {kind} `{name}`.")
+                try:
+                    await asyncio.wait_for(
+                        asyncio.shield(waiter.ready), min(remaining, resync_interval)
+                    )
+                    return
+                except asyncio.TimeoutError:
+                    continue
+        finally:
+            kind_watch.remove(name, waiter)
+
+
+_trackers: "weakref.WeakKeyDictionary[ApiClient, RolloutTracker]" = weakref.WeakKeyDictionary()
+_trackers_lock = threading.Lock()
+
+
+def get_rollout_tracker(api_client: Optional[ApiClient] = None) -> RolloutTracker:
+    """The rollout tracker of an API client, shared by every wait that uses the client.
+
+    Trackers and their watches only hold the client weakly, so a tracker is
+    dropped along with its client once no wait uses it. Without a client, the
+    shared default client of `get_api_client` is used, which is never dropped.
+    """
+    api_client = api_client or get_api_client()
+    with _trackers_lock:
+        tracker = _trackers.get(api_client)
+        if tracker is None:
+            tracker = _trackers[api_client] = RolloutTracker(api_client)
+        return tracker
+
+
 async def wait_for_rollout(
     deployment: dict | V1Deployable,
     api_client,
     *,
     timeout: int = 300,
-    polling_interval: int = 8,
+    resync_interval: int = 60,
     condition: Optional[Callable[[V1Deployable], bool]] = None,
 ):
     """
     Wait for a rollout of a Kubernetes workload, or a pod ready condition.
 
+    Readiness is followed with watch streams shared by every wait on `api_client`,
+    see `RolloutTracker`.
+
     :timeout: Timeout in seconds.
 
+    :resync_interval: Seconds between direct reads of the object, in case its watch is unavailable.
+
     :condition: Used to determine if the rollout is done.
     `condition(obj) -> bool`, should return `True` for ready and `False` for not ready.
     If `None` and  `kind == StatefulSet`, checks that all pods are updated and ready.
@@ -114,26 +352,15 @@ async def wait_for_rollout(
 
     logger.info(f"Waiting for {kind} `{name}` in namespace `{namespace}` (timeout: {timeout}s)...")
 
-    start_time = time.time()
-    while True:
-        try:
-            is_ready = poll_rollout_status(deployment, condition=condition)
-        except ApiException as e:
-            logger.warning(f"Error fetching `{kind}`: `{e}`")
-            await asyncio.sleep(polling_interval)
-            continue
-
-        logger.info(f"Waiting for {kind} `{name}`...")
-
-        if is_ready:
-            logger.info(f"{kind} `{name}` is ready")
-            return
-
-        elapsed = time.time() - start_time
-        if elapsed > timeout:
-            raise TimeoutError(f"Timeout waiting for {kind} `{name}`.")
-
-        await asyncio.sleep(polling_interval)
+    await get_rollout_tracker(api_client).wait(
+        kind,
+        name,
+        namespace,
+        timeout=timeout,
+        resync_interval=resync_interval,
+        condition=condition,
+    )
+    logger.info(f"{kind} `{name}` is ready")
 
 
 def label_pods(names: Iterable[str], namespace: str, labels: dict, api_client=None) -> int:
@@ -89,28 +89,168 @@ class TestPollNamespaceHasObjects:
 
 
 # --------------------------------------------------------------------------- #
-# wait_for_no_objs_in_namespace  (loop around poll_namespace_has_objects)
+# wait_for_deletion / wait_for_no_objs_in_namespace  (list, then watch deletions)
 # --------------------------------------------------------------------------- #
-class TestWaitForNoObjsInNamespace:
-    def test_returns_when_namespace_clears(self, mocker):
-        poll = mocker.patch.object(
-            k8s_cleanup, "poll_namespace_has_objects", side_effect=[True, False]
-        )
-        sleep = mocker.patch.object(k8s_cleanup.time, "sleep")
+def _obj(name, finalizers=None, deleting=False):
+    obj = MagicMock()
+    obj.metadata.name = name
+    obj.metadata.resource_version = "2"
+    obj.metadata.finalizers = finalizers
+    obj.metadata.deletion_timestamp = "2026-01-01T00:00:00Z" if deleting else None
+    return obj
+
+
+def _listing(items):
+    r = _list_result(items)
+    r.metadata.resource_version = "1"
+    return r
+
+
+class _FakeWatch:
+    """Stands in for `watch.Watch`, each stream yielding the next queued list of events."""
+
+    streams = []
+
+    def __init__(self):
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
 
-        wait_for_no_objs_in_namespace("ns", api_client=MagicMock())
+    def stream(self, func, *args, **kwargs):
+        for event in _FakeWatch.streams.pop(0) if _FakeWatch.streams else []:
+            if self.stopped:
+                return
+            if isinstance(event, Exception):
+                raise event
+            yield event
 
-        assert poll.call_count == 2
-        sleep.assert_called_once()
 
-    def test_timeout_raises(self, mocker):
-        mocker.patch.object(k8s_cleanup, "poll_namespace_has_objects", return_value=True)
+class TestWaitForDeletion:
+    @pytest.fixture
+    def apps(self, mocker):
+        apps = MagicMock()
+        mocker.patch.object(k8s_cleanup.client, "AppsV1Api", return_value=apps)
+        mocker.patch.object(k8s_cleanup.watch, "Watch", _FakeWatch)
         mocker.patch.object(k8s_cleanup.time, "sleep")
+        _FakeWatch.streams = []
+        return apps
+
+    def test_returns_once_every_object_is_deleted(self, apps):
+        apps.list_namespaced_stateful_set.return_value = _listing([_obj("s0"), _obj("s1")])
+        _FakeWatch.streams = [
+            [
+                {"type": "DELETED", "object": _obj("s0")},
+                {"type": "DELETED", "object": _obj("s1")},
+                {"type": "ADDED", "object": _obj("late")},
+            ]
+        ]
+
+        k8s_cleanup.wait_for_deletion("ns", MagicMock(), ["StatefulSet"], timeout=10)
+
+        apps.list_namespaced_stateful_set.assert_called_once_with("ns")
+
+    def test_only_named_objects_are_waited_for(self, apps):
+        apps.list_namespaced_stateful_set.return_value = _listing([_obj("s0"), _obj("other")])
+        _FakeWatch.streams = [[{"type": "DELETED", "object": _obj("s0")}]]
+
+        k8s_cleanup.wait_for_deletion(
+            "ns",
+            MagicMock(),
+            ["StatefulSet"],
+            label_selector="10ksim/run=abc",
+            names={"StatefulSet": ["s0"]},
+            timeout=10,
+        )
+
+        apps.list_namespaced_stateful_set.assert_called_once_with(
+            "ns", label_selector="10ksim/run=abc"
+        )
+
+    def test_relists_after_expired_resource_version(self, apps):
+        apps.list_namespaced_stateful_set.side_effect = [
+            _listing([_obj("s0")]),
+            _listing([]),
+        ]
+        _FakeWatch.streams = [[ApiException(status=410)]]
+
+        k8s_cleanup.wait_for_deletion("ns", MagicMock(), ["StatefulSet"], timeout=10)
+
+        assert apps.list_namespaced_stateful_set.call_count == 2
+
+    def test_timeout_names_the_stuck_objects(self, apps):
+        apps.list_namespaced_stateful_set.return_value = _listing(
+            [_obj("s0", finalizers=["example.com/hold"], deleting=True)]
+        )
+
+        with pytest.raises(TimeoutError, match="s0.*example.com/hold"):
+            k8s_cleanup.wait_for_deletion("ns", MagicMock(), ["StatefulSet"], timeout=-1)
+
+    def test_wait_for_no_objs_checks_the_default_types(self, mocker):
+        wait = mocker.patch.object(k8s_cleanup, "wait_for_deletion")
+        api_client = MagicMock()
+
+        wait_for_no_objs_in_namespace("ns", api_client=api_client)
+
+        wait.assert_called_once_with(
+            "ns", api_client, k8s_cleanup.DEFAULT_NAMESPACE_CHECK_TYPES, timeout=300
+        )
 
-        with pytest.raises(TimeoutError):
+    def test_wait_for_no_objs_timeout_raises(self, mocker):
+        mocker.patch.object(k8s_cleanup, "wait_for_deletion", side_effect=TimeoutError("stuck"))
+
+        with pytest.raises(TimeoutError, match="empty"):
             wait_for_no_objs_in_namespace("ns", timeout=-1, api_client=MagicMock())
 
 
+# --------------------------------------------------------------------------- #
+# delete_by_label / get_cleanup  (one deletecollection request per kind)
+# --------------------------------------------------------------------------- #
+class TestDeleteByLabel:
+    def test_one_foreground_request_per_kind_controllers_first(self, mocker):
+        manager = MagicMock()
+        apps = MagicMock()
+        core = MagicMock()
+        manager.attach_mock(apps, "apps")
+        manager.attach_mock(core, "core")
+        mocker.patch.object(k8s_cleanup.client, "AppsV1Api", return_value=apps)
+        mocker.patch.object(k8s_cleanup.client, "CoreV1Api", return_value=core)
+
+        k8s_cleanup.delete_by_label("ns", MagicMock(), "10ksim/run=abc", ["Service", "StatefulSet"])
+
+        names = [c[0] for c in manager.mock_calls]
+        assert names == [
+            "apps.delete_collection_namespaced_stateful_set",
+            "core.delete_collection_namespaced_service",
+        ]
+        kwargs = apps.delete_collection_namespaced_stateful_set.call_args.kwargs
+        assert kwargs["label_selector"] == "10ksim/run=abc"
+        assert kwargs["body"].propagation_policy == "Foreground"
+
+    def test_api_exception_does_not_stop_other_kinds(self, mocker):
+        apps = MagicMock()
+        apps.delete_collection_namespaced_stateful_set.side_effect = ApiException(status=403)
+        mocker.patch.object(k8s_cleanup.client, "AppsV1Api", return_value=apps)
+
+        k8s_cleanup.delete_by_label("ns", MagicMock(), "l=v", ["StatefulSet", "Deployment"])
+
+        apps.delete_collection_namespaced_deployment.assert_called_once()
+
+    def test_cleanup_reads_deployments_when_run(self, mocker):
+        delete = mocker.patch.object(k8s_cleanup, "delete_by_label")
+        wait = mocker.patch.object(k8s_cleanup, "wait_for_deletion")
+        deployments = []
+        cleanup = k8s_cleanup.get_cleanup(MagicMock(), "ns", deployments, label_selector="l=v")
+
+        deployments.append({"kind": "StatefulSet", "metadata": {"name": "nodes"}})
+        cleanup()
+
+        resources = delete.call_args.args[3]
+        assert resources["StatefulSet"] == ["nodes"]
+        assert wait.call_args.kwargs["names"] is resources
+        assert wait.call_args.kwargs["label_selector"] == "l=v"
+
+
 # --------------------------------------------------------------------------- #
 # cleanup_resources  (deletes resources via k8s client)
 # --------------------------------------------------------------------------- #
@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.deployments.core import k8s_deploy, k8s_kubeconfig
+from src.deployments.core.k8s_deploy import kubectl_apply
+
+
+def _statefulset():
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "StatefulSet",
+        "metadata": {"name": "nodes", "namespace": "ns"},
+        "spec": {"replicas": 3},
+    }
+
+
+# --------------------------------------------------------------------------- #
+# kubectl_apply  (in-memory objects, one request each)
+# --------------------------------------------------------------------------- #
+class TestKubectlApply:
+    def test_exist_ok_applies_server_side_in_one_request(self):
+        api_client = MagicMock()
+
+        kubectl_apply(_statefulset(), "ns", exist_ok=True, api_client=api_client)
+
+        api_client.call_api.assert_called_once()
+        path, method = api_client.call_api.call_args.args
+        kwargs = api_client.call_api.call_args.kwargs
+        assert (path, method) == ("/apis/apps/v1/namespaces/ns/statefulsets/nodes", "PATCH")
+        assert kwargs["header_params"]["Content-Type"] == "application/apply-patch+yaml"
+        assert ("fieldManager", k8s_deploy.FIELD_MANAGER) in kwargs["query_params"]
+        assert kwargs["body"] == _statefulset()
+
+    def test_core_kinds_use_the_core_api_path(self):
+        api_client = MagicMock()
+        service = {"apiVersion": "v1", "kind": "Service", "metadata": {"name": "svc"}}
+
+        kubectl_apply(service, "ns", exist_ok=True, api_client=api_client)
+
+        assert api_client.call_api.call_args.args[0] == "/api/v1/namespaces/ns/services/svc"
+
+    def test_without_exist_ok_creates(self, mocker):
+        api_client = MagicMock()
+        apps_api = MagicMock()
+        mocker.patch.object(k8s_deploy, "_typed_apis", return_value={"apps": apps_api})
+
+        kubectl_apply(_statefulset(), "ns", api_client=api_client)
+
+        apps_api.create_namespaced_stateful_set.assert_called_once_with(
+            body=_statefulset(), namespace="ns"
+        )
+        api_client.call_api.assert_not_called()
+
+    def test_missing_api_version_raises(self):
+        deployment = _statefulset()
+        del deployment["apiVersion"]
+
+        with pytest.raises(ValueError, match="apiVersion"):
+            kubectl_apply(deployment, "ns", exist_ok=True, api_client=MagicMock())
+
+
+class TestGetApiClient:
+    def test_client_is_shared_per_config_and_context(self, mocker):
+        mocker.patch.dict(k8s_kubeconfig._api_clients, clear=True)
+        new_client = mocker.patch.object(
+            k8s_kubeconfig.config, "new_client_from_config", side_effect=lambda **_: MagicMock()
+        )
+
+        first = k8s_kubeconfig.get_api_client("kubeconfig", "ctx")
+
+        assert k8s_kubeconfig.get_api_client("kubeconfig", "ctx") is first
+        assert k8s_kubeconfig.get_api_client("kubeconfig", "other") is not first
+        assert new_client.call_count == 2
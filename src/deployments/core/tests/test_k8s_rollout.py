@@ -1,6 +1,11 @@
-from unittest.mock import AsyncMock, MagicMock
+import asyncio
+import gc
+import time
+import weakref
+from unittest.mock import MagicMock
 
 import pytest
+from kubernetes.client import ApiClient
 from kubernetes.client.rest import ApiException
 
 from src.deployments.core import k8s_rollout
@@ -125,50 +130,135 @@ class TestPollRolloutStatus:
 
 
 # --------------------------------------------------------------------------- #
-# wait_for_rollout  (loop around poll_rollout_status)
+# wait_for_rollout  (watch streams shared through RolloutTracker)
 # --------------------------------------------------------------------------- #
+class _FakeWatch:
+    """Stands in for kubernetes.watch.Watch, streaming the events queued on the class."""
+
+    events = []
+    calls = []
+
+    def stream(self, func, **kwargs):
+        _FakeWatch.calls.append(kwargs)
+        while _FakeWatch.events:
+            yield _FakeWatch.events.pop(0)
+        time.sleep(0.01)
+
+    def stop(self):
+        pass
+
+
 class TestWaitForRollout:
     @pytest.fixture
     def deployment(self):
         return {"metadata": {"namespace": "ns", "name": "x"}, "kind": "StatefulSet"}
 
-    async def test_returns_once_ready(self, mocker, deployment):
-        mocker.patch.object(k8s_rollout, "k8s_obj_to_dict", return_value=deployment)
-        mocker.patch.object(k8s_rollout, "poll_rollout_status", return_value=True)
-        sleep = mocker.patch.object(k8s_rollout.asyncio, "sleep", new_callable=AsyncMock)
+    @pytest.fixture
+    def apps_api(self, mocker):
+        _FakeWatch.events = []
+        _FakeWatch.calls = []
+        mocker.patch.object(k8s_rollout.watch, "Watch", _FakeWatch)
+        api = MagicMock()
+        mocker.patch.object(k8s_rollout.client, "AppsV1Api", return_value=api)
+        return api
+
+    @staticmethod
+    def _event(obj, name="x", resource_version="1"):
+        obj.metadata.name = name
+        obj.metadata.resource_version = resource_version
+        return {"type": "MODIFIED", "object": obj}
+
+    async def test_returns_when_already_ready(self, apps_api, deployment):
+        apps_api.read_namespaced_stateful_set.return_value = _statefulset(desired=3, ready=3)
 
         await wait_for_rollout(deployment, api_client=MagicMock())
 
-        sleep.assert_not_called()
+        apps_api.read_namespaced_stateful_set.assert_called_once_with(name="x", namespace="ns")
 
-    async def test_polls_until_ready(self, mocker, deployment):
-        mocker.patch.object(k8s_rollout, "k8s_obj_to_dict", return_value=deployment)
-        poll = mocker.patch.object(
-            k8s_rollout, "poll_rollout_status", side_effect=[False, False, True]
-        )
-        sleep = mocker.patch.object(k8s_rollout.asyncio, "sleep", new_callable=AsyncMock)
+    async def test_ready_event_wakes_waiter_without_polling(self, apps_api, deployment):
+        apps_api.read_namespaced_stateful_set.return_value = _statefulset(desired=3, ready=1)
+        _FakeWatch.events = [self._event(_statefulset(desired=3, ready=3))]
 
-        await wait_for_rollout(deployment, api_client=MagicMock())
+        await wait_for_rollout(deployment, api_client=MagicMock(), timeout=5, resync_interval=5)
+
+        assert apps_api.read_namespaced_stateful_set.call_count == 1
+
+    async def test_objects_of_a_kind_share_one_watch(self, apps_api):
+        api_client = MagicMock()
+        apps_api.read_namespaced_stateful_set.return_value = _statefulset(desired=3, ready=1)
+
+        async def roll_out():
+            await asyncio.sleep(0.1)
+            _FakeWatch.events.extend(
+                self._event(_statefulset(desired=3, ready=3), name=name, resource_version=str(i))
+                for i, name in enumerate(["a", "b", "c"])
+            )
+
+        waits = [
+            wait_for_rollout(
+                {"metadata": {"namespace": "ns", "name": name}, "kind": "StatefulSet"},
+                api_client,
+                timeout=5,
+                resync_interval=5,
+            )
+            for name in ["a", "b", "c"]
+        ]
 
-        assert poll.call_count == 3
-        assert sleep.call_count == 2
+        await asyncio.gather(roll_out(), *waits)
 
-    async def test_timeout_raises(self, mocker, deployment):
-        mocker.patch.object(k8s_rollout, "k8s_obj_to_dict", return_value=deployment)
-        mocker.patch.object(k8s_rollout, "poll_rollout_status", return_value=False)
-        mocker.patch.object(k8s_rollout.asyncio, "sleep", new_callable=AsyncMock)
+        tracker = k8s_rollout.get_rollout_tracker(api_client)
+        assert list(tracker._watches) == [("statefulset", "ns")]
+
+    async def test_timeout_raises(self, apps_api, deployment):
+        apps_api.read_namespaced_stateful_set.return_value = _statefulset(desired=3, ready=1)
 
         with pytest.raises(TimeoutError):
             await wait_for_rollout(deployment, api_client=MagicMock(), timeout=-1)
 
-    async def test_api_exception_is_retried(self, mocker, deployment):
-        mocker.patch.object(k8s_rollout, "k8s_obj_to_dict", return_value=deployment)
-        poll = mocker.patch.object(
-            k8s_rollout, "poll_rollout_status", side_effect=[ApiException(), True]
+    async def test_api_exception_is_retried(self, apps_api, deployment):
+        apps_api.read_namespaced_stateful_set.side_effect = [
+            ApiException(),
+            _statefulset(desired=3, ready=3),
+        ]
+
+        await wait_for_rollout(deployment, api_client=MagicMock(), resync_interval=0)
+
+        assert apps_api.read_namespaced_stateful_set.call_count == 2
+
+    async def test_kinds_without_rollout_return_immediately(self, apps_api):
+        service = {"metadata": {"namespace": "ns", "name": "svc"}, "kind": "Service"}
+
+        await wait_for_rollout(service, api_client=MagicMock())
+
+        assert _FakeWatch.calls == []
+
+    async def test_tracker_is_dropped_with_its_client(self, mocker, deployment):
+        mocker.patch.object(k8s_rollout.watch, "Watch", _FakeWatch)
+        mocker.patch.object(
+            k8s_rollout.client.AppsV1Api,
+            "read_namespaced_stateful_set",
+            return_value=_statefulset(desired=3, ready=3),
         )
-        sleep = mocker.patch.object(k8s_rollout.asyncio, "sleep", new_callable=AsyncMock)
+        api_client = ApiClient()
+        await wait_for_rollout(deployment, api_client=api_client)
+        tracker = weakref.ref(k8s_rollout.get_rollout_tracker(api_client))
 
-        await wait_for_rollout(deployment, api_client=MagicMock())
+        del api_client
+        for _ in range(50):
+            gc.collect()
+            if tracker() is None:
+                break
+            await asyncio.sleep(0.02)
+
+        assert tracker() is None
+
+    async def test_without_a_client_the_shared_default_client_is_used(self, apps_api, deployment):
+        apps_api.read_namespaced_stateful_set.return_value = _statefulset(desired=3, ready=3)
+        tracker = k8s_rollout.get_rollout_tracker(None)
+        gc.collect()
+
+        await tracker.wait("StatefulSet", "x", "ns", timeout=1, resync_interval=1)
+        await wait_for_rollout(deployment, None)
 
-        assert poll.call_count == 2
-        sleep.assert_awaited_once()
+        assert k8s_rollout.get_rollout_tracker() is tracker
+        assert apps_api.read_namespaced_stateful_set.call_count == 2
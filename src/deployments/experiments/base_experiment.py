@@ -4,12 +4,16 @@ import json
 import logging
 import os
 import random
+import time
+import uuid
 from abc import ABC, abstractmethod
 from argparse import ArgumentParser
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import ExitStack
 from copy import deepcopy
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from typing import Any, ClassVar, Dict, Generic, List, Literal, Optional, TypeVar, Union
 
@@ -37,6 +41,7 @@ from src.analysis.post_run_analysis import run_post_analysis
 from src.analysis.utils.log_utils import log_to_path
 from src.deployments.core.base_bridge import BaseBridge
 from src.deployments.core.k8s_cleanup import (
+    RUN_LABEL,
     get_cleanup,
     poll_namespace_has_objects,
     wait_for_no_objs_in_namespace,
@@ -69,6 +74,13 @@ V1Deployable = Union[
 
 logger = logging.getLogger(__name__)
 
+# Blocking Kubernetes API calls of `deploy` run on these threads, so the objects
+# of a phase are applied concurrently without blocking the event loop.
+DEPLOY_API_WORKERS = 16
+_deploy_executor = ThreadPoolExecutor(
+    max_workers=DEPLOY_API_WORKERS, thread_name_prefix="deploy-api"
+)
+
 
 class ExperimentFailed(Exception):
     """The run completed but its result is not usable."""
@@ -120,6 +132,9 @@ class BaseExperiment(ABC, BaseModel, Generic[TCfg]):
 
     Used to determine whether or not to call `_wait_until_clear`."""
 
+    _run_id: Optional[str] = PrivateAttr(default=None)
+    """Value of the `RUN_LABEL` label on every object deployed by the current run."""
+
     _workdir: Optional[Path] = None
     """Path to deployment output folder. Based off of self.output_folder"""
     _stack: Optional[ExitStack]
@@ -197,6 +212,13 @@ class BaseExperiment(ABC, BaseModel, Generic[TCfg]):
         timeout=3600,
         strategy: Literal["parallel", "serial"] = "parallel",
     ):
+        """Apply deployments in phases: base objects (accounts, roles, configs, services) first.
+
+        With the "parallel" strategy, the objects of a phase are applied and waited
+        for concurrently, bounded by DEPLOY_API_WORKERS, so a phase takes about as
+        long as its slowest object.
+        """
+
         async def deploy_one(dep):
             await self._deploy(
                 deployment=dep, wait_for_ready=wait_for_ready, exist_ok=exist_ok, timeout=timeout
@@ -243,6 +265,9 @@ class BaseExperiment(ABC, BaseModel, Generic[TCfg]):
         exist_ok: bool = False,
         timeout=3600,
     ):
+        if self._run_id:
+            metadata = deployment_yaml["metadata"]
+            metadata["labels"] = {**(metadata.get("labels") or {}), RUN_LABEL: self._run_id}
         self.dump_yaml(deployment_yaml)
 
         namespace = deployment_yaml["metadata"]["namespace"]
@@ -252,13 +277,15 @@ class BaseExperiment(ABC, BaseModel, Generic[TCfg]):
                 skip_check=self.skip_check,
             )
 
-        if not self.dry_run:
-            cleanup = get_cleanup(
-                api_client=self.api_client,
-                namespace=namespace,
-                deployments=[deployment_yaml],
-            )
-            self._stack.callback(cleanup)
+            if not self.dry_run:
+                # One cleanup per namespace, deleting everything the run deploys there.
+                cleanup = get_cleanup(
+                    api_client=self.api_client,
+                    namespace=namespace,
+                    deployments=self._deployed[namespace],
+                    label_selector=f"{RUN_LABEL}={self._run_id}" if self._run_id else None,
+                )
+                self._stack.callback(cleanup)
 
         deployment_metadata = {
             "event": "deployment",
@@ -271,12 +298,25 @@ class BaseExperiment(ABC, BaseModel, Generic[TCfg]):
 
         self.log_event({"phase": "start", **deployment_metadata})
         self._deployed[namespace].append(deployment_yaml)
-        kubectl_apply(deployment_yaml, namespace=namespace, dry_run=self.dry_run, exist_ok=exist_ok)
+        start = time.monotonic()
+        await asyncio.get_running_loop().run_in_executor(
+            _deploy_executor,
+            partial(
+                kubectl_apply,
+                deployment_yaml,
+                namespace=namespace,
+                dry_run=self.dry_run,
+                exist_ok=exist_ok,
+                api_client=self.api_client,
+            ),
+        )
+        latencies = {"apply_seconds": round(time.monotonic() - start, 3)}
 
         if not self.dry_run:
             if wait_for_ready:
                 await wait_for_rollout(deployment_yaml, self.api_client, timeout=timeout)
-        self.log_event({"phase": "finished", **deployment_metadata})
+                latencies["ready_seconds"] = round(time.monotonic() - start, 3)
+        self.log_event({"phase": "finished", **deployment_metadata, **latencies})
 
         return deployment_yaml
 
@@ -349,6 +389,7 @@ class BaseExperiment(ABC, BaseModel, Generic[TCfg]):
 
     async def run(self, *, run_post_analysis: bool = True):
         self._deployed.clear()
+        self._run_id = uuid.uuid4().hex
         self._setup_log_paths()
         self._dump_initial_metadata()
 
@@ -2,7 +2,7 @@ import asyncio
 import logging
 import random
 import traceback
-from typing import ClassVar, Literal
+from typing import ClassVar, Literal, Optional
 
 from kubernetes.client import V1Probe, V1ServicePort, V1StatefulSet, V1TCPSocketAction
 from pydantic import BaseModel, ConfigDict, Field, NonNegativeFloat, NonNegativeInt, model_validator
@@ -18,7 +18,11 @@ from src.deployments.libp2p.builders.helpers import readiness_probe_metrics
 from src.deployments.pod_api_requester.builder import PodApiRequesterBuilder
 from src.deployments.pod_api_requester.configs import Target
 from src.deployments.pod_api_requester.nimlibp2p import libp2p_dst_node_publish
-from src.deployments.pod_api_requester.pod_api_requester import PodApiApplicationError, PodApiError
+from src.deployments.pod_api_requester.pod_api_requester import (
+    PodApiApplicationError,
+    PodApiError,
+    PodApiRequesterClient,
+)
 from src.deployments.registry import experiment
 
 logger = logging.getLogger(__name__)
@@ -167,7 +171,9 @@ def build_bootstrap_nodes(namespace: str, params: ExpConfig) -> V1StatefulSet:
     )
 
 
-async def publish(config, namespace, random_name) -> bool:
+async def publish(
+    config, namespace, random_name, requester: Optional[PodApiRequesterClient] = None
+) -> bool:
     """Publish one message. Returns whether it reached the node."""
     try:
         target = Target(
@@ -177,7 +183,10 @@ async def publish(config, namespace, random_name) -> bool:
             port=8645,
         )
         await libp2p_dst_node_publish(
-            namespace=namespace, target=target, msg_size_bytes=config.message_size_bytes
+            namespace=namespace,
+            target=target,
+            msg_size_bytes=config.message_size_bytes,
+            requester=requester,
         )
         return True
     except PodApiApplicationError as e:
@@ -269,14 +278,19 @@ class NimLibp2pExperiment(BaseExperiment[ExpConfig]):
 
         mid_run = asyncio.create_task(self._mid_run(nodes))
 
-        tasks = []
-        for msg_index in range(self.config.num_messages):
-            index = random.randint(0, self._publishable_nodes() - 1)
-            random_name = f"{name}-{index}"
-            self.log_event({"event": "publish", "node": random_name, "index": msg_index})
-            tasks.append(asyncio.create_task(publish(self.config, namespace, random_name)))
-            await asyncio.sleep(self.config.delay_after_publish)
-        published = await asyncio.gather(*tasks)
+        # One client for the whole loop: the publisher endpoint is resolved once and
+        # every message reuses its connections.
+        async with PodApiRequesterClient() as requester:
+            tasks = []
+            for msg_index in range(self.config.num_messages):
+                index = random.randint(0, self._publishable_nodes() - 1)
+                random_name = f"{name}-{index}"
+                self.log_event({"event": "publish", "node": random_name, "index": msg_index})
+                tasks.append(
+                    asyncio.create_task(publish(self.config, namespace, random_name, requester))
+                )
+                await asyncio.sleep(self.config.delay_after_publish)
+            published = await asyncio.gather(*tasks)
         failed = published.count(False)
         self.log_event({"event": "publish_summary", "attempted": len(published), "failed": failed})
 
@@ -1,13 +1,16 @@
 import json
 import sys
+import threading
+from contextlib import ExitStack
 from types import ModuleType
 from typing import ClassVar
 from unittest.mock import AsyncMock, Mock
 
 import pytest
-from kubernetes.client import ApiClient
+from kubernetes.client import ApiClient, V1ObjectMeta, V1Pod
 from pydantic import BaseModel
 
+from src.deployments.core.k8s_cleanup import RUN_LABEL
 from src.deployments.experiments.base_experiment import BaseExperiment
 
 
@@ -128,6 +131,78 @@ async def test_deploy_flattens_input_shapes(deployments, expected):
     assert kinds == expected
 
 
+@pytest.mark.asyncio
+async def test_parallel_deploy_applies_a_phase_concurrently(tmp_path, monkeypatch):
+    exp = DummyExperiment.model_construct(
+        api_client=ApiClient(),
+        config=DummyCfg(),
+        namespace="ns",
+        dry_run=True,
+        skip_check=True,
+        events_log_path=tmp_path / "events.log",
+    )
+    exp._workdir = tmp_path
+    exp._deployed.clear()
+    monkeypatch.setattr(
+        "src.deployments.experiments.base_experiment.poll_namespace_has_objects",
+        Mock(return_value=True),
+    )
+    # Each apply blocks until the other one runs, so a serial deploy would time out.
+    both_applying = threading.Barrier(2, timeout=5)
+    monkeypatch.setattr(
+        "src.deployments.experiments.base_experiment.kubectl_apply",
+        lambda *args, **kwargs: both_applying.wait(),
+    )
+    items = [
+        V1Pod(api_version="v1", kind="Pod", metadata=V1ObjectMeta(name=name, namespace="ns"))
+        for name in ["pod1", "pod2"]
+    ]
+
+    await exp.deploy(items, strategy="parallel", timeout=1)
+
+    events = [json.loads(line) for line in exp.events_log_path.read_text().splitlines()]
+    finished = [e for e in events if e.get("phase") == "finished"]
+    assert sorted(e["name"] for e in finished) == ["pod1", "pod2"]
+    assert all(e["apply_seconds"] >= 0 for e in finished)
+
+
+@pytest.mark.asyncio
+async def test_deploy_labels_objects_and_registers_one_cleanup_per_namespace(tmp_path, monkeypatch):
+    exp = DummyExperiment.model_construct(
+        api_client=ApiClient(),
+        config=DummyCfg(),
+        namespace="ns",
+        dry_run=False,
+        skip_check=True,
+        events_log_path=tmp_path / "events.log",
+    )
+    exp._workdir = tmp_path
+    exp._deployed.clear()
+    exp._run_id = "abc"
+    exp._stack = ExitStack()
+    monkeypatch.setattr(
+        "src.deployments.experiments.base_experiment.poll_namespace_has_objects",
+        Mock(return_value=True),
+    )
+    apply = Mock()
+    monkeypatch.setattr("src.deployments.experiments.base_experiment.kubectl_apply", apply)
+    get_cleanup = Mock()
+    monkeypatch.setattr("src.deployments.experiments.base_experiment.get_cleanup", get_cleanup)
+    items = [
+        V1Pod(api_version="v1", kind="Pod", metadata=V1ObjectMeta(name=name, namespace="ns"))
+        for name in ["pod1", "pod2"]
+    ]
+
+    await exp.deploy(items, wait_for_ready=False)
+
+    assert all(
+        call.args[0]["metadata"]["labels"] == {RUN_LABEL: "abc"} for call in apply.call_args_list
+    )
+    get_cleanup.assert_called_once()
+    assert get_cleanup.call_args.kwargs["label_selector"] == f"{RUN_LABEL}=abc"
+    assert len(get_cleanup.call_args.kwargs["deployments"]) == 2
+
+
 @pytest.mark.asyncio
 async def test_run_writes_final_metadata_before_configured_post_analysis(tmp_path, monkeypatch):
     observed = {}
@@ -1,10 +1,15 @@
 import logging
-from typing import Union
+from typing import Optional, Union
 
 from pydantic import NonNegativeInt
 
 from src.deployments.pod_api_requester.configs import Endpoint, Target
-from src.deployments.pod_api_requester.pod_api_requester import _DEFAULTS, pod_api_request, wrap_arg
+from src.deployments.pod_api_requester.pod_api_requester import (
+    _DEFAULTS,
+    PodApiRequesterClient,
+    pod_api_request,
+    wrap_arg,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +20,7 @@ async def libp2p_dst_node_publish(
     *,
     topic: str = "test",
     msg_size_bytes: NonNegativeInt = 1,
+    requester: Optional[PodApiRequesterClient] = None,
 ) -> dict:
     endpoint = Endpoint(
         name="nimlibp2p_message",
@@ -33,4 +39,5 @@ async def libp2p_dst_node_publish(
             "target": wrap_arg(target),
             "endpoint": wrap_arg(endpoint),
         },
+        requester=requester,
     )
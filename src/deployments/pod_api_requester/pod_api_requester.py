@@ -124,21 +124,36 @@ aiohttp's default is 300s and its connector pool holds 100 sockets, so requests
 that are gone hold their slots long enough to starve a publish loop rather than failing.
 """
 
+CONNECTION_LIMIT = 100
+"""Default cap on the open connections of a `PodApiRequesterClient`."""
 
-async def post_async(url, data, timeout_s: float = REQUEST_TIMEOUT_S):
+CONNECTION_LIMIT_PER_HOST = 0
+"""Default cap per host, 0 meaning none. Requests all go to the same requester endpoint."""
+
+
+async def post_async(
+    url,
+    data,
+    timeout_s: float = REQUEST_TIMEOUT_S,
+    session: Optional[aiohttp.ClientSession] = None,
+):
     """Execute an async POST request.
 
-    :param data: JSON data for the request."""
+    :param data: JSON data for the request.
+    :param session: Session to send the request on. If None, one is opened for it."""
     timeout = aiohttp.ClientTimeout(total=timeout_s)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.post(url, json=data) as response:
-            text = await response.text()
-            return PodResponse(
-                status_code=response.status,
-                reason=response.reason,
-                text=text,
-                headers=dict(response.headers),
-            )
+    if session is None:
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            return await post_async(url, data, timeout_s, session)
+
+    async with session.post(url, json=data, timeout=timeout) as response:
+        text = await response.text()
+        return PodResponse(
+            status_code=response.status,
+            reason=response.reason,
+            text=text,
+            headers=dict(response.headers),
+        )
 
 
 def _get_api_requester_info(
@@ -179,6 +194,127 @@ def _get_api_requester_info(
     return target_ip, node_port
 
 
+class PodApiRequesterClient:
+    """Makes requests through pod-api-requester, reusing its endpoint and connections.
+
+    The endpoint of a requester pod is resolved once, and forgotten when a request to it
+    fails, e.g. after the pod restarted elsewhere or its service was redeployed.
+    Requests share one keep-alive session, closed by `close` or on leaving `async with`.
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: NonNegativeInt = CONNECTION_LIMIT,
+        limit_per_host: NonNegativeInt = CONNECTION_LIMIT_PER_HOST,
+        timeout_s: float = REQUEST_TIMEOUT_S,
+    ):
+        """
+        :param limit: Most connections open at once, 0 meaning no limit.
+        :param limit_per_host: Most connections open at once to one host, 0 meaning no limit.
+        :param timeout_s: Cap on one request.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout_s = timeout_s
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._endpoints: Dict[tuple, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "PodApiRequesterClient":
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit, limit_per_host=self.limit_per_host
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout_s),
+            )
+        return self._session
+
+    async def endpoint(
+        self,
+        namespace: str,
+        service_name: str,
+        app: str,
+        *,
+        publisher_pod: str | NonNegativeInt = 0,
+    ) -> Tuple[str, str]:
+        """Target IP and node port of the requester pod, resolved once for concurrent callers."""
+        key = (namespace, service_name, app, publisher_pod)
+        resolving = self._endpoints.get(key)
+        if resolving is None:
+            resolving = asyncio.ensure_future(
+                asyncio.to_thread(
+                    _get_api_requester_info,
+                    namespace=namespace,
+                    service_name=service_name,
+                    app=app,
+                    publisher_pod=publisher_pod,
+                )
+            )
+            self._endpoints[key] = resolving
+        try:
+            return await asyncio.shield(resolving)
+        except Exception:
+            self._forget(key, resolving)
+            raise
+
+    def _forget(self, key: tuple, resolving: asyncio.Future):
+        if self._endpoints.get(key) is resolving:
+            del self._endpoints[key]
+
+    async def request(
+        self,
+        namespace: str,
+        service_name: str,
+        app: str,
+        url_template: str,
+        data: dict,
+        *,
+        publisher_pod: str | NonNegativeInt = 0,
+    ) -> dict:
+        """See `pod_api_request`."""
+        key = (namespace, service_name, app, publisher_pod)
+        for attempt in range(2):
+            target_ip, node_port = await self.endpoint(
+                namespace, service_name, app, publisher_pod=publisher_pod
+            )
+            resolving = self._endpoints.get(key)
+            url = url_template.format(target_ip=target_ip, node_port=node_port)
+
+            logger.info(f"publishing message. url: `{url}` data: `{data}`")
+            try:
+                response = await post_async(url, data, self.timeout_s, self._get_session())
+                break
+            except aiohttp.ClientConnectorError as e:
+                # Nothing was sent, so the request is retried once against a fresh endpoint.
+                self._forget(key, resolving)
+                if attempt == 0:
+                    logger.warning(f"pod-api-requester unreachable at `{url}`, re-resolving.")
+                    continue
+                raise PodApiClientError("Failed to make the request to pod-api-requester.") from e
+            except asyncio.TimeoutError as e:
+                self._forget(key, resolving)
+                raise PodApiClientError(
+                    f"pod-api-requester did not answer within {self.timeout_s}s."
+                ) from e
+            except aiohttp.ClientError as e:
+                self._forget(key, resolving)
+                raise PodApiClientError("Failed to make the request to pod-api-requester.") from e
+
+        return _parse_response(response)
+
+
 async def pod_api_request(
     namespace: str,
     service_name: str,
@@ -187,26 +323,27 @@ async def pod_api_request(
     data: dict,
     *,
     publisher_pod: str | NonNegativeInt = 0,
+    requester: Optional[PodApiRequesterClient] = None,
 ) -> dict:
-    target_ip, node_port = _get_api_requester_info(
-        namespace=namespace,
-        service_name=service_name,
-        app=app,
-        publisher_pod=publisher_pod,
+    """Make a request through pod-api-requester.
+
+    :param requester: Client to make the request with. Pass one client to every request of
+        an experiment to resolve the requester endpoint once and reuse its connections.
+        If None, the request resolves the endpoint and opens a session of its own.
+    """
+    if requester is None:
+        async with PodApiRequesterClient() as requester:
+            return await requester.request(
+                namespace, service_name, app, url_template, data, publisher_pod=publisher_pod
+            )
+    return await requester.request(
+        namespace, service_name, app, url_template, data, publisher_pod=publisher_pod
     )
 
-    url = url_template.format(target_ip=target_ip, node_port=node_port)
 
-    logger.info(f"publishing message. url: `{url}` data: `{data}`")
+def _parse_response(response: PodResponse) -> dict:
     try:
-        response = await post_async(url, data)
         response_obj = json.loads(response.text)
-    except asyncio.TimeoutError as e:
-        raise PodApiClientError(
-            f"pod-api-requester did not answer within {REQUEST_TIMEOUT_S}s."
-        ) from e
-    except aiohttp.ClientError as e:
-        raise PodApiClientError("Failed to make the request to pod-api-requester.") from e
     except json.JSONDecodeError as e:
         # This is unexpected. Even if there is an error, pod-api-requester is expected to return a JSON-deserializable response.
         raise PodApiRequesterError("Deserialization failed for pod-api-requester response.")
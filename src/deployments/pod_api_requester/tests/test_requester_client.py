@@ -0,0 +1,83 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import pytest
+
+from src.deployments.pod_api_requester import pod_api_requester
+from src.deployments.pod_api_requester.pod_api_requester import (
+    PodApiClientError,
+    PodApiRequesterClient,
+    PodResponse,
+)
+
+
+def _ok():
+    return PodResponse(
+        status_code=200,
+        reason="OK",
+        text=json.dumps({"response": {"status_code": 200, "text": "{}"}}),
+    )
+
+
+async def _request(requester):
+    return await requester.request(
+        "ns", "svc", "app", "http://{target_ip}:{node_port}/process", data={}
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_resolve_the_endpoint_once_and_share_a_session(mocker):
+    resolve = mocker.patch.object(
+        pod_api_requester, "_get_api_requester_info", return_value=("10.0.0.1", 30000)
+    )
+    post = mocker.patch.object(pod_api_requester, "post_async", AsyncMock(return_value=_ok()))
+
+    async with PodApiRequesterClient() as requester:
+        await asyncio.gather(*(_request(requester) for _ in range(5)))
+        await _request(requester)
+
+    resolve.assert_called_once()
+    assert {call.args[0] for call in post.call_args_list} == {"http://10.0.0.1:30000/process"}
+    assert len({id(call.args[3]) for call in post.call_args_list}) == 1
+    assert post.call_args.args[3].closed
+
+
+@pytest.mark.asyncio
+async def test_an_unreachable_endpoint_is_re_resolved_and_retried(mocker):
+    """A requester pod restarted elsewhere, or a redeployed service, moves the endpoint."""
+    mocker.patch.object(
+        pod_api_requester,
+        "_get_api_requester_info",
+        side_effect=[("10.0.0.1", 30000), ("10.0.0.2", 30001)],
+    )
+    unreachable = aiohttp.ClientConnectorError(MagicMock(), OSError("refused"))
+    post = mocker.patch.object(
+        pod_api_requester, "post_async", AsyncMock(side_effect=[unreachable, _ok(), _ok()])
+    )
+
+    async with PodApiRequesterClient() as requester:
+        await _request(requester)
+        await _request(requester)
+
+    assert [call.args[0] for call in post.call_args_list] == [
+        "http://10.0.0.1:30000/process",
+        "http://10.0.0.2:30001/process",
+        "http://10.0.0.2:30001/process",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_a_failed_resolution_is_not_cached(mocker):
+    mocker.patch.object(
+        pod_api_requester,
+        "_get_api_requester_info",
+        side_effect=[PodApiClientError("No publisher pod found"), ("10.0.0.1", 30000)],
+    )
+    mocker.patch.object(pod_api_requester, "post_async", AsyncMock(return_value=_ok()))
+
+    async with PodApiRequesterClient() as requester:
+        with pytest.raises(PodApiClientError):
+            await _request(requester)
+        await _request(requester)